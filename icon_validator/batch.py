@@ -0,0 +1,207 @@
+import glob
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+
+import yaml
+
+from icon_validator.profiles import PROFILES
+from icon_validator.rules.validator import NETWORK
+from icon_validator.styling import *
+from icon_validator.timing import *
+from icon_validator.validate import validate
+
+PLUGIN_SPEC = "plugin.spec.yaml"
+WORKFLOW_SPEC = "workflow.spec.yaml"
+
+
+def detect_spec_file_name(directory: str) -> str:
+    """
+    Works out whether a directory holds a workflow or a plugin
+    :param directory: Directory to inspect
+    :return: Name of the spec file to validate, workflow.spec.yaml or plugin.spec.yaml
+    """
+    if os.path.exists(os.path.join(directory, WORKFLOW_SPEC)):
+        return WORKFLOW_SPEC
+    return PLUGIN_SPEC
+
+
+def expand_paths(patterns: [str]) -> [str]:
+    """
+    Expands globs (for shells that did not) and removes duplicates, keeping the given order
+    :param patterns: Paths and/or glob patterns
+    :return: List of paths
+    """
+    paths = []
+    for pattern in patterns:
+        if any(character in pattern for character in "*?["):
+            paths.extend(sorted(path for path in glob.glob(pattern) if os.path.isdir(path)))
+        else:
+            paths.append(pattern)
+
+    return list(dict.fromkeys(paths))
+
+
+def plugin_names(paths: [str]) -> [str]:
+    """
+    Returns the names of the plugins among plugin and workflow directories, from their specs
+    """
+    names = []
+    for path in paths:
+        try:
+            with open(os.path.join(path, PLUGIN_SPEC)) as f:
+                names.append(yaml.safe_load(f)["name"])
+        except (OSError, yaml.YAMLError, KeyError, TypeError):
+            continue
+    return names
+
+
+def expected_cost(directory: str) -> int:
+    """
+    Cheap estimate of how long a directory takes to validate: the total size of its files.
+    Used to start the biggest jobs first so a large plugin doesn't end up running alone at the end.
+    """
+    total = 0
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for file in files:
+            try:
+                total += os.path.getsize(os.path.join(root, file))
+            except OSError:
+                continue
+    return total
+
+
+def validate_directory(path: str, run_all: bool = False, parallel: bool = False, workers: int = None,
+                       cache=None, timings: list = None, events=None, fail_fast: bool = False,
+                       history=None, budgets=None, selection=None, network=None, prefetch: bool = True) -> int:
+    """
+    Validates a single plugin or workflow directory, the way icon-validate always has
+    :param path: Directory of the plugin or workflow
+    :param run_all: Run all validators (plugins only)
+    :param parallel: Run independent validators concurrently
+    :param workers: Maximum worker processes used when running in parallel
+    :param cache: ResultCache to replay unchanged validator results from
+    :param timings: List to append the run's timings report to
+    :param events: EventStream to report validator starts and finishes to
+    :param fail_fast: Stop at the first failing validator
+    :param history: RunHistory to schedule validators from and record their durations in
+    :param budgets: TimeBudgets limiting how long each validator may run
+    :param selection: ValidatorSelection picking the validators to run by cost
+    :param network: NetworkSettings of the validators reaching remote services
+    :param prefetch: Start fetching from the network and git as soon as the run starts
+    :return: 0 when validation passed, 1 otherwise
+    """
+    spec_file_name = detect_spec_file_name(path)
+    if spec_file_name == WORKFLOW_SPEC and run_all:
+        sys.stderr.write(
+            f"{BULLET_OK}Option '--all' and '-a' only works with plugins. Executing workflow supported validators\n")
+
+    if not os.path.exists(path):
+        sys.stderr.write(f"{BULLET_FAIL} Path '{path}' does not exist\n")
+        return 1
+
+    extension = spec_file_name.split(".")[0]
+
+    if extension == "plugin" and run_all:
+        print(f"{BULLET_OK} Validating {extension} with all validators at {path}\n")
+        return validate(directory=path, fail_fast=fail_fast, run_all=True, parallel=parallel, workers=workers,
+                        cache=cache, timings=timings, events=events, history=history, budgets=budgets,
+                        selection=selection, network=network, prefetch=prefetch)
+
+    print(f"{BULLET_OK} Validating {extension} at {path}\n")
+    return validate(directory=path, spec_file_name=spec_file_name, fail_fast=fail_fast, parallel=parallel,
+                    workers=workers, cache=cache, timings=timings, events=events, history=history, budgets=budgets,
+                    selection=selection, network=network, prefetch=prefetch)
+
+
+class BatchResult:
+    """
+    Outcome of validating one directory in a batch
+    """
+
+    def __init__(self, path: str, status: int, output: str, time_elapsed: float, timings: list):
+        self.path = path
+        self.status = status
+        self.output = output
+        self.time_elapsed = time_elapsed
+        self.timings = timings
+
+
+def _validate_captured(path: str, run_all: bool, parallel: bool, workers: int, cache, events, fail_fast: bool,
+                       history, budgets, selection, network, prefetch: bool) -> BatchResult:
+    start_time = time_now()
+    buffer = io.StringIO()
+    timings = []
+    with redirect_stdout(buffer):
+        try:
+            status = validate_directory(path, run_all=run_all, parallel=parallel, workers=workers, cache=cache,
+                                        timings=timings, events=events, fail_fast=fail_fast, history=history,
+                                        budgets=budgets, selection=selection, network=network,
+                                        prefetch=prefetch)
+        except Exception as e:
+            # One broken directory shouldn't take the whole batch down
+            print(f"{BULLET_FAIL} Validation of {path} raised an unexpected error: {e!r}")
+            status = 1
+    return BatchResult(path, status, buffer.getvalue(), format_time(start=start_time, end=time_now()), timings)
+
+
+def validate_batch(paths: [str], run_all: bool = False, parallel: bool = False, workers: int = None,
+                   cache=None, timings: list = None, events=None, fail_fast: bool = False, history=None,
+                   budgets=None, selection=None, network=None, prefetch: bool = True) -> int:
+    """
+    Validates many plugin and/or workflow directories in one invocation, spread over a pool of worker
+    processes. Each directory's report is printed as soon as it finishes, followed by a summary.
+    :param paths: Plugin and workflow directories
+    :param run_all: Run all validators on plugins
+    :param parallel: Also run validators concurrently within each directory
+    :param workers: Maximum number of worker processes, defaults to the CPU count
+    :param cache: ResultCache to replay unchanged validator results from
+    :param timings: List to append each directory's timings report to, in the order of paths
+    :param events: EventStream to report validator starts and finishes to, as they happen in any directory
+    :param fail_fast: Stop validating a directory at its first failing validator
+    :param history: RunHistory to schedule validators from. Each worker saves the runs it records
+    :param budgets: TimeBudgets limiting how long each validator may run
+    :param selection: ValidatorSelection picking the validators to run by cost
+    :param network: NetworkSettings of the validators reaching remote services
+    :param prefetch: Start fetching from the network and git as soon as the run of each directory starts
+    :return: 0 when every directory passed validation, 1 otherwise
+    """
+    start_time = time_now()
+    results: {str: BatchResult} = {}
+
+    # Ask for the published versions of every plugin at once, rather than one after the other from each worker
+    versions = network and network.extension_versions
+    if versions and not network.version_snapshot_only and (selection is None
+                                                            or NETWORK in PROFILES[selection.profile]):
+        versions.prefetch(plugin_names(paths))
+
+    # Longest expected job first
+    ordered = sorted(paths, key=expected_cost, reverse=True)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_validate_captured, path, run_all, parallel, None, cache, events, fail_fast,
+                                   history, budgets, selection, network, prefetch) for path in ordered]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.path] = result
+            print(f"{BULLET_OK} {BOLD}{result.path}{CEND}\n{result.output}")
+
+    if timings is not None:
+        for path in paths:
+            timings.extend(results[path].timings)
+
+    failed = [path for path in paths if results[path].status != 0]
+    print(f"\n----\n{BULLET_OK} {BOLD}Batch summary{CEND}")
+    for path in paths:
+        result = results[path]
+        if result.status == 0:
+            print(f"{BULLET_OK} passed {path} ({result.time_elapsed:.0f}ms)")
+        else:
+            print(f"{BULLET_FAIL} failed {path} ({result.time_elapsed:.0f}ms)")
+
+    time_elapsed = format_time(start=start_time, end=time_now())
+    print(f"{BULLET_OK} {len(paths) - len(failed)} of {len(paths)} directories passed validation")
+    print(f"\n----\n{BULLET_OK}{BOLD} Total time elapsed: {time_elapsed}ms{CEND}")
+    return 1 if failed else 0
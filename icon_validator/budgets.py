@@ -0,0 +1,44 @@
+import argparse
+
+
+class TimeBudgets:
+    """
+    How long each validator may run, and whether risky validators run in a separate process which
+    can be killed when they overrun
+    """
+
+    def __init__(self, overrides: {str: float} = None, isolate: bool = False):
+        """
+        :param overrides: Budget in seconds by validator name or class name, replacing the validator's own
+        time_budget. A budget of 0 means no limit
+        :param isolate: Run validators waiting on the network, git or subprocesses (io_bound ones) in a
+        separate process each
+        """
+        self.overrides = overrides or {}
+        self.isolate = isolate
+
+    def budget_for(self, validator) -> float:
+        """
+        Returns the seconds a validator may run for, None if it has no limit
+        """
+        for key in (validator.name, type(validator).__name__):
+            if key in self.overrides:
+                return self.overrides[key] or None
+        return validator.time_budget
+
+    def isolates(self, validator) -> bool:
+        return self.isolate and validator.io_bound
+
+
+def parse_budget(text: str) -> (str, float):
+    """
+    Parses a --time-budget argument of the form NAME=SECONDS
+    :return: Tuple of the validator name and the budget in seconds
+    """
+    name, separator, seconds = text.partition("=")
+    try:
+        if not name or not separator or float(seconds) < 0:
+            raise ValueError()
+        return name, float(seconds)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected NAME=SECONDS, e.g. URLValidator=30, got '{text}'")
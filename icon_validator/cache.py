@@ -0,0 +1,141 @@
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+from functools import lru_cache
+
+from icon_validator.exceptions import ValidationException, ValidationTimeout
+from icon_validator.execution import ValidatorResult
+from icon_validator.file_hashes import FileHashCache
+from icon_validator.rules.validator import SPEC
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_CACHE_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "icon-validator", "results")
+
+
+@lru_cache(maxsize=None)
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _package_fingerprint() -> str:
+    # Validators share helpers, e.g. the spec loader, styling or the URL checker, so a change to any source
+    # of the package invalidates every cached result. A new release does too, even if no source changed.
+    try:
+        from importlib.metadata import version
+        package_version = version("insightconnect-integrations-validators")
+    except Exception:
+        package_version = "unknown"
+    sources = hashlib.sha256()
+    for directory, directories, files in os.walk(PACKAGE_DIRECTORY):
+        directories[:] = sorted(name for name in directories if name != "__pycache__")
+        for name in sorted(files):
+            if name.endswith(".py"):
+                path = os.path.join(directory, name)
+                sources.update(f"{os.path.relpath(path, PACKAGE_DIRECTORY)}={_file_digest(path)}".encode() + b"\0")
+    return f"{package_version}:{sources.hexdigest()}"
+
+
+def cache_key(validator, spec) -> str:
+    """
+    Builds the key for a validator's result from its identity and the contents of its inputs.
+    The plugin directory is deliberately left out so identical inputs hit the cache anywhere.
+    :param validator: Validator with declared inputs
+    :param spec: ValidationContext of the plugin or workflow being validated
+    :return: Hex key, or None if the validator does not declare its inputs
+    """
+    if validator.inputs is None:
+        return None
+
+    validator_class = type(validator)
+    key = hashlib.sha256()
+    # The validator's own source covers validators from outside the package, e.g. those of tests
+    for part in (_package_fingerprint(), _file_digest(inspect.getfile(validator_class)),
+                 f"{validator_class.__module__}.{validator_class.__qualname__}", validator.name):
+        key.update(part.encode() + b"\0")
+
+    for pattern in validator.inputs:
+        pattern = spec.spec_file_name if pattern == SPEC else pattern
+        key.update(pattern.encode() + b"\0")
+        names = spec.matching_files(pattern) if any(c in pattern for c in "*?[") else [pattern]
+        for name in names:
+            key.update(f"{name}={spec.digest(name) or 'missing'}".encode() + b"\0")
+
+    return key.hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent store of validator results keyed by cache_key, so validators are not re-run on unchanged inputs
+    """
+
+    def __init__(self, directory: str = None):
+        """
+        :param directory: Where results are stored, defaults to $ICON_VALIDATOR_CACHE_DIR or ~/.cache/icon-validator
+        """
+        self.directory = directory or os.environ.get("ICON_VALIDATOR_CACHE_DIR") or DEFAULT_CACHE_DIRECTORY
+        self.hits = 0
+        self.misses = 0
+        self._file_hashes = None
+
+    @property
+    def file_hashes(self) -> FileHashCache:
+        """
+        Hashes of the files validators which always run hash, e.g. RegenerationValidator, kept next to the results
+        """
+        if self._file_hashes is None:
+            self._file_hashes = FileHashCache(os.path.join(self.directory, "file-hashes.json"))
+        return self._file_hashes
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def lookup(self, validator, spec) -> ValidatorResult:
+        """
+        Replays a previous result of the validator on identical inputs
+        :return: The cached ValidatorResult, or None on a miss
+        """
+        key = cache_key(validator, spec)
+        if key is None:
+            return None
+        try:
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+            error = None
+            if entry["error"] is not None:
+                error = ValidationException(entry["error"]["message"], rule_id=entry["error"]["rule_id"],
+                                            file=entry["error"]["file"], line=entry["error"]["line"])
+        except (OSError, ValueError, KeyError, TypeError):
+            # Missing, or written by an older version in another format
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return ValidatorResult(validator.name, error=error, output=entry["output"], cached=True)
+
+    def store(self, validator, spec, result: ValidatorResult):
+        """
+        Records the result of a validator run, if the validator declares its inputs
+        """
+        key = cache_key(validator, spec)
+        # Running out of time says nothing about the inputs, the next run should try again
+        if key is None or isinstance(result.error, ValidationTimeout):
+            return
+        error = None
+        if not result.success:
+            error = {"message": str(result.error), "rule_id": result.error.rule_id, "file": result.error.file,
+                     "line": result.error.line}
+        entry = {"error": error, "output": result.output}
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Written to a temporary file first so concurrent runs never read half an entry
+            with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(path), delete=False) as f:
+                json.dump(entry, f)
+            os.replace(f.name, path)
+        except OSError:
+            # A read-only or full disk just means no caching
+            pass
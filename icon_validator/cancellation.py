@@ -0,0 +1,130 @@
+import os
+import signal
+import socket
+import subprocess
+import threading
+from contextlib import contextmanager
+
+from icon_validator.exceptions import ValidationCancelled
+
+
+class CancellationToken:
+    """
+    Lets the runner stop validators which wait on the network, git or subprocesses once the result of the run
+    is known, e.g. after the first failure in fail fast mode. Validators check it between steps and register
+    callbacks which interrupt whatever they are blocked on.
+    Cancellation does not reach other processes: a token unpickled in a worker process is never cancelled.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks = []
+
+    def __getstate__(self):
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self):
+        """
+        Cancels the work the token was handed to, calling every registered callback once
+        """
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                # Whatever is being interrupted may have finished in the meantime
+                pass
+
+    def raise_if_cancelled(self):
+        """
+        :raises ValidationCancelled if the token was cancelled
+        """
+        if self.cancelled:
+            raise ValidationCancelled()
+
+    @contextmanager
+    def on_cancel(self, callback):
+        """
+        Calls callback if the token is cancelled while the block runs, straight away if it already was
+        :param callback: Function without arguments interrupting the work done in the block
+        """
+        with self._lock:
+            registered = not self._event.is_set()
+            if registered:
+                self._callbacks.append(callback)
+        if not registered:
+            callback()
+        try:
+            yield
+        finally:
+            with self._lock:
+                if callback in self._callbacks:
+                    self._callbacks.remove(callback)
+
+
+# Token of specs which aren't run by a runner, e.g. a KomandPluginSpec handed straight to a validator
+NEVER_CANCELLED = CancellationToken()
+
+# Token of the validator running on each thread, see current
+_current = threading.local()
+
+
+@contextmanager
+def current(token: CancellationToken):
+    """
+    Makes token the one cancellation_of returns on this thread while the block runs, e.g. to stop a
+    single validator which ran out of time without cancelling the rest of the run
+    """
+    previous = getattr(_current, "token", None)
+    _current.token = token
+    try:
+        yield
+    finally:
+        _current.token = previous
+
+
+def cancellation_of(spec) -> CancellationToken:
+    """
+    Returns the cancellation token of the validator running on this thread, or else of the run a spec is
+    being validated in
+    """
+    return getattr(_current, "token", None) or getattr(spec, "cancellation", None) or NEVER_CANCELLED
+
+
+def check_call(args: [str], token: CancellationToken, **kwargs):
+    """
+    Like subprocess.check_call, but kills the process, and anything it started, when the token is cancelled
+    :raises ValidationCancelled if the token was cancelled
+    :raises subprocess.CalledProcessError if the process exits with a non-zero status
+    """
+    token.raise_if_cancelled()
+    with subprocess.Popen(args, start_new_session=True, **kwargs) as process:
+        with token.on_cancel(lambda: os.killpg(process.pid, signal.SIGKILL)):
+            return_code = process.wait()
+    token.raise_if_cancelled()
+    if return_code:
+        raise subprocess.CalledProcessError(return_code, args)
+
+
+def interrupt_connection(connection):
+    """
+    Returns a callback which unblocks a thread waiting on an http.client connection.
+    Shutting the socket down wakes up a blocked read, closing it from another thread does not.
+    """
+    def interrupt():
+        if connection.sock is not None:
+            connection.sock.shutdown(socket.SHUT_RDWR)
+
+    return interrupt
@@ -0,0 +1,255 @@
+import argparse
+import json
+import sys
+
+from importlib.metadata import version
+
+from icon_validator import daemon
+from icon_validator.styling import *
+from icon_validator.budgets import TimeBudgets, parse_budget
+from icon_validator.cache import ResultCache
+from icon_validator.events import EventStream
+from icon_validator.extension_versions import ExtensionVersions
+from icon_validator.history import RunHistory
+from icon_validator.keywords import KeywordSnapshot
+from icon_validator.network import NetworkSettings
+from icon_validator.profiles import PROFILES, ValidatorSelection
+from icon_validator.batch import expand_paths, validate_batch, validate_directory
+from icon_validator.remote_spec import DEFAULT_BASE_REF, RemoteSpecCache
+from icon_validator.repository import changed_directories
+from icon_validator.stand_in import StandInServer, StandInTransport
+from icon_validator.transport import LIVE, Cassette, RecordingTransport, ReplayingTransport, Transport
+from icon_validator.url_cache import URLStatusCache
+from icon_validator.version_bumps import check_version_bumps
+from icon_validator.watch import watch
+
+DISTRIBUTION_NAME = "insightconnect-integrations-validators"
+
+
+def run(argv: [str]) -> int:
+    """
+    Runs icon-validate in this process
+    :param argv: Command line arguments, without the program name
+    :return: Exit status
+    """
+    version_string = f"{BULLET_OK} {DISTRIBUTION_NAME} {version(DISTRIBUTION_NAME)}"
+    if "--version" in argv:
+        print(version_string)
+        return 0
+
+    arguments_parser = argparse.ArgumentParser(epilog=version_string,
+                                               description="Linting rules for plugins and workflows")
+    # required
+    arguments_parser.add_argument("paths", metavar="path", nargs="*",
+                                  help="Path(s) or glob(s) to find the plugin or workflow code. With --changed-since "
+                                       "or --pre-push, the directory to look for changes in (default: current)")
+
+    # optional
+    arguments_parser.add_argument("--all", help="Run all Validators", default=False,
+                                  dest="run_all_validators", action="store_true")
+    arguments_parser.add_argument("-a", help="Run all validators", default=False,
+                                  dest="run_all_validators", action="store_true")
+    arguments_parser.add_argument("--parallel", help="Run independent validators concurrently", default=False,
+                                  action="store_true")
+    arguments_parser.add_argument("-j", "--jobs", help="Maximum worker processes used by --parallel and when "
+                                                       "validating several directories", type=int,
+                                  default=None, dest="jobs")
+    arguments_parser.add_argument("--fail-fast", help="Stop at the first failing validator, running the validators "
+                                                      "most likely to fail quickly first", default=False,
+                                  action="store_true", dest="fail_fast")
+    arguments_parser.add_argument("--no-history", help="Don't order validators by, or record, how long they took "
+                                                       "and how often they failed in earlier runs", default=False,
+                                  action="store_true", dest="no_history")
+    arguments_parser.add_argument("--profile", help="Run only the validators of some cost classes: fast reads just "
+                                                    "the spec and help.md, offline leaves out validators using the "
+                                                    "network or Docker, full runs everything (default)",
+                                  choices=list(PROFILES), default="full")
+    arguments_parser.add_argument("--budget-ms", help="Run the cheapest validators expected to finish within N "
+                                                      "milliseconds in total, estimated from earlier runs",
+                                  type=float, default=None, metavar="N", dest="budget_ms")
+    arguments_parser.add_argument("--time-budget", help="Stop a validator running longer than SECONDS and report "
+                                                        "it as timed out, 0 for no limit. NAME is the validator's "
+                                                        "class name, e.g. URLValidator=30. Can be repeated",
+                                  type=parse_budget, action="append", default=[], metavar="NAME=SECONDS",
+                                  dest="time_budgets")
+    arguments_parser.add_argument("--isolate", help="Run validators using the network, git or Docker in separate "
+                                                    "processes, which are killed when they run out of time",
+                                  default=False, action="store_true")
+    arguments_parser.add_argument("--no-cache", help="Don't read or write anything kept between runs: run every "
+                                                     "validator instead of replaying results cached for unchanged "
+                                                     "files, hash every file, test every URL, look up the approved "
+                                                     "keywords, published versions and specs on the base ref again "
+                                                     "and keep no history, as with --no-history",
+                                  default=False, action="store_true",
+                                  dest="no_cache")
+    arguments_parser.add_argument("--url-cache-only", help="Don't test URLs, report only the broken links "
+                                                           "remembered from earlier runs", default=False,
+                                  action="store_true", dest="url_cache_only")
+    arguments_parser.add_argument("--keyword-snapshot-only", help="Check keywords against the approved keywords "
+                                                                  "downloaded earlier, however old, without "
+                                                                  "refreshing them", default=False,
+                                  action="store_true", dest="keyword_snapshot_only")
+    arguments_parser.add_argument("--version-snapshot-only", help="Compare plugin versions against the published "
+                                                                  "versions looked up earlier, however old, without "
+                                                                  "looking them up again", default=False,
+                                  action="store_true", dest="version_snapshot_only")
+    arguments_parser.add_argument("--base-ref", help="Branch, tag or commit plugins are compared against to check "
+                                                     "their version was bumped (default: origin/master)",
+                                  default=DEFAULT_BASE_REF, metavar="REF", dest="base_ref")
+    arguments_parser.add_argument("--check-releases", help="Also check plugins against every version released in "
+                                                           "the history of --base-ref, or the last N before the "
+                                                           "one on --base-ref, to catch breaking changes made "
+                                                           "again after being reverted",
+                                  nargs="?", const=0, default=None, type=int, metavar="N", dest="releases")
+    arguments_parser.add_argument("--no-prefetch", help="Only start the URL, keyword, version and git checks when "
+                                                        "their validators' turn comes, rather than in the background "
+                                                        "as soon as the run starts", default=False,
+                                  action="store_true", dest="no_prefetch")
+    cassette_arguments = arguments_parser.add_mutually_exclusive_group()
+    cassette_arguments.add_argument("--record-network", help="Record every response of the URL, keyword and version "
+                                                             "checks in a cassette file to replay later",
+                                    default=None, metavar="CASSETTE", dest="record_network")
+    cassette_arguments.add_argument("--replay-network", help="Answer the URL, keyword and version checks from a "
+                                                             "cassette recorded earlier, without network access",
+                                    default=None, metavar="CASSETTE", dest="replay_network")
+    arguments_parser.add_argument("--replay-latency-ms", help="Milliseconds each replayed response takes, to "
+                                                              "benchmark the checks as if they went to the network "
+                                                              "(default: 0)", default=0, type=int, metavar="MS",
+                                  dest="replay_latency_ms")
+    arguments_parser.add_argument("--stand-in", help="Replay the cassette from a local HTTP server rather than in "
+                                                     "process, so the checks still go through sockets",
+                                  default=False, action="store_true", dest="stand_in")
+    arguments_parser.add_argument("--timings-json", help="Write the wall clock and CPU time of every validator to "
+                                                         "a JSON file", default=None, metavar="PATH",
+                                  dest="timings_json")
+    arguments_parser.add_argument("--events", help="Stream a JSON line to stdout as each validator starts and "
+                                                   "finishes. The usual report is written to stderr instead",
+                                  choices=["ndjson"], default=None)
+    arguments_parser.add_argument("--changed-since", help="Only validate plugins and workflows changed since a git "
+                                                          "ref, e.g. origin/master", default=None, metavar="REF",
+                                  dest="changed_since")
+    arguments_parser.add_argument("--pre-push", help="Only validate plugins and workflows touched by the commits "
+                                                     "being pushed, reading the refs git passes to a pre-push hook "
+                                                     "on stdin", default=False, action="store_true", dest="pre_push")
+    arguments_parser.add_argument("--version-bumps", help="Only check that every plugin changed since --base-ref "
+                                                          "bumped its version as the changes to its spec need, "
+                                                          "across the repository holding path (default: current)",
+                                  default=False, action="store_true", dest="version_bumps")
+    arguments_parser.add_argument("--watch", help="Keep running and re-run the validators affected by each change "
+                                                  "to the plugin or workflow's files", default=False,
+                                  action="store_true")
+
+    arguments_parser.add_argument("--daemon", help="Serve validation requests from other icon-validate runs over a "
+                                                   "Unix socket, keeping everything they need loaded", default=False,
+                                  action="store_true")
+    arguments_parser.add_argument("--socket", help="Socket the daemon listens on (default: $ICON_VALIDATOR_SOCKET or "
+                                                   "~/.cache/icon-validator/daemon.sock)", default=None, metavar="PATH")
+    arguments_parser.add_argument("--no-daemon", help="Validate in this process even if a daemon is running",
+                                  default=False, action="store_true", dest="no_daemon")
+
+    the_arguments = arguments_parser.parse_args(argv)
+    if the_arguments.no_cache:
+        only = [flag for flag, used in (("--url-cache-only", the_arguments.url_cache_only),
+                                        ("--keyword-snapshot-only", the_arguments.keyword_snapshot_only),
+                                        ("--version-snapshot-only", the_arguments.version_snapshot_only)) if used]
+        if only:
+            arguments_parser.error(f"{only[0]} reads what earlier runs kept, which --no-cache turns off")
+
+    if the_arguments.daemon:
+        return daemon.serve(the_arguments.socket)
+
+    events = None
+    if the_arguments.events:
+        # Events go straight to the stdout file descriptor, keep the human readable report out of their way
+        sys.stdout.flush()
+        sys.stdout = sys.stderr
+        events = EventStream()
+
+    if the_arguments.version_bumps:
+        remote_spec_cache = None if the_arguments.no_cache else RemoteSpecCache()
+        return max(check_version_bumps(root, the_arguments.base_ref, remote_spec_cache, the_arguments.jobs)
+                   for root in the_arguments.paths or ["."])
+
+    if the_arguments.changed_since or the_arguments.pre_push:
+        # git passes the pushed refs to a pre-push hook on stdin
+        push_lines = sys.stdin.read().splitlines() if the_arguments.pre_push else None
+        paths = []
+        for root in the_arguments.paths or ["."]:
+            paths.extend(changed_directories(root, ref=the_arguments.changed_since, push_lines=push_lines))
+        paths = list(dict.fromkeys(paths))
+        if not paths:
+            print(f"{BULLET_OK} No plugin or workflow changes to validate")
+            return 0
+    else:
+        if not the_arguments.paths:
+            arguments_parser.error("the following arguments are required: path")
+        # A glob may match nothing
+        paths = expand_paths(the_arguments.paths)
+        if not paths:
+            sys.stderr.write(f"{BULLET_FAIL} No directories matched {' '.join(the_arguments.paths)}\n")
+            return 1
+
+    if the_arguments.stand_in and not the_arguments.replay_network:
+        arguments_parser.error("--stand-in needs a cassette to replay, see --replay-network")
+    stand_in = None
+    transport = LIVE
+    if the_arguments.record_network:
+        transport = RecordingTransport(Cassette(the_arguments.record_network))
+    elif the_arguments.replay_network:
+        cassette = Cassette(the_arguments.replay_network)
+        latency = the_arguments.replay_latency_ms / 1000
+        if the_arguments.stand_in:
+            stand_in = StandInServer(cassette, latency)
+            transport = StandInTransport(stand_in.address)
+        else:
+            transport = ReplayingTransport(cassette, latency)
+    try:
+        return _run(the_arguments, arguments_parser, paths, events, transport)
+    finally:
+        if stand_in:
+            stand_in.close()
+
+
+def _run(the_arguments: argparse.Namespace, arguments_parser: argparse.ArgumentParser, paths: [str],
+         events: EventStream, transport: Transport) -> int:
+    cache = None if the_arguments.no_cache else ResultCache()
+    history = None if the_arguments.no_history or the_arguments.no_cache else RunHistory()
+    budgets = TimeBudgets(dict(the_arguments.time_budgets), isolate=the_arguments.isolate)
+    selection = ValidatorSelection(the_arguments.profile, budget_ms=the_arguments.budget_ms)
+    url_cache = None if the_arguments.no_cache else URLStatusCache()
+    keyword_snapshot = None if the_arguments.no_cache else KeywordSnapshot(transport=transport)
+    extension_versions = None if the_arguments.no_cache else ExtensionVersions(transport=transport)
+    remote_spec_cache = None if the_arguments.no_cache else RemoteSpecCache()
+    network = NetworkSettings(url_cache=url_cache, url_cache_only=the_arguments.url_cache_only,
+                              keyword_snapshot=keyword_snapshot,
+                              keyword_snapshot_only=the_arguments.keyword_snapshot_only,
+                              extension_versions=extension_versions,
+                              version_snapshot_only=the_arguments.version_snapshot_only, transport=transport,
+                              base_ref=the_arguments.base_ref, remote_spec_cache=remote_spec_cache,
+                              releases=the_arguments.releases)
+    if the_arguments.watch:
+        if len(paths) != 1:
+            arguments_parser.error("--watch takes a single plugin or workflow directory")
+        return watch(paths[0], run_all=the_arguments.run_all_validators, parallel=the_arguments.parallel,
+                     workers=the_arguments.jobs, cache=cache, events=events, history=history, budgets=budgets,
+                     selection=selection, network=network, prefetch=not the_arguments.no_prefetch)
+
+    timings = [] if the_arguments.timings_json else None
+    if len(paths) == 1:
+        return_code = validate_directory(paths[0], run_all=the_arguments.run_all_validators,
+                                         parallel=the_arguments.parallel, workers=the_arguments.jobs, cache=cache,
+                                         timings=timings, events=events, fail_fast=the_arguments.fail_fast,
+                                         history=history, budgets=budgets, selection=selection,
+                                         network=network, prefetch=not the_arguments.no_prefetch)
+    else:
+        return_code = validate_batch(paths, run_all=the_arguments.run_all_validators,
+                                     parallel=the_arguments.parallel, workers=the_arguments.jobs, cache=cache,
+                                     timings=timings, events=events, fail_fast=the_arguments.fail_fast,
+                                     history=history, budgets=budgets, selection=selection,
+                                     network=network, prefetch=not the_arguments.no_prefetch)
+
+    if the_arguments.timings_json:
+        with open(the_arguments.timings_json, "w") as timings_file:
+            json.dump(timings, timings_file, indent=2)
+
+    return return_code
@@ -0,0 +1,214 @@
+import fnmatch
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import Counter
+
+from icon_plugin_spec.plugin_spec import KomandPluginSpec
+
+
+class ValidationContext(KomandPluginSpec):
+    """
+    Spec of the plugin or workflow being validated, shared by every validator in a run.
+    Each artifact is loaded lazily on first use and memoized, failures included, so a file
+    is read from disk at most once per run no matter how many validators look at it.
+    """
+
+    def __init__(self, directory, spec_file_name="plugin.spec.yaml"):
+        """
+        :param directory: Directory of the plugin or workflow
+        :param spec_file_name: Name of the spec file, plugin.spec.yaml or workflow.spec.yaml
+        """
+        super().__init__(directory, spec_file_name)
+        # Number of times each file (relative to the directory) was read from disk
+        self.load_counts = Counter()
+        self._artifacts = {}
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        # Locks can't be pickled, which parallel runs need to hand the context to worker processes
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def _memoize(self, key: str, factory):
+        with self._lock:
+            if key not in self._artifacts:
+                try:
+                    self._artifacts[key] = (factory(), None)
+                except Exception as e:
+                    self._artifacts[key] = (None, e)
+        value, error = self._artifacts[key]
+        if error is not None:
+            raise error
+        return value
+
+    def invalidate(self, relative_paths: [str]):
+        """
+        Forgets everything loaded from the given files, and the directory listings, so they are read again on next use.
+        Used to keep one context across runs of watch mode.
+        :param relative_paths: Paths of the changed files relative to the directory
+        """
+        changed = {os.path.normpath(path) for path in relative_paths}
+        with self._lock:
+            for key in list(self._artifacts):
+                path, _, kind = key.partition("#")
+                if path in changed or kind == "listing" or kind == "walk":
+                    del self._artifacts[key]
+            # Drops the attributes KomandPluginSpec caches on first use as well
+            KomandPluginSpec.__init__(self, self.directory, self.spec_file_name)
+
+    def _load_file(self, relative_path: str, reader):
+        def load():
+            self.load_counts[relative_path] += 1
+            return reader()
+
+        return self._memoize(relative_path, load)
+
+    def read_bytes(self, relative_path: str) -> bytes:
+        """
+        Returns the raw contents of a file in the plugin or workflow directory
+        :param relative_path: Path of the file relative to the directory
+        :raises FileNotFoundError if the file does not exist
+        """
+        def reader():
+            with open(os.path.join(self.directory, relative_path), "rb") as f:
+                return f.read()
+
+        return self._load_file(relative_path, reader)
+
+    def read_text(self, relative_path: str, encoding: str = None) -> str:
+        """
+        Returns the contents of a file in the plugin or workflow directory, decoded the way open() would
+        :param relative_path: Path of the file relative to the directory
+        :param encoding: Encoding of the file, defaults to the locale's like open()
+        :raises FileNotFoundError if the file does not exist
+        """
+        def decode():
+            return io.TextIOWrapper(io.BytesIO(self.read_bytes(relative_path)), encoding=encoding).read()
+
+        return self._memoize(f"{relative_path}#text:{encoding}", decode)
+
+    def digest(self, relative_path: str) -> str:
+        """
+        Returns the SHA-256 of a file in the plugin or workflow directory, or None if it does not exist
+        :param relative_path: Path of the file relative to the directory
+        """
+        try:
+            return self._memoize(f"{relative_path}#sha256",
+                                 lambda: hashlib.sha256(self.read_bytes(relative_path)).hexdigest())
+        except OSError:
+            return None
+
+    def read_json(self, relative_path: str):
+        """
+        Returns the parsed contents of a JSON file in the plugin or workflow directory
+        :param relative_path: Path of the file relative to the directory
+        :raises json.JSONDecodeError if the file is not valid JSON
+        """
+        return self._memoize(f"{relative_path}#json", lambda: json.loads(self.read_text(relative_path)))
+
+    def raw_spec(self):
+        def load():
+            if not os.path.exists(os.path.join(self.directory, self.spec_file_name)):
+                raise Exception(
+                    'No plugin spec file "%s" file in directory "%s"' % (self.spec_file_name, self.directory))
+            try:
+                raw_spec = self.read_text(self.spec_file_name, encoding="utf-8")
+            except Exception as e:
+                raise Exception('Unable to read plugin.spec.yaml', e)
+            if not raw_spec:
+                raise Exception('plugin.spec.yaml was empty')
+            return raw_spec
+
+        return self._memoize(f"{self.spec_file_name}#spec", load)
+
+    def spec_dictionary(self):
+        return self._memoize(f"{self.spec_file_name}#yaml", super().spec_dictionary)
+
+    def raw_help(self):
+        return self.read_text("help.md")
+
+    def raw_dockerfile(self):
+        return self.read_text("Dockerfile").splitlines(keepends=True)
+
+    def dockerfile_text(self) -> str:
+        return "".join(self.raw_dockerfile())
+
+    def raw_requirements(self) -> str:
+        return self.read_text("requirements.txt")
+
+    def raw_setup_py(self) -> str:
+        return self.read_text("setup.py")
+
+    def directory_listing(self) -> [str]:
+        """
+        Returns the names of the entries at the top of the plugin or workflow directory, in os.listdir order
+        """
+        return self._memoize("#listing", lambda: os.listdir(self.directory))
+
+    def has_file(self, file_name: str) -> bool:
+        return file_name in self.directory_listing()
+
+    def matching_files(self, pattern: str) -> [str]:
+        """
+        Returns the names of the entries at the top of the plugin or workflow directory matching a glob pattern
+        :param pattern: Pattern to match, e.g. *.icon
+        """
+        return sorted(name for name in self.directory_listing() if fnmatch.fnmatch(name, pattern))
+
+    def files(self, suffix: str = "") -> [str]:
+        """
+        Returns the paths, relative to the directory, of every file below it ending with suffix
+        :param suffix: File name suffix to filter on, e.g. ".py"
+        """
+        def walk():
+            found = []
+            for root, _, file_names in os.walk(self.directory):
+                for file_name in file_names:
+                    found.append(os.path.relpath(os.path.join(root, file_name), self.directory))
+            return found
+
+        return [path for path in self._memoize("#walk", walk) if path.endswith(suffix)]
+
+    def icon_file_names(self) -> [str]:
+        """
+        Returns the names of the workflow .icon files, in os.listdir order
+        """
+        return [file_name for file_name in self.directory_listing() if file_name.endswith(".icon")]
+
+    def icon_json(self, file_name: str) -> dict:
+        """
+        Returns a parsed workflow .icon file
+        :param file_name: Name of the .icon file
+        :raises json.JSONDecodeError if the file is not valid JSON
+        """
+        return self.read_json(file_name)
+
+    def test_file_names(self) -> [str]:
+        """
+        Returns the names of the .json test files in the plugin's tests directory
+        """
+        tests_dir = os.path.join(self.directory, "tests")
+
+        def walk():
+            names = []
+            for _, _, file_names in os.walk(tests_dir):
+                names.extend(name for name in file_names if name.endswith(".json"))
+            return names
+
+        return self._memoize("tests#listing", walk)
+
+    def test_json(self, file_name: str):
+        """
+        Returns a parsed test file from the plugin's tests directory
+        :param file_name: Name of the test file
+        :raises json.JSONDecodeError if the file is not valid JSON
+        """
+        return self.read_json(os.path.join("tests", file_name))
@@ -0,0 +1,241 @@
+import array
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import traceback
+
+# Only the standard library is imported here: the client side runs before anything else
+# in icon-validate, and its whole point is to skip loading the validators
+
+SOCKET_ENVIRONMENT_VARIABLE = "ICON_VALIDATOR_SOCKET"
+NO_DAEMON_ENVIRONMENT_VARIABLE = "ICON_VALIDATOR_NO_DAEMON"
+DEFAULT_SOCKET = os.path.join(os.path.expanduser("~"), ".cache", "icon-validator", "daemon.sock")
+PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+# Marker sent along with the client's standard file descriptors
+FDS_MARKER = b"F"
+
+# The daemon is served over a Unix socket by forked children, so it only runs on Unix, not Windows
+SUPPORTED = hasattr(socket, "AF_UNIX") and hasattr(os, "fork")
+
+# Only Linux reports the user of a socket's peer this way
+PEERCRED = getattr(socket, "SO_PEERCRED", None)
+
+
+def socket_path(path: str = None) -> str:
+    """
+    Returns where the daemon listens: path if given, else $ICON_VALIDATOR_SOCKET, else under ~/.cache
+    """
+    return path or os.environ.get(SOCKET_ENVIRONMENT_VARIABLE) or DEFAULT_SOCKET
+
+
+def _send_fds(connection: socket.socket, fds: [int]):
+    # socket.send_fds needs Python 3.9
+    connection.sendmsg([FDS_MARKER], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array("i", fds))])
+
+
+def _recv_fds(connection: socket.socket, count: int) -> [int]:
+    # socket.recv_fds needs Python 3.9
+    fds = array.array("i")
+    _, ancillary, _, _ = connection.recvmsg(len(FDS_MARKER), socket.CMSG_LEN(count * fds.itemsize))
+    for level, kind, data in ancillary:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(data[:len(data) - len(data) % fds.itemsize])
+    return list(fds)
+
+
+def _identity() -> dict:
+    # A daemon started from another installation or interpreter would validate with other code
+    return {"package": PACKAGE_DIRECTORY, "executable": sys.executable}
+
+
+def run_remote(argv: [str], path: str = None, fds: (int, int, int) = (0, 1, 2)) -> int:
+    """
+    Runs icon-validate in the daemon, which writes straight to this process's stdout and stderr
+    :param argv: Command line arguments, without the program name
+    :param path: Socket the daemon listens on, see socket_path
+    :param fds: Standard input, output and error file descriptors to hand to the daemon
+    :return: Exit status, or None if no compatible daemon is running and validation has to run locally
+    """
+    if not SUPPORTED or "--daemon" in argv or "--no-daemon" in argv \
+            or os.environ.get(NO_DAEMON_ENVIRONMENT_VARIABLE):
+        return None
+
+    path = socket_path(path)
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+        _send_fds(connection, list(fds))
+        request = {"argv": argv, "cwd": os.getcwd(), "environment": dict(os.environ), **_identity()}
+        connection.sendall(json.dumps(request).encode() + b"\n")
+        replies = connection.makefile("rb")
+        reply = json.loads(replies.readline() or b"{}")
+    except (OSError, ValueError):
+        connection.close()
+        return None
+
+    if "pid" not in reply:
+        connection.close()
+        return None
+
+    try:
+        while True:
+            try:
+                line = replies.readline()
+                break
+            except KeyboardInterrupt:
+                # Interrupt the validation, e.g. --watch, rather than leaving it running in the daemon
+                os.kill(reply["pid"], signal.SIGINT)
+    finally:
+        connection.close()
+
+    if not line:
+        sys.stderr.write("The icon-validate daemon stopped before validation finished\n")
+        return 1
+    return json.loads(line)["status"]
+
+
+def _same_user(connection: socket.socket) -> bool:
+    if PEERCRED is None:
+        # Elsewhere, e.g. on macOS, the socket's 0600 permissions already keep other users from connecting
+        return True
+    credentials = connection.getsockopt(socket.SOL_SOCKET, PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", credentials)
+    return uid == os.getuid()
+
+
+def _exit_status(code) -> int:
+    # Mirrors how the interpreter turns the argument of sys.exit into an exit status
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    sys.stderr.write(f"{code}\n")
+    return 1
+
+
+def _handle(connection: socket.socket, handler) -> int:
+    """
+    Serves one request in a freshly forked child. The child starts from the daemon's warm modules, but
+    any state a validator keeps, e.g. in class attributes, dies with it.
+    """
+    fds = _recv_fds(connection, 3)
+    request = json.loads(connection.makefile("rb").readline())
+    if len(fds) != 3 or {key: request.get(key) for key in _identity()} != _identity():
+        return 1
+    connection.sendall(json.dumps({"pid": os.getpid()}).encode() + b"\n")
+
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+        os.close(fd)
+    os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["environment"])
+    sys.argv = ["icon-validate"] + request["argv"]
+    # The daemon's own streams may be buffered differently, or not be the descriptors at all
+    sys.stdin = open(0, closefd=False)
+    sys.stdout = open(1, "w", buffering=1 if os.isatty(1) else -1, closefd=False)
+    sys.stderr = open(2, "w", buffering=1, closefd=False)
+
+    try:
+        status = handler(request["argv"])
+    except SystemExit as e:
+        status = _exit_status(e.code)
+    except KeyboardInterrupt:
+        status = 130
+    except Exception:
+        traceback.print_exc()
+        status = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    connection.sendall(json.dumps({"status": status}).encode() + b"\n")
+    return 0
+
+
+def _listen(path: str) -> socket.socket:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if os.path.exists(path):
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            # Left behind by a daemon which didn't shut down cleanly
+            os.unlink(path)
+        else:
+            raise OSError(f"An icon-validate daemon is already listening on {path}")
+        finally:
+            probe.close()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    umask = os.umask(0o177)
+    try:
+        server.bind(path)
+    finally:
+        os.umask(umask)
+    server.listen()
+    return server
+
+
+def serve(path: str = None, handler=None) -> int:
+    """
+    Runs the validation daemon until interrupted. Each request is served in a child forked from this
+    process, so the validators, the libraries they use and the rule lists are only loaded once.
+    :param path: Socket to listen on, see socket_path
+    :param handler: Function running icon-validate with a list of arguments, defaults to icon_validator.cli.run
+    :return: Exit status
+    """
+    if not SUPPORTED:
+        sys.stderr.write("The icon-validate daemon needs Unix sockets and fork, which this platform doesn't have\n")
+        return 1
+    if handler is None:
+        from icon_validator.cli import run
+        handler = run
+
+    # Validators are imported lazily, load every one of them up front so children inherit them
+    from icon_validator import rules
+    for name in ("VALIDATORS", "JENKINS_VALIDATORS", "WORKFLOW_VALIDATORS"):
+        getattr(rules, name)
+
+    path = socket_path(path)
+    try:
+        server = _listen(path)
+    except OSError as e:
+        sys.stderr.write(f"{e}\n")
+        return 1
+
+    print(f"icon-validate daemon listening on {path}, press Ctrl+C to stop", flush=True)
+    # Children are reaped automatically, and terminating the daemon removes its socket
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        while True:
+            connection, _ = server.accept()
+            if not _same_user(connection):
+                connection.close()
+                continue
+
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+            if pid == 0:
+                status = 1
+                try:
+                    server.close()
+                    # Validators start subprocesses and process pools, which need to wait for their children
+                    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+                    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                    status = _handle(connection, handler)
+                except BaseException:
+                    traceback.print_exc()
+                finally:
+                    os._exit(status)
+            connection.close()
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        server.close()
+        if os.path.exists(path):
+            os.unlink(path)
@@ -0,0 +1,82 @@
+import json
+import os
+import time
+
+from icon_validator.exceptions import ValidationException, ValidationTimeout
+
+
+class EventStream:
+    """
+    Writes one JSON object per line (NDJSON) for every validator start and finish, as they happen.
+    Each line is written in a single unbuffered write, so events from worker processes and threads
+    don't interleave.
+    """
+
+    def __init__(self, fd: int = 1, path: str = None, directory: str = None):
+        """
+        :param fd: File descriptor to write events to, defaults to stdout
+        :param path: File to append events to instead of fd. Unlike most descriptors, this works from
+        worker processes which were not forked from this one
+        :param directory: Directory of the plugin or workflow the events are about
+        """
+        self.fd = fd
+        self.path = path
+        self.directory = directory
+
+    def bind(self, directory: str) -> "EventStream":
+        """
+        Returns a stream writing to the same place whose events are about directory
+        """
+        return EventStream(self.fd, self.path, directory)
+
+    def emit(self, event: str, **fields):
+        line = (json.dumps({"event": event, "directory": self.directory, "time": time.time(), **fields}) + "\n")
+        if self.path:
+            with open(self.path, "ab", buffering=0) as f:
+                f.write(line.encode())
+        else:
+            os.write(self.fd, line.encode())
+
+    def start(self, name: str):
+        self.emit("start", validator=name)
+
+    def finish(self, result):
+        """
+        :param result: ValidatorResult of the validator which finished
+        """
+        if result.success:
+            status = "passed"
+        else:
+            status = "timeout" if isinstance(result.error, ValidationTimeout) else "failed"
+        fields = {"validator": result.name, "status": status,
+                  "duration_ms": result.wall_time, "cached": result.cached}
+        if not result.success:
+            fields.update(error_fields(result.error))
+        self.emit("finish", **fields)
+
+    def crash(self, name: str, error: Exception):
+        """
+        Reports a validator which raised something other than a ValidationException
+        """
+        self.emit("finish", validator=name, status="error", message=repr(error))
+
+    def cancelled(self, name: str):
+        """
+        Reports a validator which was stopped before it finished
+        """
+        self.emit("finish", validator=name, status="cancelled")
+
+    def end(self, status: int, time_elapsed: float):
+        self.emit("end", status="passed" if status == 0 else "failed", duration_ms=time_elapsed)
+
+
+def error_fields(error: ValidationException) -> dict:
+    """
+    Returns the structured details of a validation failure
+    """
+    return {
+        "message": str(error.args[0]) if len(error.args) == 1 else " ".join(str(arg) for arg in error.args),
+        "rule_id": getattr(error, "rule_id", None),
+        "file": getattr(error, "file", None),
+        "line": getattr(error, "line", None),
+    }
@@ -1,6 +1,37 @@
+import functools
+
+
 class ValidationException(Exception):
     """
     An exception which indicates that a validator has failed
     """
-    # TODO report back which validator rule failed
-    pass
+
+    def __init__(self, *args, rule_id: str = None, file: str = None, line: int = None):
+        """
+        :param args: Message describing the failure
+        :param rule_id: Identifier of the rule which failed, defaults to the name of the validator's class
+        :param file: File, relative to the plugin or workflow directory, the failure was found in (optional)
+        :param line: Line of file the failure was found on, starting at 1 (optional)
+        """
+        super().__init__(*args)
+        self.rule_id = rule_id
+        self.file = file
+        self.line = line
+
+    def __reduce__(self):
+        # Exceptions only pickle their args by default, and results of parallel runs are pickled
+        return (functools.partial(type(self), rule_id=self.rule_id, file=self.file, line=self.line),
+                self.args, self.__dict__)
+
+
+class ValidationTimeout(ValidationException):
+    """
+    An exception which indicates that a validator was stopped for running longer than its time budget
+    """
+
+
+class ValidationCancelled(Exception):
+    """
+    An exception which indicates that a validator was stopped before finishing, because the result of the run
+    was already known
+    """
@@ -0,0 +1,403 @@
+import io
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, ProcessPoolExecutor, wait
+from contextlib import redirect_stdout
+
+from icon_validator.cancellation import CancellationToken, cancellation_of, current
+from icon_validator.exceptions import ValidationCancelled, ValidationException, ValidationTimeout
+from icon_validator.styling import *
+from icon_validator.timing import *
+
+
+class ValidatorResult:
+    """
+    Outcome of a single validator run
+    """
+
+    def __init__(self, name: str, error: ValidationException = None, output: str = "", cached: bool = False):
+        """
+        :param name: Name of the validator which produced this result
+        :param error: The ValidationException raised by the validator, None if it passed
+        :param output: Anything the validator printed while running, when its output was captured
+        :param cached: Whether the result was replayed from the result cache instead of running the validator
+        """
+        self.name = name
+        self.error = error
+        self.output = output
+        self.cached = cached
+        # Milliseconds spent running the validator, wall clock and CPU time of the thread running it
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+# Seconds an isolated validator gets to clean up, e.g. kill its docker build, before it is killed
+TERMINATE_GRACE_SECONDS = 2
+
+
+def _timeout(validator, budget: float) -> ValidationTimeout:
+    return ValidationTimeout(f"{validator.name} did not finish within its time budget of {budget:g}s. "
+                             f"Use --time-budget {type(validator).__name__}=SECONDS to change it.")
+
+
+def _validate_watched(validator, spec, budget: float) -> ValidationException:
+    """
+    Runs a validator in this thread with a watchdog which cancels it once its budget is spent
+    :return: The ValidationException the validator raised, None if it passed
+    """
+    token = CancellationToken()
+    timed_out = threading.Event()
+
+    def expire():
+        timed_out.set()
+        token.cancel()
+
+    watchdog = threading.Timer(budget, expire) if budget else None
+    with cancellation_of(spec).on_cancel(token.cancel), current(token):
+        if watchdog:
+            watchdog.daemon = True
+            watchdog.start()
+        try:
+            validator.validate(spec)
+        except ValidationException as e:
+            return e
+        except ValidationCancelled:
+            if timed_out.is_set():
+                return _timeout(validator, budget)
+            raise
+        finally:
+            if watchdog:
+                watchdog.cancel()
+    return None
+
+
+def _isolated_child(sender, validator, spec):
+    token = CancellationToken()
+    # Terminating the process cancels the validator, which stops anything it started, before exiting
+    signal.signal(signal.SIGTERM, lambda *_: token.cancel())
+    buffer = io.StringIO()
+    with redirect_stdout(buffer), current(token):
+        try:
+            validator.validate(spec)
+            outcome = ("passed", None)
+        except ValidationException as e:
+            outcome = ("failed", e)
+        except ValidationCancelled:
+            outcome = ("cancelled", None)
+        except Exception as e:
+            outcome = ("crashed", RuntimeError(f"{validator.name} raised {e!r}"))
+    sender.send((outcome, buffer.getvalue()))
+    sender.close()
+
+
+def _validate_isolated(validator, spec, budget: float) -> ValidationException:
+    """
+    Runs a validator in a separate process which is killed once its budget is spent
+    :return: The ValidationException the validator raised, None if it passed
+    """
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_isolated_child, args=(sender, validator, spec), daemon=True)
+    process.start()
+    sender.close()
+    try:
+        with cancellation_of(spec).on_cancel(process.terminate):
+            if not receiver.poll(budget):
+                return _timeout(validator, budget)
+            try:
+                (status, error), output = receiver.recv()
+            except EOFError:
+                cancellation_of(spec).raise_if_cancelled()
+                raise RuntimeError(f"{validator.name} exited unexpectedly in its isolated process")
+    finally:
+        if process.is_alive():
+            process.terminate()
+            process.join(TERMINATE_GRACE_SECONDS)
+            if process.is_alive():
+                process.kill()
+        process.join()
+        receiver.close()
+
+    print(output, end="")
+    if status == "cancelled":
+        raise ValidationCancelled()
+    if status == "crashed":
+        raise error
+    return error
+
+
+def run_validator(validator, spec, events=None, budgets=None) -> ValidatorResult:
+    """
+    Runs one validator against a spec, printing the same header the sequential report always has
+    :param validator: Validator to run
+    :param spec: Spec of the plugin or workflow being validated
+    :param events: EventStream to report the start and finish of the validator to
+    :param budgets: TimeBudgets to take the validator's budget from, defaults to its own time_budget
+    :return: ValidatorResult for the run
+    """
+    budget = budgets.budget_for(validator) if budgets else validator.time_budget
+    if events:
+        events.start(validator.name)
+    print(f"{BULLET_OK} Executing validator {validator.name}")
+    start_time, start_cpu_time = time_now(), cpu_time_now()
+    try:
+        if budgets and budgets.isolates(validator):
+            error = _validate_isolated(validator, spec, budget)
+        else:
+            error = _validate_watched(validator, spec, budget)
+        if error is not None and error.rule_id is None:
+            error.rule_id = type(validator).__name__
+        result = ValidatorResult(validator.name, error=error)
+    except ValidationCancelled:
+        if events:
+            events.cancelled(validator.name)
+        raise
+    except Exception as e:
+        if events:
+            events.crash(validator.name, e)
+        raise
+    result.wall_time = format_time(start=start_time, end=time_now())
+    result.cpu_time = format_time(start=start_cpu_time, end=cpu_time_now())
+    if events:
+        events.finish(result)
+    return result
+
+
+def _replay_events(events, result: ValidatorResult):
+    # Cached results never go through run_validator, report them when they are looked up
+    if events:
+        events.start(result.name)
+        events.finish(result)
+
+
+class _Tee(io.TextIOBase):
+    """
+    Stream which passes writes through while keeping a copy of them
+    """
+
+    def __init__(self, stream):
+        super().__init__()
+        self._stream = stream
+        self._copy = io.StringIO()
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        self._stream.write(text)
+        return self._copy.write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+    def getvalue(self) -> str:
+        return self._copy.getvalue()
+
+
+def run_sequentially(validators: list, spec, fail_fast: bool = False, cache=None, events=None, budgets=None,
+                     prefetcher=None):
+    """
+    Runs the validators one after another, yielding a ValidatorResult for each
+    :param validators: Validators to run
+    :param spec: Spec of the plugin or workflow being validated
+    :param fail_fast: Stop after the first failure
+    :param cache: ResultCache to replay unchanged results from and record new ones in
+    :param events: EventStream to report each validator's start and finish to
+    :param budgets: TimeBudgets limiting how long each validator may run
+    :param prefetcher: Prefetcher to start the fetch steps of the validators on before running them
+    """
+    # Nothing runs alongside, so there is never anything to cancel, but a context reused from a
+    # cancelled parallel run must not stop these validators
+    spec.cancellation = CancellationToken()
+    if prefetcher:
+        prefetcher.start(validators, spec)
+    for validator in validators:
+        result = cache.lookup(validator, spec) if cache else None
+        if result:
+            _replay_events(events, result)
+            print(result.output, end="")
+        elif cache:
+            tee = _Tee(sys.stdout)
+            with redirect_stdout(tee):
+                result = run_validator(validator, spec, events, budgets)
+            result.output = tee.getvalue()
+            cache.store(validator, spec, result)
+        else:
+            result = run_validator(validator, spec, events, budgets)
+        yield result
+        if fail_fast and not result.success:
+            return
+
+
+class _ThreadLocalStdout(io.TextIOBase):
+    """
+    Stand-in for sys.stdout which sends writes from capturing threads to that thread's buffer.
+    redirect_stdout swaps the stream for the whole process, so it can't be used from worker threads.
+    """
+
+    def __init__(self, default):
+        super().__init__()
+        self._default = default
+        self._local = threading.local()
+
+    def _target(self):
+        return getattr(self._local, "buffer", None) or self._default
+
+    def capture(self) -> io.StringIO:
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+
+    def release(self):
+        self._local.buffer = None
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+
+def _run_in_thread(stdout: _ThreadLocalStdout, validator, spec, events, budgets) -> ValidatorResult:
+    buffer = stdout.capture()
+    try:
+        result = run_validator(validator, spec, events, budgets)
+    except Exception as e:
+        # Unexpected errors still propagate, but keep what the validator printed so it can be flushed first
+        e.validator_output = buffer.getvalue()
+        raise
+    finally:
+        stdout.release()
+    result.output = buffer.getvalue()
+    return result
+
+
+def _run_in_process(validator, spec, events, budgets) -> ValidatorResult:
+    # Each worker process runs one validator at a time, so swapping the process-wide stdout is safe here
+    buffer = io.StringIO()
+    try:
+        with redirect_stdout(buffer):
+            result = run_validator(validator, spec, events, budgets)
+    except Exception as e:
+        e.validator_output = buffer.getvalue()
+        raise
+    result.output = buffer.getvalue()
+    return result
+
+
+def _failed(future: Future) -> bool:
+    # Only called on finished futures, validators which crashed or were cancelled didn't fail validation
+    return not future.cancelled() and future.exception() is None and not future.result().success
+
+
+def _cancel(token: CancellationToken, futures: list):
+    token.cancel()
+    # Validators not started yet are dropped one by one, shutdown(cancel_futures=True) needs Python 3.9
+    for future in futures:
+        if future:
+            future.cancel()
+
+
+class ParallelRunner:
+    """
+    Runs independent validators concurrently: I/O-bound validators on a thread pool and
+    everything else on a process pool. Output of every validator is buffered and results
+    are yielded in the declared order, so the report matches a sequential run.
+    """
+
+    def __init__(self, workers: int = None):
+        """
+        :param workers: Maximum number of worker processes for CPU-bound validators, defaults to the CPU count
+        """
+        self.workers = workers or os.cpu_count() or 1
+
+    def run(self, validators: list, spec, fail_fast: bool = False, cache=None, events=None, history=None,
+            budgets=None, prefetcher=None):
+        """
+        Runs the validators and yields ValidatorResults in declared order as soon as each is available
+        :param validators: Validators to run
+        :param spec: Spec of the plugin or workflow being validated
+        :param fail_fast: Stop after the first failure: validators not yet started are dropped, and those
+        waiting on the network, git or subprocesses are cancelled through the spec's cancellation token.
+        The first validator to fail stops the run whatever its declared position; validators declared before
+        it which were cancelled have no result.
+        :param cache: ResultCache to replay unchanged results from and record new ones in
+        :param events: EventStream to report each validator's start and finish to. Workers write events
+        themselves, so they arrive as validators finish rather than in declared order.
+        :param history: RunHistory used to hand the validators expected to take longest to workers first
+        :param budgets: TimeBudgets limiting how long each validator may run
+        :param prefetcher: Prefetcher to start the fetch steps of the validators on, which only validators
+        running on threads pick up
+        """
+        # Validators on threads see cancellation straight away, those in worker processes get a copy of the
+        # token which is never cancelled and are left to finish
+        token = spec.cancellation = CancellationToken()
+        futures = [None] * len(validators)
+        if cache:
+            for index, validator in enumerate(validators):
+                cached = cache.lookup(validator, spec)
+                if cached:
+                    _replay_events(events, cached)
+                    futures[index] = Future()
+                    futures[index].set_result(cached)
+
+        to_run = [v for v, future in zip(validators, futures) if future is None]
+        io_bound = [v for v in to_run if v.io_bound]
+        cpu_bound = [v for v in to_run if not v.io_bound]
+
+        stdout = _ThreadLocalStdout(sys.stdout)
+        processes = ProcessPoolExecutor(max_workers=min(self.workers, len(cpu_bound))) if cpu_bound else None
+        threads = ThreadPoolExecutor(max_workers=len(io_bound)) if io_bound else None
+        sys.stdout = stdout
+        try:
+            # Submit process work first so worker processes are forked before any of our threads start
+            positions = {id(validator): index for index, validator in enumerate(validators)}
+            for validator in history.longest_first(validators) if history else validators:
+                index = positions[id(validator)]
+                if futures[index] is None and not validator.io_bound:
+                    futures[index] = processes.submit(_run_in_process, validator, spec, events, budgets)
+            if prefetcher:
+                prefetcher.start([v for v, future in zip(validators, futures) if future is None], spec)
+            for index, validator in enumerate(validators):
+                if futures[index] is None and validator.io_bound:
+                    futures[index] = threads.submit(_run_in_thread, stdout, validator, spec, events, budgets)
+
+            running = set(futures)
+            for validator, future in zip(validators, futures):
+                # Any validator failing stops the run, not only the next one in declared order, so every
+                # validator still running is watched while waiting for this one
+                while fail_fast and not token.cancelled and not future.done():
+                    finished, running = wait(running, return_when=FIRST_COMPLETED)
+                    if any(_failed(f) for f in finished):
+                        _cancel(token, futures)
+                if token.cancelled and (future.cancelled() or isinstance(future.exception(), ValidationCancelled)):
+                    # Stopped by a failure of a validator declared after it
+                    continue
+                try:
+                    result = future.result()
+                except Exception as e:
+                    sys.stdout.write(getattr(e, "validator_output", ""))
+                    raise
+                sys.stdout.write(result.output)
+                if cache and not result.cached:
+                    cache.store(validator, spec, result)
+                yield result
+                if fail_fast and not result.success:
+                    _cancel(token, futures)
+                    return
+        finally:
+            # Cancelled validators end promptly, their threads are waited for so none writes to stdout once restored
+            _cancel(token, futures)
+            for executor in (processes, threads):
+                if executor:
+                    executor.shutdown(wait=True)
+            sys.stdout = stdout._default
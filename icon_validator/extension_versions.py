@@ -0,0 +1,176 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from icon_validator.cancellation import CancellationToken, NEVER_CANCELLED
+from icon_validator.locks import file_lock
+from icon_validator.transport import LIVE, Transport, from_requests
+
+EXTENSIONS_URL = "https://extensions-api.rapid7.com/v1/public/extensions"
+
+DEFAULT_VERSIONS_FILE = os.path.join(os.path.expanduser("~"), ".cache", "icon-validator", "versions.json")
+
+# Seconds a looked up version is trusted for. Releases are rare, but a plugin released an hour ago should
+# already be compared against its new version
+VERSIONS_TTL = 60 * 60
+
+
+def fetch_extension_version(name: str, url: str = EXTENSIONS_URL, session=None,
+                            token: CancellationToken = NEVER_CANCELLED, transport: Transport = LIVE) -> str:
+    """
+    Looks up the version of an extension published in the Extension Library
+    :param name: Name of the extension, e.g. active_directory_ldap
+    :param url: URL of the extensions API
+    :param session: requests.Session to send the request through, defaults to a new connection
+    :param token: CancellationToken checked before the request is sent
+    :param transport: Transport sending the request
+    :return: The published version, None if the extension isn't published
+    :raises OSError if the API couldn't be reached or answered with an error
+    """
+
+    def send(method, url, headers):
+        # requests is slow to import, and only needed once a validator goes to the network
+        import requests
+        return from_requests((session or requests).request(method, url=url, headers=headers, timeout=3))
+
+    response = transport.request("GET", f"{url}/{name}", send, token=token)
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.json()["version"]
+
+
+class ExtensionVersions:
+    """
+    Published versions of extensions, looked up concurrently over one pooled session, remembered for the run
+    and kept in a local JSON file shared by every plugin, so a batch run asks for each version once
+    """
+
+    def __init__(self, path: str = None, ttl: float = VERSIONS_TTL, url: str = EXTENSIONS_URL, workers: int = 16,
+                 transport: Transport = LIVE):
+        """
+        :param path: Versions file, defaults to $ICON_VALIDATOR_VERSIONS_FILE or ~/.cache/icon-validator/versions.json
+        :param ttl: Seconds a looked up version is reused for
+        :param url: URL of the extensions API
+        :param workers: Versions looked up at the same time
+        :param transport: Transport the versions are looked up through
+        """
+        self.path = path or os.environ.get("ICON_VALIDATOR_VERSIONS_FILE") or DEFAULT_VERSIONS_FILE
+        self.ttl = ttl
+        self.url = url
+        self.workers = workers
+        self.transport = transport
+        self.entries = self._load()
+        # Versions looked up by this process which are not saved yet
+        self._pending = {}
+        self._session = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Locks and sessions can't be pickled, which parallel runs need to hand the versions to worker processes
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_session"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def session(self):
+        """
+        Returns the session every lookup goes through, with a connection pool as large as the lookups
+        running at the same time
+        """
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                self._session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+                self._session.mount("https://", adapter)
+                self._session.mount("http://", adapter)
+            return self._session
+
+    def known(self, name: str, expired: bool = False) -> dict:
+        """
+        :param name: Name of the extension
+        :param expired: Return the entry even if it is older than the TTL
+        :return: Entry holding the published "version" of the extension, None if it wasn't looked up recently
+        """
+        with self._lock:
+            entry = self.entries.get(name)
+        if not isinstance(entry, dict) or "version" not in entry:
+            return None
+        if not expired and time.time() - entry.get("checked", 0) > self.ttl:
+            return None
+        return entry
+
+    def _look_up(self, name: str, token: CancellationToken) -> str:
+        version = fetch_extension_version(name, self.url, self.session(), token, self.transport)
+        entry = {"version": version, "checked": time.time()}
+        with self._lock:
+            self.entries[name] = entry
+            self._pending[name] = entry
+        return version
+
+    def version(self, name: str, token: CancellationToken = NEVER_CANCELLED) -> str:
+        """
+        Returns the published version of an extension, looking it up unless that was done recently
+        :return: The published version, None if the extension isn't published
+        :raises OSError if the API couldn't be reached or answered with an error
+        """
+        entry = self.known(name)
+        if entry is not None:
+            return entry["version"]
+        return self._look_up(name, token)
+
+    def prefetch(self, names: [str], token: CancellationToken = NEVER_CANCELLED):
+        """
+        Looks up the versions of many extensions at once, e.g. of every plugin in a batch run, before their
+        validators ask for them. Failed lookups are left for the validators to retry and report.
+        """
+        missing = [name for name in dict.fromkeys(names) if self.known(name) is None]
+        if not missing:
+            return
+
+        def look_up(name):
+            try:
+                self._look_up(name, token)
+            except Exception:
+                pass
+
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(missing))) as executor:
+            list(executor.map(look_up, missing))
+        self.save()
+
+    def save(self):
+        """
+        Writes the versions looked up since the last save, keeping those saved meanwhile by other processes
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with file_lock(self.path):
+                entries = self._load()
+                entries.update(pending)
+                with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(self.path), delete=False) as f:
+                    json.dump(entries, f, indent=1, sort_keys=True)
+                os.replace(f.name, self.path)
+        except OSError:
+            # Versions are just looked up again next time
+            pass
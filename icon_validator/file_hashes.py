@@ -0,0 +1,182 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import md5
+
+from icon_validator.locks import file_lock
+
+DEFAULT_HASH_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "icon-validator", "file-hashes.json")
+
+# Files are read this many bytes at a time, so large bin files or Go sources are never held in memory at once
+CHUNK_SIZE = 1024 * 1024
+
+# Files at least this big are hashed on a pool of threads
+POOLED_SIZE = 256 * 1024
+
+# Files modified this recently may change again within the same mtime tick without their stat changing, they
+# are hashed on every run until they settle, like git does for its index
+RACY_SECONDS = 2
+
+# Directories never holding a plugin's own schemas: caches, version control and installed dependencies
+SKIPPED_DIRECTORIES = {"__pycache__", "node_modules", "site-packages"}
+
+
+def is_skipped_directory(root: str, name: str) -> bool:
+    """
+    Whether a directory found walking a plugin holds vendored or installed code rather than the plugin's own, e.g.
+    .git, a virtualenv or node_modules
+    :param root: Directory being walked
+    :param name: Name of the directory in it
+    """
+    return name.startswith(".") or name in SKIPPED_DIRECTORIES \
+        or os.path.isfile(os.path.join(root, name, "pyvenv.cfg"))
+
+
+def md5_file(path: str) -> str:
+    """
+    Returns the MD5 of a file, read in chunks
+    :raises OSError if the file can't be read
+    """
+    digest = md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileHashCache:
+    """
+    MD5s of files hashed by earlier runs, kept in a local JSON file, so unchanged files are not read again.
+    An entry is used as long as the file's size, modification time and inode are the same as when it was hashed.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        :param path: Cache file, defaults to $ICON_VALIDATOR_HASH_CACHE_FILE or
+        ~/.cache/icon-validator/file-hashes.json
+        """
+        self.path = path or os.environ.get("ICON_VALIDATOR_HASH_CACHE_FILE") or DEFAULT_HASH_CACHE_FILE
+        self.entries = self._load()
+        # Files hashed by this process which are not saved yet
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Locks can't be pickled, which parallel runs need to hand the cache to worker processes
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _stamp(stat: os.stat_result) -> list:
+        return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+    def lookup(self, path: str, stat: os.stat_result) -> str:
+        """
+        :param path: Absolute path of the file
+        :param stat: Current stat of the file
+        :return: MD5 of the file, None if it is not in the cache or changed since it was hashed
+        """
+        with self._lock:
+            entry = self.entries.get(path)
+        if not isinstance(entry, dict) or entry.get("stamp") != self._stamp(stat):
+            return None
+        return entry.get("md5")
+
+    def record(self, path: str, stat: os.stat_result, hash_: str):
+        """
+        :param path: Absolute path of the file
+        :param stat: Stat of the file taken before it was hashed
+        :param hash_: MD5 of the file
+        """
+        if time.time_ns() - stat.st_mtime_ns < RACY_SECONDS * 1_000_000_000:
+            return
+        entry = {"stamp": self._stamp(stat), "md5": hash_}
+        with self._lock:
+            self.entries[path] = entry
+            self._pending[path] = entry
+
+    def save(self):
+        """
+        Writes the files hashed since the last save. The file is re-read under a lock first, so
+        hashes saved meanwhile by other processes, e.g. when validating many plugins at once, are kept.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with file_lock(self.path):
+                entries = self._load()
+                entries.update(pending)
+                with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(self.path), delete=False) as f:
+                    json.dump(entries, f)
+                os.replace(f.name, self.path)
+        except OSError:
+            # Files are just hashed again next time
+            pass
+
+
+def hash_cache_of(spec) -> FileHashCache:
+    """
+    Returns the FileHashCache of the run a spec is being validated in, None when the run doesn't cache
+    """
+    return getattr(spec, "hash_cache", None)
+
+
+def _hash(path: str, stat: os.stat_result, cache: FileHashCache) -> str:
+    hash_ = md5_file(path)
+    if cache:
+        cache.record(path, stat, hash_)
+    return hash_
+
+
+def hash_files(paths: [str], cache: FileHashCache = None, workers: int = None) -> {str: str}:
+    """
+    Returns the MD5s of many files. Large files are hashed on a pool of threads, hashlib releases the GIL while
+    hashing, small ones straight away as handing them to a thread takes longer than hashing them
+    :param paths: Files to hash, absolute paths when a cache is used
+    :param cache: FileHashCache to take the hashes of unchanged files from and record new ones in
+    :param workers: Maximum number of threads, defaults to ThreadPoolExecutor's
+    :return: Path to its MD5, for each path given. Files which can't be read are left out
+    """
+    hashes = {}
+    large = []
+    for path in dict.fromkeys(paths):
+        try:
+            stat = os.stat(path)
+            hash_ = cache.lookup(path, stat) if cache else None
+            if hash_ is None and stat.st_size < POOLED_SIZE:
+                hash_ = _hash(path, stat, cache)
+        except OSError:
+            continue
+        if hash_ is None:
+            large.append((path, stat))
+        else:
+            hashes[path] = hash_
+
+    if large:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="md5") as executor:
+            futures = {path: executor.submit(_hash, path, stat, cache) for path, stat in large}
+        for path, future in futures.items():
+            try:
+                hashes[path] = future.result()
+            except OSError:
+                continue
+    return hashes
@@ -0,0 +1,121 @@
+import json
+import os
+import statistics
+import tempfile
+
+from icon_validator.locks import file_lock
+
+DEFAULT_HISTORY_FILE = os.path.join(os.path.expanduser("~"), ".cache", "icon-validator", "history.json")
+
+# Weight of the latest run in each validator's moving averages, so the history follows
+# a validator getting faster or a plugin being fixed within a few runs
+SMOOTHING = 0.3
+
+# Failure rate assumed for validators which never failed, so their cost still orders them
+MINIMUM_FAILURE_RATE = 0.01
+
+
+class RunHistory:
+    """
+    Durations and failure rates of validators across runs, kept in a local JSON file.
+    Used to order validators so that a broken plugin fails as early as possible in fail fast mode,
+    and to start the longest validators first in parallel mode.
+    """
+
+    def __init__(self, path: str = None):
+        """
+        :param path: History file, defaults to $ICON_VALIDATOR_HISTORY_FILE or ~/.cache/icon-validator/history.json
+        """
+        self.path = path or os.environ.get("ICON_VALIDATOR_HISTORY_FILE") or DEFAULT_HISTORY_FILE
+        self.entries = self._load()
+        # Runs recorded by this process which are not saved yet
+        self._pending = []
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _update(entries: dict, name: str, wall_time: float, failed: bool):
+        entry = entries.get(name)
+        if not isinstance(entry, dict):
+            entries[name] = {"runs": 1, "ms": wall_time, "failure_rate": float(failed)}
+            return
+        entry["runs"] = entry.get("runs", 0) + 1
+        entry["ms"] = (1 - SMOOTHING) * entry.get("ms", wall_time) + SMOOTHING * wall_time
+        entry["failure_rate"] = (1 - SMOOTHING) * entry.get("failure_rate", float(failed)) + SMOOTHING * failed
+
+    def record(self, results: list):
+        """
+        Adds the outcome of a run. Results replayed from the cache say nothing about the validator's cost
+        and are left out.
+        :param results: ValidatorResults of the run
+        """
+        for result in results:
+            if result.cached:
+                continue
+            self._pending.append((result.name, result.wall_time, not result.success))
+            self._update(self.entries, result.name, result.wall_time, not result.success)
+
+    def save(self):
+        """
+        Writes the runs recorded since the last save. The file is re-read under a lock first, so
+        runs saved meanwhile by other processes, e.g. when validating many directories at once, are kept.
+        """
+        if not self._pending:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with file_lock(self.path):
+                entries = self._load()
+                for name, wall_time, failed in self._pending:
+                    self._update(entries, name, wall_time, failed)
+                with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(self.path), delete=False) as f:
+                    json.dump(entries, f, indent=1, sort_keys=True)
+                os.replace(f.name, self.path)
+            self.entries = entries
+            self._pending = []
+        except OSError:
+            # Scheduling just falls back to the declared order
+            pass
+
+    def expected_time(self, validator, default: float = None) -> float:
+        """
+        Returns the milliseconds a validator is expected to take. Validators without history are
+        expected to take default, or as long as the median one when there's no default.
+        """
+        entry = self.entries.get(validator.name)
+        if isinstance(entry, dict) and "ms" in entry:
+            return entry["ms"]
+        if default is not None:
+            return default
+        known = [entry["ms"] for entry in self.entries.values() if isinstance(entry, dict) and "ms" in entry]
+        return statistics.median(known) if known else 0.0
+
+    def failure_rate(self, validator) -> float:
+        """
+        Returns how likely a validator is to fail, from its recent runs. Validators without history are
+        given even odds, so they run early and get some.
+        """
+        entry = self.entries.get(validator.name)
+        if isinstance(entry, dict) and "failure_rate" in entry:
+            return entry["failure_rate"]
+        return 0.5
+
+    def fail_fast_order(self, validators: list) -> list:
+        """
+        Orders validators to reach the first failure as soon as possible: by expected time per chance
+        of failing, so cheap and failure prone validators come first. Ties keep the declared order.
+        """
+        return sorted(validators, key=lambda v: self.expected_time(v) / max(self.failure_rate(v),
+                                                                            MINIMUM_FAILURE_RATE))
+
+    def longest_first(self, validators: list) -> list:
+        """
+        Orders validators by expected time, longest first, so a slow validator doesn't start last and run alone
+        """
+        return sorted(validators, key=self.expected_time, reverse=True)
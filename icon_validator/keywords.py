@@ -0,0 +1,171 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from icon_validator.cancellation import CancellationToken, NEVER_CANCELLED
+from icon_validator.locks import file_lock
+from icon_validator.styling import *
+from icon_validator.transport import LIVE, Response, Transport, from_requests
+
+TAGS_URL = "https://extensions-api.rapid7.com/v2/public/tags"
+
+DEFAULT_KEYWORD_SNAPSHOT_FILE = os.path.join(os.path.expanduser("~"), ".cache", "icon-validator", "keywords.json")
+
+# Seconds a snapshot of the approved keywords is used for before it is refreshed
+SNAPSHOT_TTL = 24 * 60 * 60
+
+
+def keyword_tags(response_json: dict) -> [str]:
+    """
+    Returns the names of the keyword tags in a page of the tags API
+    """
+    return [result["name"] for result in response_json["results"] if result["type"] == "keyword"]
+
+
+def _send(method: str, url: str, headers: dict) -> Response:
+    # requests is slow to import, and only needed once a validator goes to the network
+    import requests
+    return from_requests(requests.request(method, url=url, headers=headers, timeout=10))
+
+
+def fetch_approved_keywords(url: str = TAGS_URL, token: CancellationToken = NEVER_CANCELLED,
+                            etag: str = None, transport: Transport = LIVE) -> ([str], str):
+    """
+    Downloads every page of approved keywords from the tags API
+    :param url: URL of the tags API
+    :param token: CancellationToken stopping the download between pages
+    :param etag: ETag of the first page when the keywords were last downloaded
+    :param transport: Transport sending the requests
+    :return: Tuple of the keywords, None if the first page still matches etag, and the ETag of the first page
+    :raises OSError if the API couldn't be reached or answered with an error
+    """
+    keywords = []
+    query = ""
+    first_etag = None
+    for i in range(0, 9999):
+        headers = {"If-None-Match": etag} if etag and not query else {}
+        response = transport.request("GET", f"{url}?first=1000&{query}", _send, headers, token)
+        if response.status_code == 304:
+            return None, etag
+        response.raise_for_status()
+        if not query:
+            first_etag = response.header("ETag")
+        response_json = response.json()
+        keywords.extend(keyword_tags(response_json))
+        if not response_json["pageInfo"]["hasNextPage"]:
+            break
+
+        query = f"after={response_json['pageInfo']['endCursor']}"
+
+    return keywords, first_etag
+
+
+class KeywordSnapshot:
+    """
+    Approved keywords of the Extension Library, kept in a local JSON file and refreshed once it is older
+    than its TTL, so they are downloaded once a day rather than for every plugin and workflow validated
+    """
+
+    def __init__(self, path: str = None, ttl: float = SNAPSHOT_TTL, url: str = TAGS_URL,
+                 transport: Transport = LIVE):
+        """
+        :param path: Snapshot file, defaults to $ICON_VALIDATOR_KEYWORD_SNAPSHOT_FILE or
+        ~/.cache/icon-validator/keywords.json
+        :param ttl: Seconds the snapshot is used for before it is refreshed
+        :param url: URL of the tags API
+        :param transport: Transport the keywords are downloaded through
+        """
+        self.path = path or os.environ.get("ICON_VALIDATOR_KEYWORD_SNAPSHOT_FILE") or DEFAULT_KEYWORD_SNAPSHOT_FILE
+        self.ttl = ttl
+        self.url = url
+        self.transport = transport
+        # Loaded once per process, by the first validator needing them
+        self._keywords = None
+        # Why the keywords are out of date, when they couldn't be refreshed
+        self.warning = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Locks can't be pickled, which parallel runs need to hand the snapshot to worker processes
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path) as f:
+                snapshot = json.load(f)
+            if isinstance(snapshot, dict) and isinstance(snapshot.get("keywords"), list):
+                return snapshot
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _fresh(self, snapshot: dict) -> bool:
+        return snapshot is not None and time.time() - snapshot.get("fetched", 0) <= self.ttl
+
+    def _save(self, snapshot: dict):
+        try:
+            with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(self.path), delete=False) as f:
+                json.dump(snapshot, f, indent=1)
+            os.replace(f.name, self.path)
+        except OSError:
+            # The keywords are just downloaded again next time
+            pass
+
+    @contextmanager
+    def _refreshing(self):
+        # Only one process refreshes the snapshot, the others wait and use what it downloaded
+        with ExitStack() as stack:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                stack.enter_context(file_lock(self.path))
+            except OSError:
+                # Without the lock, processes may each download the keywords
+                pass
+            yield
+
+    def _refresh(self, token: CancellationToken) -> dict:
+        snapshot = self._load()
+        if self._fresh(snapshot):
+            return snapshot
+        with self._refreshing():
+            snapshot = self._load()
+            if self._fresh(snapshot):
+                return snapshot
+            try:
+                keywords, etag = fetch_approved_keywords(self.url, token, snapshot and snapshot.get("etag"),
+                                                         self.transport)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                if snapshot is None:
+                    raise
+                # Refreshes run on prefetch threads, which mustn't print, the validator reports it
+                self.warning = f"Couldn't refresh the approved keywords ({e}), using those downloaded earlier"
+                return snapshot
+            if keywords is None:
+                keywords = snapshot["keywords"]
+            snapshot = {"keywords": sorted(set(keywords)), "etag": etag, "fetched": time.time()}
+            self._save(snapshot)
+            return snapshot
+
+    def approved_keywords(self, token: CancellationToken = NEVER_CANCELLED, offline: bool = False) -> frozenset:
+        """
+        Returns the approved keywords, refreshing the snapshot first if it is out of date
+        :param token: CancellationToken stopping a refresh
+        :param offline: Never refresh the snapshot, however old it is
+        :return: The approved keywords, None in offline mode if there is no snapshot yet
+        """
+        with self._lock:
+            if self._keywords is None:
+                snapshot = self._load() if offline else self._refresh(token)
+                if snapshot is None:
+                    return None
+                self._keywords = frozenset(snapshot["keywords"])
+            return self._keywords
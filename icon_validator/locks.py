@@ -0,0 +1,45 @@
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, which has msvcrt instead
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+
+def _lock_windows(fd: int):
+    while True:
+        try:
+            # Gives up after about 10 seconds, a process holding the lock longer is waited for again
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            continue
+
+
+@contextmanager
+def file_lock(path: str):
+    """
+    Holds an exclusive lock on path.lock, so processes updating the same file, e.g. batch workers saving to a
+    cache, take turns re-reading and writing it. Uses flock, or msvcrt on Windows, and doesn't lock at all
+    where neither is available.
+    :param path: File the lock is for, the lock file is created next to it
+    :raises OSError if the lock file can't be opened
+    """
+    with open(f"{path}.lock", "w") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+        elif msvcrt:
+            _lock_windows(lock.fileno())
+            try:
+                yield
+            finally:
+                lock.seek(0)
+                msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            yield
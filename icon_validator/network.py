@@ -0,0 +1,52 @@
+from icon_validator.remote_spec import DEFAULT_BASE_REF
+from icon_validator.transport import LIVE, Transport
+
+
+class NetworkSettings:
+    """
+    How validators reaching remote services or the git remote behave in a run: the caches they share and
+    whether they may go to the network at all. Runs hand them to validators on the spec, see network_of.
+    """
+
+    def __init__(self, url_cache=None, url_cache_only: bool = False, keyword_snapshot=None,
+                 keyword_snapshot_only: bool = False, extension_versions=None, version_snapshot_only: bool = False,
+                 transport: Transport = LIVE, base_ref: str = DEFAULT_BASE_REF, remote_spec_cache=None,
+                 releases: int = None):
+        """
+        :param url_cache: URLStatusCache to reuse recent URL tests from, None to test every URL
+        :param url_cache_only: Don't test URLs, only report those the URL cache remembers as broken
+        :param keyword_snapshot: KeywordSnapshot to take the approved keywords from, None to download them
+        every time they are needed
+        :param keyword_snapshot_only: Don't refresh the keyword snapshot, however old it is
+        :param extension_versions: ExtensionVersions to look up published versions through, None to ask the
+        Extension Library for each plugin
+        :param version_snapshot_only: Don't look up versions, use those looked up earlier however old they are
+        :param transport: Transport every request goes through, e.g. a ReplayingTransport answering from
+        a cassette recorded earlier
+        :param base_ref: Branch, tag or commit plugins are compared against to check their version was bumped
+        :param remote_spec_cache: RemoteSpecCache to take the specs on the base ref from, None to read them
+        from git every time
+        :param releases: Also check plugins against the specs of their releases in the history of the base ref,
+        this many before the one on the base ref or 0 for all of them. None to only check against the base ref
+        """
+        self.url_cache = url_cache
+        self.url_cache_only = url_cache_only
+        self.keyword_snapshot = keyword_snapshot
+        self.keyword_snapshot_only = keyword_snapshot_only
+        self.extension_versions = extension_versions
+        self.version_snapshot_only = version_snapshot_only
+        self.transport = transport
+        self.base_ref = base_ref
+        self.remote_spec_cache = remote_spec_cache
+        self.releases = releases
+
+
+# Settings of specs which aren't validated by validate(), e.g. a KomandPluginSpec handed straight to a validator
+DEFAULT_NETWORK = NetworkSettings()
+
+
+def network_of(spec) -> NetworkSettings:
+    """
+    Returns the network settings of the run a spec is being validated in
+    """
+    return getattr(spec, "network", None) or DEFAULT_NETWORK
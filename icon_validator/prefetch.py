@@ -0,0 +1,100 @@
+import os
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+from icon_validator.cancellation import CancellationToken, cancellation_of, current
+from icon_validator.exceptions import ValidationCancelled
+
+
+def fetches(validator) -> bool:
+    """
+    Whether a validator has a fetch step which can run ahead of its turn, see KomandPluginValidator.fetch
+    """
+    # Imported here, the rules package imports every validator, which import this module
+    from icon_validator.rules.validator import KomandPluginValidator
+    return getattr(type(validator), "fetch", None) not in (None, KomandPluginValidator.fetch)
+
+
+class Prefetcher:
+    """
+    Runs the fetch step of validators waiting on the network or git in background threads as soon as a run
+    starts, so the waiting overlaps with the local validators running meanwhile. Each validator picks up what
+    was fetched for it when its turn comes; fetches nobody picked up are cancelled when the run ends.
+    """
+
+    def __init__(self):
+        # Stops the fetches, independently of the run's token which only exists once the runner starts
+        self.token = CancellationToken()
+        self._futures = {}
+        self._executor = None
+        self._pid = os.getpid()
+
+    def __getstate__(self):
+        # Worker processes can't wait on the threads of this one, they fetch for themselves
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__()
+
+    def _fetch(self, validator, spec):
+        with current(self.token):
+            return validator.fetch(spec)
+
+    def start(self, validators: list, spec):
+        """
+        Starts fetching for every validator with a fetch step
+        :param validators: Validators of the run
+        :param spec: Spec of the plugin or workflow being validated
+        """
+        to_fetch = [validator for validator in validators if fetches(validator)]
+        if not to_fetch:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=len(to_fetch), thread_name_prefix="prefetch")
+        for validator in to_fetch:
+            self._futures[id(validator)] = self._executor.submit(self._fetch, validator, spec)
+
+    def result(self, validator, spec):
+        """
+        Returns what the validator's fetch step returned, waiting for it to finish if it is still running,
+        or runs the step now if it wasn't started
+        :raises Whatever the fetch step raised
+        :raises ValidationCancelled if the validator is cancelled while waiting
+        """
+        future = self._futures.get(id(validator))
+        # A process forked meanwhile, e.g. to isolate the validator, only has the fetches finished before
+        if future is None or (os.getpid() != self._pid and not future.done()):
+            return validator.fetch(spec)
+
+        token = cancellation_of(spec)
+        done = threading.Event()
+        future.add_done_callback(lambda _: done.set())
+        with token.on_cancel(done.set):
+            done.wait()
+        token.raise_if_cancelled()
+        try:
+            return future.result()
+        except (ValidationCancelled, CancelledError):
+            # The fetch was stopped while this validator goes on, fetch again
+            return validator.fetch(spec)
+
+    def cancel(self):
+        """
+        Stops the fetches still running, without waiting for them
+        """
+        self.token.cancel()
+        # Fetches not started yet are dropped one by one, shutdown(cancel_futures=True) needs Python 3.9
+        for future in self._futures.values():
+            future.cancel()
+        if self._executor:
+            self._executor.shutdown(wait=False)
+
+
+# Prefetcher of specs which aren't validated by validate(), where every validator fetches on its own turn
+NO_PREFETCH = Prefetcher()
+
+
+def prefetcher_of(spec) -> Prefetcher:
+    """
+    Returns the Prefetcher of the run a spec is being validated in
+    """
+    return getattr(spec, "prefetcher", None) or NO_PREFETCH
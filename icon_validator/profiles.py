@@ -0,0 +1,69 @@
+from icon_validator.rules.validator import COST_CLASSES, DOCKER, FILESYSTEM_SCAN, GIT, NETWORK, PURE_SPEC
+
+# Cost classes of the validators each --profile runs
+PROFILES = {
+    # Only the spec and help.md are read, quick enough for every commit
+    "fast": (PURE_SPEC,),
+    # Anything which works without a network connection
+    "offline": (PURE_SPEC, FILESYSTEM_SCAN, GIT),
+    "full": COST_CLASSES,
+}
+
+# Milliseconds a validator of each cost class is expected to take when the run history doesn't know it yet
+ESTIMATED_TIME = {
+    PURE_SPEC: 1.0,
+    FILESYSTEM_SCAN: 20.0,
+    GIT: 1000.0,
+    NETWORK: 2000.0,
+    DOCKER: 120000.0,
+}
+
+
+class ValidatorSelection:
+    """
+    Picks the validators of a run by cost: those of the cost classes in a profile and, given a time budget,
+    the cheapest of them which fit in it
+    """
+
+    def __init__(self, profile: str = "full", budget_ms: float = None):
+        """
+        :param profile: Name of the profile in PROFILES
+        :param budget_ms: Milliseconds the selected validators are expected to take at most, None for no limit
+        """
+        self.profile = profile
+        self.budget_ms = budget_ms
+
+    def describe(self) -> str:
+        if self.budget_ms is None:
+            return f"the {self.profile} profile"
+        return f"the {self.profile} profile or the {self.budget_ms:g}ms budget"
+
+    @staticmethod
+    def estimated_time(validator, history=None) -> float:
+        """
+        Returns the milliseconds a validator is expected to take, from the run history when it knows
+        the validator, otherwise from its cost class
+        """
+        default = ESTIMATED_TIME.get(validator.cost_class, ESTIMATED_TIME[FILESYSTEM_SCAN])
+        if history:
+            return history.expected_time(validator, default=default)
+        return default
+
+    def select(self, validators: list, history=None) -> (list, list):
+        """
+        :param validators: Validators in execution order
+        :param history: RunHistory to estimate the time of each validator from
+        :return: Tuple of the selected validators, still in execution order, and those left out
+        """
+        classes = PROFILES[self.profile]
+        selected = [v for v in validators if v.cost_class in classes]
+        if self.budget_ms is not None:
+            fitting, total = set(), 0.0
+            for validator in sorted(selected, key=lambda v: self.estimated_time(v, history)):
+                total += self.estimated_time(validator, history)
+                if total > self.budget_ms:
+                    break
+                fitting.add(id(validator))
+            selected = [v for v in selected if id(v) in fitting]
+        chosen = {id(v) for v in selected}
+        return selected, [v for v in validators if id(v) not in chosen]
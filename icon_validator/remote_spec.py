@@ -0,0 +1,179 @@
+import json
+import os
+import tempfile
+from functools import lru_cache
+
+import yaml
+
+from icon_validator.cancellation import CancellationToken, NEVER_CANCELLED
+from icon_validator.exceptions import ValidationException
+from icon_validator.repository import NULL_SHA, open_repo, resolve_ref
+
+# Branch plugins are merged into, whose spec of a plugin its local changes are compared against
+DEFAULT_BASE_REF = "origin/master"
+
+DEFAULT_REMOTE_SPEC_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "icon-validator", "remote-specs")
+
+PLUGIN_DIRNAME = "plugins"
+PLUGIN_SPEC = "plugin.spec.yaml"
+
+
+class RemoteSpecCache:
+    """
+    Parsed specs of plugins at commits of the base ref, or by the SHA of their blob for released specs. Neither
+    ever changes, so entries never expire and runs against the same base commit need neither git nor YAML.
+    """
+
+    def __init__(self, directory: str = None):
+        """
+        :param directory: Where specs are stored, defaults to $ICON_VALIDATOR_REMOTE_SPEC_DIR or
+        ~/.cache/icon-validator/remote-specs
+        """
+        self.directory = directory or os.environ.get("ICON_VALIDATOR_REMOTE_SPEC_DIR") or DEFAULT_REMOTE_SPEC_DIRECTORY
+
+    def _path(self, commit: str, plugin_name: str) -> str:
+        return os.path.join(self.directory, commit[:2], f"{commit}-{plugin_name}.json")
+
+    def lookup(self, commit: str, plugin_name: str) -> dict:
+        """
+        :return: The spec of the plugin at the commit, None if it isn't stored
+        """
+        try:
+            with open(self._path(commit, plugin_name)) as f:
+                spec = json.load(f)
+            return spec if isinstance(spec, dict) else None
+        except (OSError, ValueError):
+            return None
+
+    def store(self, commit: str, plugin_name: str, spec: dict):
+        """
+        Stores the spec of a plugin at a commit, unless JSON can't hold it as it is, e.g. with dates in it
+        """
+        try:
+            text = json.dumps(spec)
+            if json.loads(text) != spec:
+                return
+        except (TypeError, ValueError):
+            return
+        path = self._path(commit, plugin_name)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Written to a temporary file first so concurrent runs never read half an entry
+            with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(path), delete=False) as f:
+                f.write(text)
+            os.replace(f.name, path)
+        except OSError:
+            # A read-only or full disk just means reading the spec from git next time
+            pass
+
+
+def read_remote_spec(repo: "Repo", commit: str, plugin_name: str) -> bytes:
+    """
+    Reads the spec of a plugin at a commit straight from the object database
+    :raises ValidationException if the plugin has no spec at the commit
+    """
+    try:
+        blob = repo.commit(commit).tree / PLUGIN_DIRNAME / plugin_name / PLUGIN_SPEC
+    except KeyError:
+        raise ValidationException(f"{PLUGIN_SPEC} not found in remote repo")
+    return blob.data_stream.read()
+
+
+def _open_base(directory: str, base_ref: str, token: CancellationToken) -> ("Repo", str):
+    # GitPython is slow to import, and only needed when looking at git history
+    from git.exc import BadName, InvalidGitRepositoryError, NoSuchPathError
+    try:
+        repo = open_repo(directory)
+    except (InvalidGitRepositoryError, NoSuchPathError):
+        raise ValidationException("Incorrect directory passed- must be an individual plugin directory")
+
+    token.raise_if_cancelled()
+    try:
+        return repo, resolve_ref(repo, base_ref)
+    except (BadName, ValueError):
+        raise ValidationException(f"Remote {base_ref} not found. Pass the branch plugins are merged into "
+                                  f"with --base-ref")
+
+
+def load_remote_spec(directory: str, plugin_name: str, base_ref: str = DEFAULT_BASE_REF,
+                     cache: RemoteSpecCache = None, token: CancellationToken = NEVER_CANCELLED) -> dict:
+    """
+    Returns the spec of a plugin on the base ref
+    :param directory: Root of the repository holding the plugins directory
+    :param plugin_name: Name of the plugin
+    :param base_ref: Branch, tag or commit to take the spec from
+    :param cache: RemoteSpecCache to take the spec from and store it in
+    :param token: CancellationToken checked before git is asked for anything
+    :raises ValidationException if the directory isn't in a git repository, or the ref or spec doesn't exist
+    """
+    repo, commit = _open_base(directory, base_ref, token)
+    spec = cache.lookup(commit, plugin_name) if cache else None
+    if spec is None:
+        token.raise_if_cancelled()
+        spec = yaml.safe_load(read_remote_spec(repo, commit, plugin_name))
+        if cache:
+            cache.store(commit, plugin_name, spec)
+    return spec
+
+
+def spec_blobs(repo: "Repo", commit: str, plugin_name: str) -> [(str, str)]:
+    """
+    Lists the commits which changed the spec of a plugin on the first parent history of a commit, i.e. what
+    was merged into the branch rather than the commits of each merged branch, in one `git log`
+    :return: (commit SHA, SHA of the spec's blob after the commit) pairs, newest first. Commits removing the spec
+    are left out
+    """
+    output = repo.git.log("--first-parent", "-m", "--raw", "--no-abbrev", "--format=%H", commit, "--",
+                          f"{PLUGIN_DIRNAME}/{plugin_name}/{PLUGIN_SPEC}")
+    blobs = []
+    current = None
+    for line in output.splitlines():
+        if line.startswith(":"):
+            # :<old mode> <new mode> <old blob> <new blob> <status>\t<path>
+            blob = line.split()[3]
+            if current and blob != NULL_SHA:
+                blobs.append((current, blob))
+            current = None
+        elif line:
+            current = line.strip()
+    return blobs
+
+
+@lru_cache(maxsize=None)
+def _parse_spec_blob(repo: "Repo", blob: str) -> dict:
+    # Blobs never change, and a spec reverted to an earlier state is the same blob again
+    _, _, _, data = repo.git.get_object_data(blob)
+    spec = yaml.safe_load(data)
+    return spec if isinstance(spec, dict) else {}
+
+
+def load_released_specs(directory: str, plugin_name: str, base_ref: str = DEFAULT_BASE_REF, last: int = None,
+                        cache: RemoteSpecCache = None, token: CancellationToken = NEVER_CANCELLED) -> [dict]:
+    """
+    Returns the spec of every version of a plugin released on the base ref, as it was when last changed
+    before the next version
+    :param directory: Root of the repository holding the plugins directory
+    :param plugin_name: Name of the plugin
+    :param base_ref: Branch, tag or commit whose history holds the releases
+    :param last: Only return the newest releases, up to this many. None or 0 for all of them
+    :param cache: RemoteSpecCache to take the parsed specs from and store them in, by the SHA of their blob
+    :param token: CancellationToken checked as the specs are read
+    :return: Specs, newest version first
+    :raises ValidationException if the directory isn't in a git repository or the ref doesn't exist
+    """
+    repo, commit = _open_base(directory, base_ref, token)
+    released = {}
+    for _, blob in spec_blobs(repo, commit, plugin_name):
+        if last and len(released) >= last:
+            break
+        token.raise_if_cancelled()
+        spec = cache.lookup(blob, plugin_name) if cache else None
+        if spec is None:
+            spec = _parse_spec_blob(repo, blob)
+            if cache:
+                cache.store(blob, plugin_name, spec)
+        version = spec.get("version")
+        # The newest commit with a version holds the spec that version was released with
+        if version is not None and version not in released:
+            released[version] = spec
+    return list(released.values())
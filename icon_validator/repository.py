@@ -0,0 +1,133 @@
+import os
+from functools import lru_cache
+
+# A directory holding one of these is a plugin or workflow
+SPEC_FILE_NAMES = ("plugin.spec.yaml", "workflow.spec.yaml")
+
+# Object name git uses for "no commit", e.g. the remote side of a newly pushed branch
+NULL_SHA = "0" * 40
+
+
+@lru_cache(maxsize=None)
+def open_repo(directory: str, search_parent_directories: bool = False) -> "Repo":
+    """
+    Opens the git repository at a directory, once per process
+    :param directory: Directory of the repository, or one below it when searching parent directories
+    :param search_parent_directories: Look for the repository in the parents of directory too
+    :raises InvalidGitRepositoryError if no git repository is found
+    """
+    # GitPython is slow to import, and only needed when looking at git history
+    from git import Repo
+    return Repo(directory, search_parent_directories=search_parent_directories)
+
+
+def _ref_files_stamp(git_directory: str, ref: str) -> tuple:
+    # Files git keeps a ref name in, whose modification times change whenever the ref moves
+    candidates = [ref, f"refs/{ref}", f"refs/tags/{ref}", f"refs/heads/{ref}", f"refs/remotes/{ref}", "packed-refs"]
+    stamp = []
+    for candidate in candidates:
+        try:
+            stamp.append(os.stat(os.path.join(git_directory, candidate)).st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+@lru_cache(maxsize=None)
+def _resolve_ref(repo: "Repo", ref: str, stamp: tuple) -> str:
+    return repo.commit(ref).hexsha
+
+
+def resolve_ref(repo: "Repo", ref: str) -> str:
+    """
+    Resolves a branch, tag or commit to the SHA of its commit, once per process for ref names until the ref moves
+    :param repo: Repository the ref is in
+    :param ref: Ref, e.g. origin/master
+    :raises ValueError or git.exc.BadName if the ref doesn't exist
+    """
+    if any(c in ref for c in "~^:@{") or ref.endswith("HEAD"):
+        # Expressions, e.g. master~1, and symbolic refs like HEAD move without their own files changing
+        return repo.commit(ref).hexsha
+    return _resolve_ref(repo, ref, _ref_files_stamp(repo.common_dir, ref))
+
+
+def changed_paths_since(repo: "Repo", ref: str) -> [str]:
+    """
+    Lists the files which differ between the working tree and a ref, including untracked files
+    :param repo: Repository to diff
+    :param ref: Branch, tag or commit to compare against, e.g. origin/master
+    :return: Paths relative to the root of the repository
+    """
+    changed = repo.git.diff("--name-only", ref).splitlines()
+    return list(dict.fromkeys(changed + repo.untracked_files))
+
+
+def pushed_paths(repo: "Repo", push_lines: [str]) -> [str]:
+    """
+    Lists the files touched by the commits being pushed
+    :param repo: Repository being pushed from
+    :param push_lines: Lines git passes to a pre-push hook on stdin: <local ref> <local sha> <remote ref> <remote sha>
+    :return: Paths relative to the root of the repository
+    """
+    changed = []
+    for line in push_lines:
+        fields = line.split()
+        if len(fields) != 4:
+            continue
+        _, local_sha, _, remote_sha = fields
+        if local_sha == NULL_SHA:
+            # Deleting a remote branch, nothing to validate
+            continue
+        if remote_sha == NULL_SHA:
+            # New branch: everything not already on a remote
+            output = repo.git.log("--name-only", "--format=", local_sha, "--not", "--remotes")
+        else:
+            output = repo.git.diff("--name-only", f"{remote_sha}..{local_sha}")
+        changed.extend(path for path in output.splitlines() if path)
+    return list(dict.fromkeys(changed))
+
+
+def directories_for_paths(root: str, paths: [str]) -> [str]:
+    """
+    Maps changed files to the plugin or workflow directories containing them.
+    Files outside any plugin or workflow, and directories which no longer exist, are skipped.
+    :param root: Root of the repository the paths are relative to
+    :param paths: Changed file paths
+    :return: Plugin and workflow directories, in the order first seen
+    """
+    directories = []
+    for path in paths:
+        directory = os.path.dirname(os.path.join(root, path))
+        while os.path.abspath(directory).startswith(os.path.abspath(root)):
+            if any(os.path.isfile(os.path.join(directory, name)) for name in SPEC_FILE_NAMES):
+                directories.append(os.path.normpath(directory))
+                break
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+    return list(dict.fromkeys(directories))
+
+
+def changed_directories(path: str, ref: str = None, push_lines: [str] = None) -> [str]:
+    """
+    Finds the plugin and workflow directories below path with changes, either since a ref
+    or in the commits being pushed
+    :param path: Directory inside the repository, only changes below it are considered
+    :param ref: Branch, tag or commit to compare the working tree against
+    :param push_lines: Lines git passes to a pre-push hook on stdin, used when ref is not given
+    :return: Directories to validate, relative to the current directory when path was relative
+    """
+    repo = open_repo(os.path.abspath(path), search_parent_directories=True)
+    root = repo.working_tree_dir
+    if ref is not None:
+        paths = changed_paths_since(repo, ref)
+    else:
+        paths = pushed_paths(repo, push_lines or [])
+
+    scope = os.path.realpath(path)
+    directories = []
+    for directory in directories_for_paths(os.path.realpath(root), paths):
+        if directory == scope or directory.startswith(scope + os.sep):
+            directories.append(directory if os.path.isabs(path) else os.path.relpath(directory))
+    return directories
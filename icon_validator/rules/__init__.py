@@ -1,144 +1,127 @@
 """
-The rules package provides the array VALIDATORS which contains all the validators for
-validating InsightConnect plugins and workflows.
+The rules package provides the lists VALIDATORS, JENKINS_VALIDATORS and WORKFLOW_VALIDATORS which contain
+all the validators for validating InsightConnect plugins and workflows.
+
+Validator modules pull in heavy libraries (requests, GitPython, jsonschema, urlextract...), so they are
+only imported when one of the lists, or a validator class, is first used. This keeps commands which never
+run a validator, like icon-validate --version, fast to start.
 """
 
-# Plugin validators
-from icon_validator.rules.plugin_validators.acronym_validator import *
-from icon_validator.rules.plugin_validators.changelog_validator import *
-from icon_validator.rules.plugin_validators.confidential_validator import *
-from icon_validator.rules.plugin_validators.cloud_ready_connection_credential_token_validator import *
-from icon_validator.rules.plugin_validators.credentials_validator import *
-from icon_validator.rules.plugin_validators.default_value_validator import *
-from icon_validator.rules.plugin_validators.description_validator import *
-from icon_validator.rules.plugin_validators.docker_validator import *
-from icon_validator.rules.plugin_validators.dockerfile_parent_validator import *
-from icon_validator.rules.plugin_validators.encoding_validator import *
-from icon_validator.rules.plugin_validators.exception_validator import *
-from icon_validator.rules.plugin_validators.files_validator import *
-from icon_validator.rules.plugin_validators.help_input_output_validator import *
-from icon_validator.rules.plugin_validators.help_validator import *
-from icon_validator.rules.plugin_validators.icon_validator import *
-from icon_validator.rules.plugin_validators.json_validator import *
-from icon_validator.rules.plugin_validators.output_validator import *
-from icon_validator.rules.plugin_validators.password_validator import *
-from icon_validator.rules.plugin_validators.print_validator import *
-from icon_validator.rules.plugin_validators.profanity_validator import *
-from icon_validator.rules.plugin_validators.regeneration_validator import *
-from icon_validator.rules.plugin_validators.required_keys_validator import *
-from icon_validator.rules.plugin_validators.required_validator import *
-from icon_validator.rules.plugin_validators.spec_properties_validator import *
-from icon_validator.rules.plugin_validators.spec_version_validator import *
-from icon_validator.rules.plugin_validators.tag_validator import *
-from icon_validator.rules.plugin_validators.title_validator import *
-from icon_validator.rules.plugin_validators.url_validator import *
-from icon_validator.rules.plugin_validators.use_case_validator import *
-from icon_validator.rules.plugin_validators.vendor_validator import *
-from icon_validator.rules.plugin_validators.version_validator import *
-from icon_validator.rules.plugin_validators.version_pin_validator import *
-from icon_validator.rules.plugin_validators.support_validator import *
-from icon_validator.rules.plugin_validators.runtime_validator import *
-from icon_validator.rules.plugin_validators.version_pin_validator import *
-from icon_validator.rules.plugin_validators.example_input_validator import *
-from icon_validator.rules.plugin_validators.cloud_ready_validator import *
-from icon_validator.rules.plugin_validators.supported_version_validator import *
-from icon_validator.rules.plugin_validators.unapproved_keywords_validator import *
-from icon_validator.rules.plugin_validators.help_example_validator import *
-
-# Remote Validators (needs working knowledge of git repo)
-from icon_validator.rules.plugin_validators.version_bump_validator import *
-
-# Workflow validators
-from icon_validator.rules.workflow_validators.workflow_directory_name_match_validator import *
-from icon_validator.rules.workflow_validators.workflow_help_validator import *
-from icon_validator.rules.workflow_validators.workflow_files_validator import *
-from icon_validator.rules.workflow_validators.workflow_extension_validator import *
-from icon_validator.rules.workflow_validators.workflow_change_log_validator import *
-from icon_validator.rules.workflow_validators.workflow_python_script_use_validator import \
-    WorkflowPythonScriptUseValidator
-from icon_validator.rules.workflow_validators.workflow_vendor_validator import *
-from icon_validator.rules.workflow_validators.workflow_version_validator import *
-from icon_validator.rules.workflow_validators.workflow_support_validator import *
-from icon_validator.rules.workflow_validators.workflow_profanity_validator import *
-from icon_validator.rules.workflow_validators.workflow_png_hash_validator import *
-from icon_validator.rules.workflow_validators.workflow_icon_filename_validator import *
-from icon_validator.rules.workflow_validators.workflow_screenshot_validator import *
-from icon_validator.rules.workflow_validators.workflow_title_validator import *
-from icon_validator.rules.workflow_validators.workflow_description_validator import *
-from icon_validator.rules.workflow_validators.workflow_name_validator import *
-from icon_validator.rules.workflow_validators.workflow_icon_validator import *
-from icon_validator.rules.workflow_validators.workflow_help_plugin_utilization_validator import *
-from icon_validator.rules.workflow_validators.workflow_encoding_validator import *
-from icon_validator.rules.workflow_validators.workflow_parameters_keyword_validator import *
-
-# The order of this list is the execution order of the validators.
-VALIDATORS = [
-    HelpValidator(),
-    ChangelogValidator(),
-    CloudReadyConnectionCredentialTokenValidator(),
-    RequiredKeysValidator(),
-    UseCaseValidator(),
-    SpecPropertiesValidator(),
-    SpecVersionValidator(),
-    FilesValidator(),
-    TagValidator(),
-    DescriptionValidator(),
-    TitleValidator(),
-    VendorValidator(),
-    DefaultValueValidator(),
-    IconValidator(),
-    RequiredValidator(),
-    VersionValidator(),
-    DockerfileParentValidator(),
-    ProfanityValidator(),
-    AcronymValidator(),
-    JSONValidator(),
-    OutputValidator(),
-    RegenerationValidator(),
-    HelpInputOutputValidator(),
-    SupportValidator(),
-    RuntimeValidator(),
-    VersionPinValidator(),
-    EncodingValidator(),
-    ExampleInputValidator(),
-    CloudReadyValidator(),
-    SupportedVersionValidator(),
-    UnapprovedKeywordsValidator(),
-    HelpExampleValidator(),
-    VersionBumpValidator()
+import importlib
+
+# (class name, module relative to this package) of each validator.
+# The order of these lists is the execution order of the validators.
+_VALIDATORS = [
+    ("HelpValidator", "plugin_validators.help_validator"),
+    ("ChangelogValidator", "plugin_validators.changelog_validator"),
+    ("CloudReadyConnectionCredentialTokenValidator", "plugin_validators.cloud_ready_connection_credential_token_validator"),
+    ("RequiredKeysValidator", "plugin_validators.required_keys_validator"),
+    ("UseCaseValidator", "plugin_validators.use_case_validator"),
+    ("SpecPropertiesValidator", "plugin_validators.spec_properties_validator"),
+    ("SpecVersionValidator", "plugin_validators.spec_version_validator"),
+    ("FilesValidator", "plugin_validators.files_validator"),
+    ("TagValidator", "plugin_validators.tag_validator"),
+    ("DescriptionValidator", "plugin_validators.description_validator"),
+    ("TitleValidator", "plugin_validators.title_validator"),
+    ("VendorValidator", "plugin_validators.vendor_validator"),
+    ("DefaultValueValidator", "plugin_validators.default_value_validator"),
+    ("IconValidator", "plugin_validators.icon_validator"),
+    ("RequiredValidator", "plugin_validators.required_validator"),
+    ("VersionValidator", "plugin_validators.version_validator"),
+    ("DockerfileParentValidator", "plugin_validators.dockerfile_parent_validator"),
+    ("ProfanityValidator", "plugin_validators.profanity_validator"),
+    ("AcronymValidator", "plugin_validators.acronym_validator"),
+    ("JSONValidator", "plugin_validators.json_validator"),
+    ("OutputValidator", "plugin_validators.output_validator"),
+    ("RegenerationValidator", "plugin_validators.regeneration_validator"),
+    ("HelpInputOutputValidator", "plugin_validators.help_input_output_validator"),
+    ("SupportValidator", "plugin_validators.support_validator"),
+    ("RuntimeValidator", "plugin_validators.runtime_validator"),
+    ("VersionPinValidator", "plugin_validators.version_pin_validator"),
+    ("EncodingValidator", "plugin_validators.encoding_validator"),
+    ("ExampleInputValidator", "plugin_validators.example_input_validator"),
+    ("CloudReadyValidator", "plugin_validators.cloud_ready_validator"),
+    ("SupportedVersionValidator", "plugin_validators.supported_version_validator"),
+    ("UnapprovedKeywordsValidator", "plugin_validators.unapproved_keywords_validator"),
+    ("HelpExampleValidator", "plugin_validators.help_example_validator"),
+    ("VersionBumpValidator", "plugin_validators.version_bump_validator"),
 ]
 
-JENKINS_VALIDATORS = [
-    ExceptionValidator(),
-    CredentialsValidator(),
-    PasswordValidator(),
-    PrintValidator(),
-    ConfidentialValidator(),
-    DockerValidator(),
-    URLValidator(),
+_JENKINS_VALIDATORS = [
+    ("ExceptionValidator", "plugin_validators.exception_validator"),
+    ("CredentialsValidator", "plugin_validators.credentials_validator"),
+    ("PasswordValidator", "plugin_validators.password_validator"),
+    ("PrintValidator", "plugin_validators.print_validator"),
+    ("ConfidentialValidator", "plugin_validators.confidential_validator"),
+    ("DockerValidator", "plugin_validators.docker_validator"),
+    ("URLValidator", "plugin_validators.url_validator"),
 ]
 
-WORKFLOW_VALIDATORS = [
-    WorkflowDirectoryNameMatchValidator(),
-    WorkflowFilesValidator(),
-    WorkflowHelpValidator(),
-    WorkflowChangelogValidator(),
-    WorkflowVendorValidator(),
-    WorkflowVersionValidator(),
-    WorkflowExtensionValidator(),
-    WorkflowSupportValidator(),
-    WorkflowPNGHashValidator(),
-    WorkflowICONFileNameValidator(),
-    WorkflowScreenshotValidator(),
-    WorkflowTitleValidator(),
-    WorkflowDescriptionValidator(),
-    WorkflowNameValidator(),
-    WorkflowProfanityValidator(),
-    WorkflowHelpPluginUtilizationValidator(),
-    WorkflowICONFileValidator(),
-    WorkflowEncodingValidator(),
-    WorkflowParametersKeywordValidator(),
-    UseCaseValidator(),
-    UnapprovedKeywordsValidator(),
-    WorkflowPythonScriptUseValidator(),
+_WORKFLOW_VALIDATORS = [
+    ("WorkflowDirectoryNameMatchValidator", "workflow_validators.workflow_directory_name_match_validator"),
+    ("WorkflowFilesValidator", "workflow_validators.workflow_files_validator"),
+    ("WorkflowHelpValidator", "workflow_validators.workflow_help_validator"),
+    ("WorkflowChangelogValidator", "workflow_validators.workflow_change_log_validator"),
+    ("WorkflowVendorValidator", "workflow_validators.workflow_vendor_validator"),
+    ("WorkflowVersionValidator", "workflow_validators.workflow_version_validator"),
+    ("WorkflowExtensionValidator", "workflow_validators.workflow_extension_validator"),
+    ("WorkflowSupportValidator", "workflow_validators.workflow_support_validator"),
+    ("WorkflowPNGHashValidator", "workflow_validators.workflow_png_hash_validator"),
+    ("WorkflowICONFileNameValidator", "workflow_validators.workflow_icon_filename_validator"),
+    ("WorkflowScreenshotValidator", "workflow_validators.workflow_screenshot_validator"),
+    ("WorkflowTitleValidator", "workflow_validators.workflow_title_validator"),
+    ("WorkflowDescriptionValidator", "workflow_validators.workflow_description_validator"),
+    ("WorkflowNameValidator", "workflow_validators.workflow_name_validator"),
+    ("WorkflowProfanityValidator", "workflow_validators.workflow_profanity_validator"),
+    ("WorkflowHelpPluginUtilizationValidator", "workflow_validators.workflow_help_plugin_utilization_validator"),
+    ("WorkflowICONFileValidator", "workflow_validators.workflow_icon_validator"),
+    ("WorkflowEncodingValidator", "workflow_validators.workflow_encoding_validator"),
+    ("WorkflowParametersKeywordValidator", "workflow_validators.workflow_parameters_keyword_validator"),
+    ("UseCaseValidator", "plugin_validators.use_case_validator"),
+    ("UnapprovedKeywordsValidator", "plugin_validators.unapproved_keywords_validator"),
+    ("WorkflowPythonScriptUseValidator", "workflow_validators.workflow_python_script_use_validator"),
 ]
+
+_LISTS = {
+    "VALIDATORS": _VALIDATORS,
+    "JENKINS_VALIDATORS": _JENKINS_VALIDATORS,
+    "WORKFLOW_VALIDATORS": _WORKFLOW_VALIDATORS,
+}
+
+# Module of each validator class, by class name
+REGISTRY = {name: module for entries in _LISTS.values() for name, module in entries}
+
+__all__ = list(_LISTS) + sorted(REGISTRY)
+
+
+def validator_class(name: str) -> type:
+    """
+    Imports and returns a validator class
+    :param name: Name of the class, e.g. HelpValidator
+    :raises KeyError if there is no such validator
+    """
+    return getattr(importlib.import_module(f"{__name__}.{REGISTRY[name]}"), name)
+
+
+def new_validators(name: str) -> list:
+    """
+    Returns new instances of the validators of one of the lists, for runs which mustn't share the state
+    validators keep between calls with other runs in the same process
+    :param name: Name of the list, e.g. VALIDATORS
+    """
+    return [validator_class(class_name)() for class_name, _ in _LISTS[name]]
+
+
+def __getattr__(name: str):
+    if name in _LISTS:
+        validators = new_validators(name)
+        # Later lookups find the list without coming back here
+        globals()[name] = validators
+        return validators
+    if name in REGISTRY:
+        return validator_class(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
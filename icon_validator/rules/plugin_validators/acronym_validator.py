@@ -1,10 +1,13 @@
 import re
 
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 from icon_validator.exceptions import ValidationException
 
 
 class AcronymValidator(KomandPluginValidator):
+    inputs = (SPEC, "help.md")
+    cost_class = PURE_SPEC
+
     acronyms = [
         "ACL", "API", "AMI", "ANC", "ANS", "ARN", "ASCII", "ASN", "AV", "AWS",
         "BCC", "BGP", "BIOS",
@@ -1,12 +1,14 @@
 import re
-from distutils.version import LooseVersion
 
 from icon_validator.styling import *
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.versions import loose_version_key
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 from icon_validator.exceptions import ValidationException
 
 
 class ChangelogValidator(KomandPluginValidator):
+    inputs = (SPEC, "help.md")
+    cost_class = PURE_SPEC
 
     @staticmethod
     def get_versions(help_content):
@@ -40,7 +42,7 @@ class ChangelogValidator(KomandPluginValidator):
             version_number = version.split(" - ")[0]
             versions.append(version_number)
 
-        sorted_versions = sorted(versions, key=LooseVersion, reverse=True)
+        sorted_versions = sorted(versions, key=loose_version_key, reverse=True)
 
         if versions != sorted_versions:
             raise ValidationException("Version numbers in help.md are not sorted in descending order.")
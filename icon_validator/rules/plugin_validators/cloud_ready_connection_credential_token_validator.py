@@ -1,8 +1,11 @@
 from icon_validator.exceptions import ValidationException
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 
 
 class CloudReadyConnectionCredentialTokenValidator(KomandPluginValidator):
+    inputs = (SPEC,)
+    cost_class = PURE_SPEC
+
     def validate(self, plugin_spec):
         cloud_ready = plugin_spec.spec_dictionary().get("cloud_ready")
         connection = plugin_spec.spec_dictionary().get("connection")
@@ -1,11 +1,12 @@
 from icon_validator.exceptions import ValidationException
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 
 import re
 import os
 
 
 class CloudReadyValidator(KomandPluginValidator):
+    cost_class = FILESYSTEM_SCAN
 
     @staticmethod
     def validate_enable_cache_in_plugin_spec(plugin_spec: dict):
@@ -55,32 +56,29 @@ class CloudReadyValidator(KomandPluginValidator):
         return False
 
     @staticmethod
-    def validate_system_level_command_in_plugin(directory_path: str):
-        for root, dirs, filenames in os.walk(directory_path):
-            for filename in filenames:
-                if not filename.endswith(".py"):
-                    continue
-
-                relative_directory_name = root.replace(directory_path, "")
-                try:
-                    with open(os.path.join(root, filename), "r") as file_content:
-                        if CloudReadyValidator.check_command_execution_exists(file_content.read()):
-                            raise ValidationException(
-                                f"In file {os.path.join(relative_directory_name, filename)} "
-                                "system level command line utilities was found. "
-                                "A Cloud Ready plugin cannot have any calls to system-level command-line utilities. "
-                                "Please check this file and try again."
-                            )
-                except FileNotFoundError:
+    def validate_system_level_command_in_plugin(spec):
+        for path in spec.files(".py"):
+            # Files below the top level are reported relative to the plugin directory, e.g. /icon_x/util/api.py
+            display_path = os.sep + path if os.path.dirname(path) else path
+            try:
+                if CloudReadyValidator.check_command_execution_exists(spec.read_text(path)):
                     raise ValidationException(
-                        f"{os.path.join(relative_directory_name, filename)} file could not be opened. "
-                        "Check this file and be sure to include this file in your plugin directory."
+                        f"In file {display_path} "
+                        "system level command line utilities was found. "
+                        "A Cloud Ready plugin cannot have any calls to system-level command-line utilities. "
+                        "Please check this file and try again.",
+                        file=path
                     )
+            except FileNotFoundError:
+                raise ValidationException(
+                    f"{display_path} file could not be opened. "
+                    "Check this file and be sure to include this file in your plugin directory.",
+                    file=path
+                )
 
     def validate(self, spec):
         try:
-            with open(f"{spec.directory}/Dockerfile", "r") as docker_file:
-                dockerfile: str = docker_file.read()
+            dockerfile: str = spec.dockerfile_text()
         except FileNotFoundError:
             raise ValidationException(
                 "Dockerfile not found. Please be sure to include this file in your plugin directory."
@@ -88,7 +86,7 @@ class CloudReadyValidator(KomandPluginValidator):
 
         plugin_spec = spec.spec_dictionary()
         if plugin_spec.get("cloud_ready", False):
-            CloudReadyValidator.validate_system_level_command_in_plugin(spec.directory)
+            CloudReadyValidator.validate_system_level_command_in_plugin(spec)
             CloudReadyValidator.validate_enable_cache_in_plugin_spec(plugin_spec)
             CloudReadyValidator.validate_python_version_in_dockerfile(dockerfile)
             CloudReadyValidator.validate_user_set_to_nobody_in_dockerfile(dockerfile)
@@ -3,11 +3,13 @@ import re
 
 from icon_plugin_spec.plugin_spec import KomandPluginSpec
 
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
 
 
 class ConfidentialValidator(KomandPluginValidator):
+    cost_class = FILESYSTEM_SCAN
+
     # emails allowed
     emails = ["user@example.com"]
 
@@ -16,9 +18,8 @@ class ConfidentialValidator(KomandPluginValidator):
 
     # Search help file
     @staticmethod
-    def validate_help(plugin_path: str):
-        with open(f"{plugin_path}/help.md") as h:
-            help_lines: [str] = h.readlines()
+    def validate_help(spec: KomandPluginSpec):
+        help_lines: [str] = spec.raw_help().splitlines(keepends=True)
 
         ConfidentialValidator.validate_emails(help_lines, "help.md")
 
@@ -48,20 +49,17 @@ class ConfidentialValidator(KomandPluginValidator):
 
     # Search tests
     @staticmethod
-    def validate_tests(plugin_path: str):
-        for path, _, files in os.walk(f"{plugin_path}/tests"):
-            for file in files:
-                if file.endswith(".json"):
-                    with open(f"{path}/{file}") as f:
-                        contents = f.readlines()
-                    path_to_file = f"{os.path.relpath(path, plugin_path)}/{file}"
-                    ConfidentialValidator.validate_emails(contents, path_to_file)
+    def validate_tests(spec: KomandPluginSpec):
+        for path_to_file in spec.files(".json"):
+            if path_to_file.startswith(f"tests{os.sep}"):
+                contents = spec.read_text(path_to_file).splitlines(keepends=True)
+                ConfidentialValidator.validate_emails(contents, path_to_file)
 
     def validate(self, spec: KomandPluginSpec):
         ConfidentialValidator.violations = []
-        ConfidentialValidator.validate_help(spec.directory)
+        ConfidentialValidator.validate_help(spec)
         # ConfidentialValidator.validate_code(spec.directory)
-        ConfidentialValidator.validate_tests(spec.directory)
+        ConfidentialValidator.validate_tests(spec)
 
         if ConfidentialValidator.violations:
             for violation in ConfidentialValidator.violations:
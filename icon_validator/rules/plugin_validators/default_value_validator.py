@@ -1,10 +1,10 @@
-import validators
-
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 from icon_validator.exceptions import ValidationException
 
 
 class DefaultValueValidator(KomandPluginValidator):
+    inputs = (SPEC,)
+    cost_class = PURE_SPEC
 
     @staticmethod
     def validate_variables(validate_variables):
@@ -14,6 +14,9 @@ class DefaultValueValidator(KomandPluginValidator):
 
         for k, v in validate_variables.items():
             if "default" in v:
+                # The validators package takes longer to import than every spec-only validator takes to run,
+                # only load it for the few specs which need it
+                import validators
                 if k == "domain":
                     if validators.domain(v["default"]) is not True:
                         raise ValidationException(f"Variable {k}'s default value is not a valid domain.")
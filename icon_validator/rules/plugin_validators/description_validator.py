@@ -1,8 +1,11 @@
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 from icon_validator.exceptions import ValidationException
 
 
 class DescriptionValidator(KomandPluginValidator):
+    inputs = (SPEC,)
+    cost_class = PURE_SPEC
+
     errors = []
 
     @staticmethod
@@ -46,6 +49,7 @@ class DescriptionValidator(KomandPluginValidator):
             DescriptionValidator.validate_description(spec.spec_dictionary()["description"], "plugin spec")
 
     def validate(self, spec):
+        DescriptionValidator.errors = []
         DescriptionValidator.validate_plugin_description(spec)
         DescriptionValidator.validate_actions(spec.spec_dictionary(), "actions")
         DescriptionValidator.validate_actions(spec.spec_dictionary(), "triggers")
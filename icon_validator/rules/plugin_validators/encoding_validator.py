@@ -1,10 +1,13 @@
 
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 from icon_validator.exceptions import ValidationException
 import yaml
 
 
 class EncodingValidator(KomandPluginValidator):
+    inputs = (SPEC,)
+    cost_class = PURE_SPEC
+
     validator_errors = []
 
     @staticmethod
@@ -1,9 +1,12 @@
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 from icon_validator.exceptions import ValidationException
 from icon_plugin_spec.plugin_spec import KomandPluginSpec
 
 
 class ExampleInputValidator(KomandPluginValidator):
+    inputs = (SPEC,)
+    cost_class = PURE_SPEC
+
     def validate(self, spec: KomandPluginSpec):
         plugin_spec = spec.spec_dictionary()
 
@@ -2,10 +2,12 @@ import os
 import re
 
 from icon_validator.styling import *
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 
 
 class ExceptionValidator(KomandPluginValidator):
+    cost_class = FILESYSTEM_SCAN
+
     def __init__(self):
         super().__init__()
         self._violating_files = []
@@ -39,6 +41,7 @@ class ExceptionValidator(KomandPluginValidator):
         return (f"icon_{name}" in path) or (f"komand_{name}" in path)
 
     def validate(self, spec):
+        self._violating_files = []
         plugin_name = spec.plugin_name()
         d = spec.directory
         for path, _, files in os.walk(d):
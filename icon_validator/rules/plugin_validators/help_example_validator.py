@@ -1,10 +1,13 @@
 import json
 import re
 from icon_validator.exceptions import ValidationException
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, PURE_SPEC
 
 
 class HelpExampleValidator(KomandPluginValidator):
+    inputs = ("help.md",)
+    cost_class = PURE_SPEC
+
     validate_errors = []
     pattern = r"#### (.*?)\n\n.*?Example input:\n\n```\n(.*?)\n\n#.*?Example output:\n\n```\n(.*?)\n\n#"
 
@@ -1,11 +1,13 @@
 import re
 
 from icon_validator.styling import *
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 from icon_validator.exceptions import ValidationException
 
 
 class HelpInputOutputValidator(KomandPluginValidator):
+    inputs = (SPEC, "help.md")
+    cost_class = PURE_SPEC
     raw_help = ""
     violations = []
     violated = 0
@@ -101,6 +103,8 @@ class HelpInputOutputValidator(KomandPluginValidator):
         return action_output
 
     def validate(self, spec):
+        HelpInputOutputValidator.violations = []
+        HelpInputOutputValidator.violated = 0
         HelpInputOutputValidator.raw_help = spec.raw_help()
         raw_spec_yaml = spec.spec_dictionary()
         process_type = ["actions", "triggers", "tasks"]
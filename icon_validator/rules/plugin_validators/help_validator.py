@@ -1,10 +1,13 @@
 import re
 
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 from icon_validator.exceptions import ValidationException
 
 
 class HelpValidator(KomandPluginValidator):
+    inputs = (SPEC, "help.md")
+    cost_class = PURE_SPEC
+
     taskExist = False
 
     HELP_HEADERS_LIST = [
@@ -113,10 +116,9 @@ class HelpValidator(KomandPluginValidator):
             raise ValidationException(f"More than one headings in type was found. \n{joined_errors}")
 
     def validate(self, spec):
+        HelpValidator.taskExist = bool(spec.spec_dictionary().get("tasks"))
         HelpValidator.validate_help_exists(spec.spec_dictionary())
         HelpValidator.validate_help_headers(spec.raw_help())
-        if spec.spec_dictionary().get("tasks"):
-            HelpValidator.taskExist = True
         HelpValidator.validate_version_history(spec.raw_help())
         HelpValidator.validate_same_actions_title(spec.spec_dictionary(), spec.raw_help())
         HelpValidator.validate_title_spelling(spec.spec_dictionary(), spec.raw_help())
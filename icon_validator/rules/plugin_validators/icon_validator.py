@@ -3,11 +3,13 @@ from pathlib import Path
 
 import filetype
 
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
 
 
 class IconValidator(KomandPluginValidator):
+    inputs = ("icon.png", "extension.png")
+    cost_class = FILESYSTEM_SCAN
 
     def validate(self, plugin_spec):
         """Base64 matches icon file valid base64, <=70kb in size, png"""
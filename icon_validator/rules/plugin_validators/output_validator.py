@@ -3,18 +3,20 @@ import os
 import re
 import sys
 
-from jsonschema import validate, exceptions
-
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
 
 
 class OutputValidator(KomandPluginValidator):
+    cost_class = FILESYSTEM_SCAN
+
     def __init__(self):
         super().__init__()
         self.missing_outputs = []
 
     def validate_output(self, process_output, spec_schema, process_name, process_type):
+        # jsonschema is slow to import, and only needed for plugins with output schemas
+        from jsonschema import validate, exceptions
         try:
             validate(process_output, spec_schema)
         except(exceptions.ValidationError, exceptions.SchemaError) as e:
@@ -45,6 +47,7 @@ class OutputValidator(KomandPluginValidator):
         return json_
 
     def validate(self, spec):
+        self.missing_outputs = []
         schemas = OutputValidator.get_schemas(spec)
         actions, tasks = {}, {}
         # Prevent parsing action and task less plugin
@@ -1,8 +1,11 @@
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 from icon_validator.exceptions import ValidationException
 
 
 class PasswordValidator(KomandPluginValidator):
+    inputs = (SPEC,)
+    cost_class = PURE_SPEC
+
     def validate(self, plugin_spec):
         connection = plugin_spec.spec_dictionary().get("connection")
         if connection is None:
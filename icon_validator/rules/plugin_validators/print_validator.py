@@ -1,8 +1,9 @@
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
 
 
 class PrintValidator(KomandPluginValidator):
+    cost_class = FILESYSTEM_SCAN
 
     @staticmethod
     def validate_print(section):
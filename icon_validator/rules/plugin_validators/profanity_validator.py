@@ -1,9 +1,11 @@
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 from icon_validator.exceptions import ValidationException
 from icon_validator.rules.lists.lists import profanity_list
 
 
 class ProfanityValidator(KomandPluginValidator):
+    inputs = (SPEC, "help.md")
+    cost_class = PURE_SPEC
 
     @staticmethod
     def validate_profanity(spec):
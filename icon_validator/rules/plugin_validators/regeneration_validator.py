@@ -1,10 +1,10 @@
 import json
 import os
-from hashlib import md5
 from typing import Optional
 
-from icon_validator.rules import KomandPluginSpec
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_plugin_spec.plugin_spec import KomandPluginSpec
+from icon_validator.file_hashes import FileHashCache, hash_cache_of, hash_files, is_skipped_directory
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
 
 MD5 = str
@@ -106,9 +106,32 @@ class Checksum(object):
 class ChecksumHandler(object):
     _SETUP_PY = "setup.py"
 
-    def __init__(self, plugin_name: str, plugin_directory: str):
+    def __init__(self, plugin_name: str, plugin_directory: str, hash_cache: FileHashCache = None):
+        """
+        :param plugin_name: Name of the plugin
+        :param plugin_directory: Directory of the plugin
+        :param hash_cache: FileHashCache to take the hashes of files unchanged since earlier runs from
+        """
         self.plugin_name = plugin_name
         self.plugin_directory = plugin_directory
+        self.hash_cache = hash_cache
+        # Absolute path to MD5 of the files hashed so far
+        self._hashes: {str: MD5} = {}
+        self._schema_files = None
+
+    def _hash_all(self, paths: [str]):
+        # Every file is hashed up front on a pool of threads, the _hash_* methods then just look them up
+        self._hashes.update(hash_files([os.path.abspath(path) for path in paths], cache=self.hash_cache))
+        if self.hash_cache:
+            self.hash_cache.save()
+
+    def _md5(self, path: str) -> MD5:
+        path = os.path.abspath(path)
+        if path not in self._hashes:
+            self._hashes.update(hash_files([path], cache=self.hash_cache))
+        if path not in self._hashes:
+            raise FileNotFoundError(path)
+        return self._hashes[path]
 
     def run_from_validator(self):
         checksum_file_contents: str = self._get_hashfile()
@@ -123,6 +146,9 @@ class ChecksumHandler(object):
 
         # If it is a python plugin
         if self._SETUP_PY in os.listdir(self.plugin_directory):
+            self._hash_all([os.path.join(self.plugin_directory, "plugin.spec.yaml"),
+                            os.path.join(self.plugin_directory, self._SETUP_PY)]
+                           + [path for _, path in self._python_schema_files()] + self._python_manifest_files())
             spec_hash: MD5 = self._hash_python_spec()
             schema_hashes: [SchemaHash] = self._hash_python_schemas()
             manifest_hash: MD5 = self._hash_python_manifest()
@@ -131,6 +157,9 @@ class ChecksumHandler(object):
                 spec_hash=spec_hash, schema_hashes=schema_hashes, manifest_hash=manifest_hash, setup_hash=setup_hash
             )
         else:
+            self._hash_all([os.path.join(self.plugin_directory, "plugin.spec.yaml"),
+                            os.path.join(self.plugin_directory, "cmd", "main.go")]
+                           + [path for paths in self._enumerate_go_schema_files().values() for path in paths])
             spec_hash: MD5 = self._hash_python_spec()
             schema_hashes: [SchemaHash] = self._hash_go_schemas()
             manifest_hash: MD5 = self._hash_go_manifest()
@@ -145,22 +174,25 @@ class ChecksumHandler(object):
             raise ValidationException("Error: Hashes between provided plugin and checksum were not equal. "
                             "Regenerate the plugin and push to working branch.")
 
+    def _python_schema_files(self) -> [(str, str)]:
+        """
+        Finds the schema.py of every action, trigger, task and the connection of a Python plugin, leaving out
+        vendored and virtualenv directories
+        :return: (identifier, path) pairs, the identifier being eg. encode/schema.py
+        """
+        if self._schema_files is None:
+            self._schema_files = []
+            for root, dirs, files in os.walk(self.plugin_directory):
+                dirs[:] = [d for d in dirs if not is_skipped_directory(root, d)]
+                if "schema.py" in files:
+                    self._schema_files.append(("%s/schema.py" % os.path.basename(root),
+                                               os.path.join(root, "schema.py")))
+        return self._schema_files
+
     def _hash_python_schemas(self) -> [SchemaHash]:
         hashes: [SchemaHash] = []
-        for root, dirs, files in os.walk(self.plugin_directory):
-            if "schema.py" not in files:
-                continue
-
-            identifier = "%s/schema.py" % os.path.basename(root)
-            filepath = os.path.join(root, "schema.py")
-
-            with open(file=filepath, mode="rb") as f:
-                contents: str = f.read()
-                m = md5()
-                m.update(contents)
-                hash_: str = m.hexdigest()
-
-                hashes.append(SchemaHash(identifier=identifier, hash_=hash_))
+        for identifier, filepath in self._python_schema_files():
+            hashes.append(SchemaHash(identifier=identifier, hash_=self._md5(filepath)))
         return hashes
 
     def _hash_go_schemas(self) -> [SchemaHash]:
@@ -170,10 +202,8 @@ class ChecksumHandler(object):
         for key in schema_paths:
             for path in schema_paths[key]:
                 try:
-                    with open(file=path, mode="rb") as schema:
-                        hash_ = md5(schema.read()).hexdigest()
-                        identifier = f"{key}/{os.path.basename(path)}"
-                        hashes.append(SchemaHash(identifier=identifier, hash_=hash_))
+                    identifier = f"{key}/{os.path.basename(path)}"
+                    hashes.append(SchemaHash(identifier=identifier, hash_=self._md5(path)))
                 except FileNotFoundError:
                     continue
         return hashes
@@ -182,8 +212,7 @@ class ChecksumHandler(object):
         setup_file: str = os.path.join(self.plugin_directory, self._SETUP_PY)
 
         try:
-            with open(file=setup_file, mode="rb") as sf:
-                return md5(sf.read()).hexdigest()
+            return self._md5(setup_file)
 
         except FileNotFoundError:
             raise ValidationException(f"Fatal: No {self._SETUP_PY} found in Python plugin.")
@@ -192,18 +221,21 @@ class ChecksumHandler(object):
         spec_file: str = os.path.join(self.plugin_directory, "plugin.spec.yaml")
 
         try:
-            with open(file=spec_file, mode="rb") as sf:
-                return md5(sf.read()).hexdigest()
+            return self._md5(spec_file)
 
         except FileNotFoundError:
             raise ValidationException("Fatal: No plugin spec found in Python plugin.")
 
-    def _hash_python_manifest(self) -> MD5:
+    def _python_manifest_files(self) -> [str]:
         manifest_directory: str = os.path.join(self.plugin_directory, "bin")
         try:
-            manifest_file: str = os.path.join(manifest_directory, os.listdir(manifest_directory)[0])
-            with open(file=manifest_file, mode="rb") as mf:
-                return md5(mf.read()).hexdigest()
+            return [os.path.join(manifest_directory, os.listdir(manifest_directory)[0])]
+        except (FileNotFoundError, IndexError):
+            return []
+
+    def _hash_python_manifest(self) -> MD5:
+        try:
+            return self._md5(self._python_manifest_files()[0])
 
         except (FileNotFoundError, IndexError):
             raise ValidationException("Fatal: No binfile found in Python plugin.")
@@ -212,8 +244,7 @@ class ChecksumHandler(object):
         manifest_file: str = os.path.join(self.plugin_directory, "cmd", "main.go")
 
         try:
-            with open(file=manifest_file, mode="rb") as mf:
-                return md5(mf.read()).hexdigest()
+            return self._md5(manifest_file)
         except FileNotFoundError as e:
             raise ValidationException("Fatal: No main.go found in Go plugin.")
 
@@ -275,10 +306,12 @@ class ChecksumHandler(object):
 
 
 class RegenerationValidator(KomandPluginValidator):
+    cost_class = FILESYSTEM_SCAN
 
     def validate(self, spec: KomandPluginSpec):
         handler: ChecksumHandler = ChecksumHandler(plugin_name=spec.plugin_name(),
-                                                   plugin_directory=spec.directory)
+                                                   plugin_directory=spec.directory,
+                                                   hash_cache=hash_cache_of(spec))
         handler.run_from_validator()
 
     @staticmethod
@@ -1,10 +1,13 @@
 from icon_plugin_spec.plugin_spec import KomandPluginSpec
 
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 from icon_validator.exceptions import ValidationException
 
 
 class RequiredKeysValidator(KomandPluginValidator):
+    inputs = (SPEC,)
+    cost_class = PURE_SPEC
+
     missing_key_message = {
         "plugin_spec_version": "Specifies the version of the spec. Current version is v1",
         "name": "Name of the plugin, refers to the docker image name. Should be lower case",
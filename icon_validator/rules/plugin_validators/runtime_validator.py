@@ -1,35 +1,32 @@
 import os
 import glob
 
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
 
 
 class RuntimeValidator(KomandPluginValidator):
+    cost_class = FILESYSTEM_SCAN
 
     @staticmethod
     def validate_setup(spec):
-        if "setup.py" in os.listdir(spec.directory):
-            with open(f"{spec.directory}/setup.py", "r") as file:
-                setup_str = file.read().replace("\n", "")
+        if spec.has_file("setup.py"):
+            setup_str = spec.raw_setup_py().replace("\n", "")
 
-                if 'install_requires=["insightconnect-plugin-runtime"]' not in setup_str\
-                        and "install_requires=['insightconnect-plugin-runtime']" not in setup_str:
-                    raise ValidationException("Komand is no longer used for install_requires in setup.py. "
-                                              "Use insightconnect-plugin-runtime instead.")
+            if 'install_requires=["insightconnect-plugin-runtime"]' not in setup_str\
+                    and "install_requires=['insightconnect-plugin-runtime']" not in setup_str:
+                raise ValidationException("Komand is no longer used for install_requires in setup.py. "
+                                          "Use insightconnect-plugin-runtime instead.", file="setup.py")
 
     @staticmethod
     def validate_imports(spec):
-        for root, dirs, files in os.walk(spec.directory):
-            for file in files:
-                if file.endswith(".py"):
-                    with open(os.path.join(root, file), "r") as open_file:
-                        file_str = open_file.read()
+        for path in spec.files(".py"):
+            file_str = spec.read_text(path)
 
-                        if "import komand\n" in file_str or "from komand " in file_str or "from komand." in file_str:
-                            raise ValidationException(f"Komand import found in {str(os.path.join(root, file))}. "
-                                                      "Komand is no longer used here. "
-                                                      "Use insightconnect-plugin-runtime instead.")
+            if "import komand\n" in file_str or "from komand " in file_str or "from komand." in file_str:
+                raise ValidationException(f"Komand import found in {os.path.join(spec.directory, path)}. "
+                                          "Komand is no longer used here. "
+                                          "Use insightconnect-plugin-runtime instead.", file=path)
 
     @staticmethod
     def validate_caching(spec):
@@ -54,27 +51,24 @@ class RuntimeValidator(KomandPluginValidator):
 
     @staticmethod
     def validate_dockerfile(spec, latest_images):
-        if "setup.py" in os.listdir(spec.directory):
-            with open(f"{spec.directory}/setup.py", "r") as setup_file:
-                setup_str = setup_file.read().replace("\n", "")
+        if spec.has_file("setup.py"):
+            setup_str = spec.raw_setup_py().replace("\n", "")
 
-                if "insightconnect-plugin-runtime" in setup_str:
-                    with open(f"{spec.directory}/Dockerfile", "r") as docker_file:
-                        docker_str = docker_file.read().replace("\n", "")
+            if "insightconnect-plugin-runtime" in setup_str:
+                docker_str = spec.dockerfile_text().replace("\n", "")
 
-                        if not any(image in docker_str for image in latest_images):
-                            raise ValidationException("insightconnect-plugin-runtime is being used in setup.py. "
-                                                      "Update Dockerfile accordingly to use latest base image.")
+                if not any(image in docker_str for image in latest_images):
+                    raise ValidationException("insightconnect-plugin-runtime is being used in setup.py. "
+                                              "Update Dockerfile accordingly to use latest base image.")
 
     def validate(self, spec):
         latest_images = ["rapid7/insightconnect-python-3-38-plugin",
                          "rapid7/insightconnect-python-3-38-slim-plugin"]
         RuntimeValidator.validate_dockerfile(spec, latest_images)
 
-        with open(f"{spec.directory}/Dockerfile", "r") as file:
-            docker_str = file.read().replace("\n", "")
+        docker_str = spec.dockerfile_text().replace("\n", "")
 
-            if any(image in docker_str for image in latest_images):
-                RuntimeValidator.validate_setup(spec)
-                RuntimeValidator.validate_imports(spec)
-                RuntimeValidator.validate_caching(spec)
+        if any(image in docker_str for image in latest_images):
+            RuntimeValidator.validate_setup(spec)
+            RuntimeValidator.validate_imports(spec)
+            RuntimeValidator.validate_caching(spec)
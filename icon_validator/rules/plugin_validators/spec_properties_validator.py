@@ -1,10 +1,13 @@
 from icon_plugin_spec.plugin_spec import KomandPluginSpec, PluginComponent
 
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 from icon_validator.exceptions import ValidationException
 
 
 class SpecPropertiesValidator(KomandPluginValidator):
+    inputs = (SPEC,)
+    cost_class = PURE_SPEC
+
     _COMPONENT_WHITELIST = {
         "input",
         "output",
@@ -67,6 +70,9 @@ class SpecPropertiesValidator(KomandPluginValidator):
         self.component_task_missing_state_schedule_offenses: [str] = []
 
     def validate(self, spec: KomandPluginSpec):
+        self.property_offenses, self.component_offenses, self.component_task_offenses = [], [], []
+        self.task_state_property_offenses, self.task_schedule_property_offenses = [], []
+        self.component_task_missing_state_schedule_offenses = []
         raw_connection, raw_actions, raw_triggers, raw_tasks = spec.connection(), spec.actions(), \
                                                                spec.triggers(), spec.tasks()
 
@@ -1,8 +1,10 @@
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 from icon_validator.exceptions import ValidationException
 
 
 class SpecVersionValidator(KomandPluginValidator):
+    inputs = (SPEC,)
+    cost_class = PURE_SPEC
 
     def validate(self, spec):
         plugin_spec_version = spec.spec_dictionary()["plugin_spec_version"]
@@ -1,9 +1,11 @@
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 from icon_validator.exceptions import ValidationException
 from icon_validator.rules.lists.lists import title_validation_list
 
 
 class TitleValidator(KomandPluginValidator):
+    inputs = (SPEC,)
+    cost_class = PURE_SPEC
 
     @staticmethod
     def validate_title(title, plugin_title=False):
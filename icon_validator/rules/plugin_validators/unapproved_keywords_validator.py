@@ -1,36 +1,27 @@
 from icon_plugin_spec.plugin_spec import KomandPluginSpec
 
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.cancellation import CancellationToken, NEVER_CANCELLED, cancellation_of
+from icon_validator.keywords import fetch_approved_keywords, keyword_tags
+from icon_validator.network import network_of
+from icon_validator.prefetch import prefetcher_of
+from icon_validator.rules.validator import KomandPluginValidator, NETWORK
 from icon_validator.exceptions import ValidationException
-from icon_validator.styling import YELLOW
-import requests
+from icon_validator.styling import RESET_ALL, YELLOW
 
 
 class UnapprovedKeywordsValidator(KomandPluginValidator):
+    io_bound = True
+    time_budget = 30
+    cost_class = NETWORK
 
     @staticmethod
     def get_approved_keywords_tags(response_json: dict) -> [str]:
-        approved_keywords = []
-        for result in response_json["results"]:
-            if result["type"] == "keyword":
-                approved_keywords.append(result["name"])
-
-        return approved_keywords
+        return keyword_tags(response_json)
 
     @staticmethod
-    def get_approved_keywords_tags_with_paging() -> [str]:
-        approved_keywords = []
-        query = ""
-        for i in range(0, 9999):
-            response = requests.get(url=f"https://extensions-api.rapid7.com/v2/public/tags?first=1000&{query}")
-            response_json = response.json()
-            approved_keywords.extend(UnapprovedKeywordsValidator.get_approved_keywords_tags(response_json))
-            if not response_json["pageInfo"]["hasNextPage"]:
-                break
-
-            query = f"after={response_json['pageInfo']['endCursor']}"
-
-        return approved_keywords
+    def get_approved_keywords_tags_with_paging(token: CancellationToken = NEVER_CANCELLED) -> [str]:
+        keywords, _ = fetch_approved_keywords(token=token)
+        return keywords
 
     @staticmethod
     def validate_keywords_exists(spec: KomandPluginSpec):
@@ -42,9 +33,11 @@ class UnapprovedKeywordsValidator(KomandPluginValidator):
             raise ValidationException("Missing required field 'keywords' in key 'hub_tags'.")
 
     @staticmethod
-    def validate_keywords(keywords: [str]) -> [str]:
+    def validate_keywords(keywords: [str], token: CancellationToken = NEVER_CANCELLED,
+                          approved_keywords: frozenset = None) -> [str]:
         invalid_keywords = []
-        approved_keywords = UnapprovedKeywordsValidator.get_approved_keywords_tags_with_paging()
+        if approved_keywords is None:
+            approved_keywords = frozenset(UnapprovedKeywordsValidator.get_approved_keywords_tags_with_paging(token))
         for keyword in keywords:
             if keyword not in approved_keywords:
                 invalid_keywords.append(keyword)
@@ -53,6 +46,26 @@ class UnapprovedKeywordsValidator(KomandPluginValidator):
             err = ", ".join(invalid_keywords)
             print(f"{YELLOW}WARNING: Unsupported keywords found: {err}. The following keywords will not be searchable by the Extension Library. Please remove or update the invalid keywords from the keywords array in the plugin.spec.yaml file.")
 
+    def fetch(self, spec: KomandPluginSpec) -> (frozenset, str):
+        """
+        Returns the approved keywords, None in snapshot only mode if there is no snapshot of them yet,
+        and a warning to print when they are out of date
+        """
+        token, network = cancellation_of(spec), network_of(spec)
+        snapshot = network.keyword_snapshot
+        if snapshot:
+            return snapshot.approved_keywords(token, offline=network.keyword_snapshot_only), snapshot.warning
+        keywords, _ = fetch_approved_keywords(token=token, transport=network.transport)
+        return frozenset(keywords), None
+
     def validate(self, spec: KomandPluginSpec):
         UnapprovedKeywordsValidator.validate_keywords_exists(spec)
-        UnapprovedKeywordsValidator.validate_keywords(spec.spec_dictionary()["hub_tags"]["keywords"])
+        approved_keywords, warning = prefetcher_of(spec).result(self, spec)
+        if warning:
+            print(f"{YELLOW}WARNING: {warning}{RESET_ALL}")
+        if approved_keywords is None:
+            print(f"{YELLOW}WARNING: Skipping the keyword check, there is no snapshot of the approved keywords "
+                  f"yet. Run icon-validate once without --keyword-snapshot-only to download it.")
+            return
+        UnapprovedKeywordsValidator.validate_keywords(spec.spec_dictionary()["hub_tags"]["keywords"],
+                                                      cancellation_of(spec), approved_keywords)
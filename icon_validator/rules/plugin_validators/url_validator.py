@@ -1,4 +1,3 @@
-import http.client
 import os
 import urllib
 import urllib.request
@@ -6,29 +5,45 @@ from typing import List
 
 from urlextract import URLExtract
 
+from icon_validator.cancellation import CancellationToken, NEVER_CANCELLED, cancellation_of
 from icon_validator.styling import *
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.network import network_of
+from icon_validator.prefetch import prefetcher_of
+from icon_validator.rules.validator import KomandPluginValidator, NETWORK
+from icon_validator.url_cache import is_broken
+from icon_validator.url_checker import URLChecker
 
 
 class URLValidator(KomandPluginValidator):
     """ Search for HTTP(s) links, and testing for invalid ones.  Namely, 400+ HTTP return codes"""
     maximum_timeout = 5
+    # URLs tested at the same time, in total and per host
+    maximum_workers = 16
+    maximum_connections_per_host = 4
+    io_bound = True
+    time_budget = 60
+    cost_class = NETWORK
 
     def __init__(self):
         super().__init__()
         # string to list dictionary
         self._violating_files_to_urls_map = {}
-        self._urls_already_tried = []
-
-    def inspect_file_for_urls_and_test_them(self, file_contents: str) -> List[str]:
-        """ Find URLs in the file, test for 400 return codes, and return the list of failed urls """
+        self._urls_already_tried = set()
+
+    def inspect_file_for_urls_and_test_them(self, file_contents: str,
+                                            token: CancellationToken = NEVER_CANCELLED,
+                                            checker: URLChecker = None) -> List[str]:
+        """ Find URLs in the file, test for 400 return codes, and return the list of failed urls.
+        The URLs are tested concurrently, through checker when given so connections are reused across files.
+        Checks still pending when the token is cancelled are abandoned. """
         return_list = []
         if not file_contents or not isinstance(file_contents, str):
             return return_list
 
         url_extractor = URLExtract()
-        urls_from_file = list(set(url_extractor.find_urls(file_contents)))
+        urls_from_file = list(dict.fromkeys(url_extractor.find_urls(file_contents)))
 
+        urls_to_test = []
         for web_address in urls_from_file:
             if web_address.lower() in ["help.md", "license.md", "readme.md"]:
                 continue
@@ -45,46 +60,60 @@ class URLValidator(KomandPluginValidator):
             if url_tested in self._urls_already_tried:
                 continue
 
-            self._urls_already_tried.append(url_tested)
-            try:
-                connection = http.client.HTTPConnection(cleaned_web_address, timeout=self.maximum_timeout, port=80)
-                connection.request("HEAD", path_to_test)
-                response = connection.getresponse()
-                code = int(response.status)
+            self._urls_already_tried.add(url_tested)
+            urls_to_test.append(web_address)
+
+        token.raise_if_cancelled()
+        if checker is None:
+            with self.url_checker(token) as checker:
+                statuses = checker.check(urls_to_test)
+        else:
+            statuses = checker.check(urls_to_test)
 
-                if code >= 400:
-                    return_list.append(web_address)
-            except Exception as e:
+        for web_address, code in statuses.items():
+            if is_broken(code):
                 return_list.append(web_address)
-            finally:
-                if connection:
-                    connection.close()
 
         return return_list
 
-    def validate(self, spec):
-        specfile = spec.directory + "/" + spec.spec_file_name
-        if os.path.exists(specfile):
-            raw_spec_contents = spec.raw_spec()
-            spec_file_bad_urls = self.inspect_file_for_urls_and_test_them(raw_spec_contents)
-            if len(spec_file_bad_urls) > 0:
-                self._violating_files_to_urls_map[specfile] = spec_file_bad_urls
-
-        helpfile = spec.directory + "/help.md"
-        if os.path.exists(helpfile):
-            help_file_contents = ""
-            with open(helpfile) as h:
-                help_file_contents = h.read()
-                help_file_bad_urls = self.inspect_file_for_urls_and_test_them(help_file_contents)
+    def url_checker(self, token: CancellationToken = NEVER_CANCELLED, network=None) -> URLChecker:
+        network = network or network_of(None)
+        return URLChecker(timeout=self.maximum_timeout, workers=self.maximum_workers,
+                          connections_per_host=self.maximum_connections_per_host, token=token,
+                          cache=network.url_cache, cache_only=network.url_cache_only,
+                          transport=network.transport)
+
+    def fetch(self, spec) -> {str: [str]}:
+        """ Test the URLs in the spec and help.md, and return the failed urls of each file. """
+        token, network = cancellation_of(spec), network_of(spec)
+        self._urls_already_tried = set()
+        violating_files_to_urls_map = {}
+        with self.url_checker(token, network) as checker:
+            specfile = spec.directory + "/" + spec.spec_file_name
+            if os.path.exists(specfile):
+                raw_spec_contents = spec.raw_spec()
+                spec_file_bad_urls = self.inspect_file_for_urls_and_test_them(raw_spec_contents, token, checker)
+                if len(spec_file_bad_urls) > 0:
+                    violating_files_to_urls_map[specfile] = spec_file_bad_urls
+
+            helpfile = spec.directory + "/help.md"
+            if os.path.exists(helpfile):
+                help_file_contents = spec.raw_help()
+                help_file_bad_urls = self.inspect_file_for_urls_and_test_them(help_file_contents, token, checker)
                 if len(help_file_bad_urls) > 0:
-                    self._violating_files_to_urls_map[helpfile] = help_file_bad_urls
+                    violating_files_to_urls_map[helpfile] = help_file_bad_urls
+        if network.url_cache:
+            network.url_cache.save()
+        return violating_files_to_urls_map
+
+    def validate(self, spec):
+        self._violating_files_to_urls_map = prefetcher_of(spec).result(self, spec)
 
         if len(self._violating_files_to_urls_map) > 0:
             header_printed = False
 
             for violating_file in self._violating_files_to_urls_map:
-                with open(violating_file) as f:
-                    file_lines = f.read().splitlines()
+                file_lines = spec.read_text(os.path.relpath(violating_file, spec.directory)).splitlines()
 
                 violating_urls = self._violating_files_to_urls_map[violating_file]
                 for url in violating_urls:
@@ -1,10 +1,13 @@
 from icon_plugin_spec.plugin_spec import KomandPluginSpec
 
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, PURE_SPEC
 from icon_validator.exceptions import ValidationException
 
 
 class UseCaseValidator(KomandPluginValidator):
+    inputs = (SPEC,)
+    cost_class = PURE_SPEC
+
     use_case_ids = [
         "data_enrichment",
         "alerting_and_notifications",
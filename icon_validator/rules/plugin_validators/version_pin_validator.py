@@ -1,23 +1,24 @@
 import re
-import os
 
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
 
 
 class VersionPinValidator(KomandPluginValidator):
+    inputs = ("requirements.txt",)
+    cost_class = FILESYSTEM_SCAN
 
     @staticmethod
     def read_requirements(spec):
         try:
-            with open(os.path.join(spec.directory, "requirements.txt")) as requirements:
-                return requirements.read().strip()
+            return spec.raw_requirements().strip()
         except FileNotFoundError:
-            raise ValidationException("requirements.txt not found. Please be sure to include this file in your plugin directory.")
+            raise ValidationException("requirements.txt not found. Please be sure to include this file in your plugin directory.",
+                                      file="requirements.txt")
 
     def validate(self, spec):
         requirements_text = self.read_requirements(spec).split("\n")
-        for requirements_text_elements in requirements_text:
+        for line_number, requirements_text_elements in enumerate(requirements_text, start=1):
             requirements_text_elements = requirements_text_elements.strip()
             if requirements_text_elements.startswith("#"):
                 continue
@@ -26,5 +27,6 @@ class VersionPinValidator(KomandPluginValidator):
                 if not requirements_text_one_element.startswith("git+") and not re.match(r'.*?(==|===|<|<=|!=|>=|>|~=).*?', requirements_text_one_element):
                     raise ValidationException(
                         "All Python dependencies must be version pinned. "
-                        "Please update all modules in requirements.txt with a specific version pin e.g. lxml==3.7.1"
+                        "Please update all modules in requirements.txt with a specific version pin e.g. lxml==3.7.1",
+                        file="requirements.txt", line=line_number
                     )
@@ -1,11 +1,18 @@
 import re
 
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.cancellation import cancellation_of
+from icon_validator.extension_versions import fetch_extension_version
+from icon_validator.network import network_of
+from icon_validator.prefetch import prefetcher_of
+from icon_validator.rules.validator import KomandPluginValidator, NETWORK
 from icon_validator.exceptions import ValidationException
-import requests
+from icon_validator.styling import YELLOW, RESET_ALL
 
 
 class VersionValidator(KomandPluginValidator):
+    io_bound = True
+    time_budget = 15
+    cost_class = NETWORK
 
     @staticmethod
     def validate_version(version):
@@ -32,20 +39,43 @@ class VersionValidator(KomandPluginValidator):
             raise ValidationException("Plugin version does not contain a string.")
 
     @staticmethod
-    def validate_version_bump_needed(spec):
+    def get_published_version(spec) -> dict:
+        """
+        Looks up the version of the plugin published in the Extension Library
+        :return: Dict with the published "version", None if it isn't published, or None in snapshot only mode
+        if it was never looked up
+        """
         plugin_name = spec.spec_dictionary()["name"]
-        response = requests.get(
-            url=f"https://extensions-api.rapid7.com/v1/public/extensions/{plugin_name}",
-            timeout=3
-        )
-        if response.status_code == 404:
+        token, network = cancellation_of(spec), network_of(spec)
+        versions = network.extension_versions
+        if versions is None:
+            return {"version": fetch_extension_version(plugin_name, token=token, transport=network.transport)}
+        if network.version_snapshot_only:
+            return versions.known(plugin_name, expired=True)
+        published_version = versions.version(plugin_name, token)
+        versions.save()
+        return {"version": published_version}
+
+    @staticmethod
+    def validate_version_bump_needed(spec, published: dict):
+        if published is None:
+            print(f"{YELLOW}WARNING: Skipping the version bump check, the published version of "
+                  f"{spec.spec_dictionary()['name']} was never looked up. Run icon-validate once without "
+                  f"--version-snapshot-only to look it up.{RESET_ALL}")
             return
 
-        if response.json()["version"] == spec.spec_dictionary()["version"]:
+        published_version = published["version"]
+        if published_version is None:
+            return
+
+        if published_version == spec.spec_dictionary()["version"]:
             raise ValidationException("The plugin has been modified without a version change. Please update the semver in plugin.spec.yaml, regenerate, and create a changelog entry under Version History in help.md")
 
+    def fetch(self, spec) -> dict:
+        return VersionValidator.get_published_version(spec)
+
     def validate(self, spec):
         VersionValidator.validate_plugin_version(spec)
         VersionValidator.validate_version(spec.spec_dictionary()["version"])
         VersionValidator.validate_version_quotes(spec.raw_spec())
-        VersionValidator.validate_version_bump_needed(spec)
+        VersionValidator.validate_version_bump_needed(spec, prefetcher_of(spec).result(self, spec))
@@ -1,13 +1,51 @@
+# Stands for the spec file (plugin.spec.yaml or workflow.spec.yaml) in a validator's inputs
+SPEC = "<spec>"
+
+# Cost classes of validators, from cheapest to most expensive. See KomandPluginValidator.cost_class
+PURE_SPEC = "pure-spec"
+FILESYSTEM_SCAN = "filesystem-scan"
+GIT = "git"
+NETWORK = "network"
+DOCKER = "docker"
+COST_CLASSES = (PURE_SPEC, FILESYSTEM_SCAN, GIT, NETWORK, DOCKER)
+
+
 class KomandPluginValidator:
     """
     Class which can validate a Komand plugin or workflow.
     """
 
+    # Validators spending most of their time waiting on the network, git or subprocesses.
+    # These run on threads in parallel mode, everything else runs in worker processes.
+    io_bound = False
+
+    # Files, relative to the plugin or workflow directory, that the result depends on and nothing else.
+    # Top level glob patterns and SPEC are allowed. Results of validators declaring their inputs are cached,
+    # None means the validator always runs.
+    inputs = None
+
+    # Seconds the validator may run before it is stopped and reported as timed out, None for no limit.
+    # Validators stop cooperatively through their cancellation token, or are killed when run isolated.
+    time_budget = None
+
+    # What the validator needs to do its work: PURE_SPEC if it only reads the spec and help.md, FILESYSTEM_SCAN if
+    # it reads other files of the plugin or workflow, GIT, NETWORK or DOCKER if it looks at git history, remote
+    # services or builds the plugin's image. Used by --profile to pick the validators to run.
+    cost_class = FILESYSTEM_SCAN
+
     def __init__(self, name=None):
         if name:
             self.name = name
         else:
             self.name = self.__class__.__name__
 
+    def fetch(self, plugin_spec):
+        """
+        Fetches what the validator needs from the network or git. Validators overriding this have it started in
+        the background as soon as the run starts, and take its result from prefetcher_of(plugin_spec) in
+        validate. It runs on another thread, so it mustn't print, and its result mustn't be cached.
+        """
+        return None
+
     def validate(self, plugin_spec):
         pass
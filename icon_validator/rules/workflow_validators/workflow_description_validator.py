@@ -1,19 +1,18 @@
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, SPEC, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
-import os
-import json
 
 
 class WorkflowDescriptionValidator(KomandPluginValidator):
+    inputs = (SPEC, "*.icon")
+    cost_class = FILESYSTEM_SCAN
 
     @staticmethod
     def walk_icon_workflows(spec, callback):
-        for file_name in os.listdir(spec.directory):
-            if file_name.endswith(".icon"):
-                for workflow_version in WorkflowDescriptionValidator.read_icon(spec, file_name)\
-                        .get("kom", {})\
-                        .get("workflowVersions", []):
-                    callback(spec, workflow_version)
+        for file_name in spec.icon_file_names():
+            for workflow_version in WorkflowDescriptionValidator.read_icon(spec, file_name)\
+                    .get("kom", {})\
+                    .get("workflowVersions", []):
+                callback(spec, workflow_version)
 
     @staticmethod
     def validate_icon_description_exist_callback(spec, workflow_version):
@@ -61,5 +60,4 @@ class WorkflowDescriptionValidator(KomandPluginValidator):
 
     @staticmethod
     def read_icon(spec, file_name):
-        with open(os.path.join(spec.directory, file_name)) as icon_file:
-            return json.load(icon_file)
+        return spec.icon_json(file_name)
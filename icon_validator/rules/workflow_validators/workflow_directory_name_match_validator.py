@@ -1,10 +1,12 @@
 import os
 
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
 
 
 class WorkflowDirectoryNameMatchValidator(KomandPluginValidator):
+    cost_class = FILESYSTEM_SCAN
+
     def validate(self, spec):
         """
         Checks that a directory name matches a workflow filename (.icon file).
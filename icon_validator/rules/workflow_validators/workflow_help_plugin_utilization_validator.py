@@ -1,8 +1,7 @@
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
 from icon_plugin_spec.plugin_spec import KomandPluginSpec
 
-import os
 import json
 import re
 
@@ -21,6 +20,7 @@ class _Plugin(object):
 
 
 class WorkflowHelpPluginUtilizationValidator(KomandPluginValidator):
+    cost_class = FILESYSTEM_SCAN
 
     @staticmethod
     def load_workflow_file(spec: KomandPluginSpec) -> dict:
@@ -29,18 +29,12 @@ class WorkflowHelpPluginUtilizationValidator(KomandPluginValidator):
         :param spec: .icon workflow
         :return: Workflow spec as a dictionary
         """
-        workflow_directory = spec.directory
-
-        for file_name in os.listdir(workflow_directory):
-            if not (file_name.endswith(".icon")):
-                continue
-
-            with open(f"{workflow_directory}/{file_name}") as json_file:
-                try:
-                    workflow_file = json.load(json_file)
-                except json.JSONDecodeError:
-                    raise ValidationException(
-                        "The .icon file is not in JSON format. Try exporting the .icon file again")
+        for file_name in spec.icon_file_names():
+            try:
+                workflow_file = spec.icon_json(file_name)
+            except json.JSONDecodeError:
+                raise ValidationException(
+                    "The .icon file is not in JSON format. Try exporting the .icon file again")
 
             return workflow_file
 
@@ -1,10 +1,11 @@
 import os
 
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
 
 
 class WorkflowICONFileNameValidator(KomandPluginValidator):
+    cost_class = FILESYSTEM_SCAN
 
     def validate(self, spec):
         """
@@ -1,11 +1,12 @@
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
 
-import os
 import json
 
 
 class WorkflowICONFileValidator(KomandPluginValidator):
+    inputs = ("*.icon",)
+    cost_class = FILESYSTEM_SCAN
 
     @staticmethod
     def validate_workflow_versions_steps(step, value):
@@ -127,58 +128,54 @@ class WorkflowICONFileValidator(KomandPluginValidator):
                 "ICON file is missing the description key in triggers. Try exporting the .icon file again")
 
     def validate(self, spec):
-        d = spec.directory
-        for file_name in os.listdir(d):
-            if file_name.endswith(".icon"):
-                data = dict()
-                with open(f"{d}/{file_name}") as json_file:
-                    try:
-                        data = json.load(json_file)
-                    except json.JSONDecodeError:
-                        raise ValidationException("ICON file is not in JSON format try exporting the .icon file again")
-
-                try:
-                    data = data["kom"]
-                except KeyError:
-                    raise ValidationException("ICON file is missing the kom key. Try exporting the .icon file again")
-
-                try:
-                    if data["komandVersion"] is None or data["komandVersion"] == "":
-                        raise ValidationException(
-                            "The komandVersion key is not defined. Try exporting the .icon file again")
-                except KeyError:
+        for file_name in spec.icon_file_names():
+            try:
+                data = spec.icon_json(file_name)
+            except json.JSONDecodeError:
+                raise ValidationException("ICON file is not in JSON format try exporting the .icon file again")
+
+            try:
+                data = data["kom"]
+            except KeyError:
+                raise ValidationException("ICON file is missing the kom key. Try exporting the .icon file again")
+
+            try:
+                if data["komandVersion"] is None or data["komandVersion"] == "":
                     raise ValidationException(
-                        "ICON file is missing the komandVersion key. Try exporting the .icon file again")
+                        "The komandVersion key is not defined. Try exporting the .icon file again")
+            except KeyError:
+                raise ValidationException(
+                    "ICON file is missing the komandVersion key. Try exporting the .icon file again")
 
-                try:
-                    if data["komFileVersion"] is None or data["komFileVersion"] == "":
-                        raise ValidationException(
-                            "The komFileVersion key is not defined. Try exporting the .icon file again")
-                except KeyError:
+            try:
+                if data["komFileVersion"] is None or data["komFileVersion"] == "":
                     raise ValidationException(
-                        "ICON file is missing the komFileVersion key. Try exporting the .icon file again")
+                        "The komFileVersion key is not defined. Try exporting the .icon file again")
+            except KeyError:
+                raise ValidationException(
+                    "ICON file is missing the komFileVersion key. Try exporting the .icon file again")
 
-                try:
-                    if data["exportedAt"] is None or data["exportedAt"] == "":
-                        raise ValidationException(
-                            "The exportedAt key is not defined. Try exporting the .icon file again")
-                except KeyError:
+            try:
+                if data["exportedAt"] is None or data["exportedAt"] == "":
                     raise ValidationException(
-                        "ICON file is missing the exportedAt key. Try exporting the .icon file again")
+                        "The exportedAt key is not defined. Try exporting the .icon file again")
+            except KeyError:
+                raise ValidationException(
+                    "ICON file is missing the exportedAt key. Try exporting the .icon file again")
 
-                try:
-                    workflow_versions = data["workflowVersions"]
-                except KeyError:
-                    raise ValidationException(
-                        "ICON file is missing the workflowVersions key. Try exporting the .icon file again")
-                try:
-                    triggers = data["triggers"]
-                except KeyError:
-                    raise ValidationException(
-                        "ICON file is missing the triggers key. Try exporting the .icon file again")
+            try:
+                workflow_versions = data["workflowVersions"]
+            except KeyError:
+                raise ValidationException(
+                    "ICON file is missing the workflowVersions key. Try exporting the .icon file again")
+            try:
+                triggers = data["triggers"]
+            except KeyError:
+                raise ValidationException(
+                    "ICON file is missing the triggers key. Try exporting the .icon file again")
 
-                for item in workflow_versions:
-                    WorkflowICONFileValidator.validate_workflow_versions(item)
+            for item in workflow_versions:
+                WorkflowICONFileValidator.validate_workflow_versions(item)
 
-                for item in triggers:
-                    WorkflowICONFileValidator.validate_triggers(item)
\ No newline at end of file
+            for item in triggers:
+                WorkflowICONFileValidator.validate_triggers(item)
\ No newline at end of file
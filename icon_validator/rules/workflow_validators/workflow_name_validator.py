@@ -1,9 +1,10 @@
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
 from os import listdir
 
 
 class WorkflowNameValidator(KomandPluginValidator):
+    cost_class = FILESYSTEM_SCAN
 
     def validate(self, spec):
         """
@@ -1,16 +1,14 @@
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
-import os
-import json
 
 
 class WorkflowParametersKeywordValidator(KomandPluginValidator):
+    cost_class = FILESYSTEM_SCAN
 
     @staticmethod
     def are_parameters_present_in_icon_file(spec):
-        for file_name in os.listdir(spec.directory):
-            if file_name.endswith(".icon"):
-                icon_content = WorkflowParametersKeywordValidator.read_icon(spec, file_name)
+        for file_name in spec.icon_file_names():
+            icon_content = WorkflowParametersKeywordValidator.read_icon(spec, file_name)
 
         # Grab the most recent WF version out of the icon file and see if it has parameters
         try:
@@ -28,8 +26,7 @@ class WorkflowParametersKeywordValidator(KomandPluginValidator):
 
     @staticmethod
     def read_icon(spec, file_name):
-        with open(os.path.join(spec.directory, file_name)) as icon_file:
-            return json.load(icon_file)
+        return spec.icon_json(file_name)
 
     def validate(self, spec):
         if self.are_parameters_present_in_icon_file(spec):
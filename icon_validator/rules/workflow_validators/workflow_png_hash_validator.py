@@ -1,9 +1,10 @@
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
 from hashlib import sha256
 
 
 class WorkflowPNGHashValidator(KomandPluginValidator):
+    cost_class = FILESYSTEM_SCAN
 
     _GOOD_HASH = "02094da9b8d40d9411eb10f45cb1cd1627d24bd7006bc105375b00a97ea66d3e"
 
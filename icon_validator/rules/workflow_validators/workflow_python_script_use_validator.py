@@ -1,7 +1,6 @@
-import os
 import json
 from typing import List
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
 from icon_validator.workflow.unmarshal import read_workflow
 from icon_validator.workflow.model import Workflow
@@ -9,6 +8,7 @@ from icon_validator.styling import YELLOW
 
 
 class WorkflowPythonScriptUseValidator(KomandPluginValidator):
+    cost_class = FILESYSTEM_SCAN
 
     _PLUGIN_NAME = "Python 3 Script"
 
@@ -33,15 +33,13 @@ class WorkflowPythonScriptUseValidator(KomandPluginValidator):
         of its use
         """
         wf = Workflow
-        d = spec.directory
-        for file_name in os.listdir(d):
-            if file_name.endswith(".icon"):
-                try:
-                    wf = read_workflow(spec=spec, file_name=file_name)
-                except json.JSONDecodeError:
-                    raise ValidationException(
-                        "ICON file is not in JSON format, try exporting the workflow file again"
-                    )
+        for file_name in spec.icon_file_names():
+            try:
+                wf = read_workflow(spec=spec, file_name=file_name)
+            except json.JSONDecodeError:
+                raise ValidationException(
+                    "ICON file is not in JSON format, try exporting the workflow file again"
+                )
 
         findings = self.python_plugin_used(workflow=wf)
 
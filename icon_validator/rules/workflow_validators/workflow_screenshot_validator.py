@@ -1,11 +1,13 @@
 import os
 
-from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.rules.validator import KomandPluginValidator, FILESYSTEM_SCAN
 from icon_validator.exceptions import ValidationException
 from icon_validator.rules.lists.lists import title_validation_list
 
 
 class WorkflowScreenshotValidator(KomandPluginValidator):
+    cost_class = FILESYSTEM_SCAN
+
     def __init__(self):
         super().__init__()
         self._files_list = list()
@@ -176,6 +178,8 @@ class WorkflowScreenshotValidator(KomandPluginValidator):
             )
 
     def validate(self, spec):
+        self._files_list = list()
+        self._names_list = list()
         self.validate_screenshots_keys_exist(spec)
         self.validate_screenshot_files_exist(spec)
         self.validate_names_not_null()
@@ -0,0 +1,197 @@
+MAJOR = "major"
+MINOR = "minor"
+PATCH = "patch"
+# From the smallest to the largest version increment
+BUMPS = (PATCH, MINOR, MAJOR)
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+# Sections of a plugin spec holding components with inputs and outputs, and what one of them is called
+COMPONENT_SECTIONS = {"actions": "Action", "triggers": "Trigger", "tasks": "Task"}
+CONNECTION = "connection"
+TYPES = "types"
+VERSION = "version"
+INPUT = "input"
+OUTPUT = "output"
+TITLE = "title"
+TYPE = "type"
+REQUIRED = "required"
+
+
+class SpecChange:
+    """
+    One difference between two versions of a plugin spec
+    """
+
+    def __init__(self, bump: str, change: str, path: tuple, message: str):
+        """
+        :param bump: Version increment the change requires at least, MAJOR, MINOR or PATCH
+        :param change: ADDED, REMOVED or CHANGED
+        :param path: Keys leading to what changed in the spec, e.g. ("actions", "search", "input", "query")
+        :param message: What changed, for people
+        """
+        self.bump = bump
+        self.change = change
+        self.path = path
+        self.message = message
+
+    def __repr__(self):
+        return f"SpecChange({self.bump}, {self.change}, {self.path})"
+
+
+class SpecDiff:
+    """
+    Every difference between two versions of a plugin spec, each classified by the version increment it requires
+    """
+
+    def __init__(self):
+        self.changes: [SpecChange] = []
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    def add(self, bump: str, change: str, path: tuple, message: str):
+        self.changes.append(SpecChange(bump, change, path, message))
+
+    def of(self, bump: str) -> [SpecChange]:
+        """
+        Returns the changes requiring exactly the given version increment
+        """
+        return [change for change in self.changes if change.bump == bump]
+
+    @property
+    def required_bump(self) -> str:
+        """
+        The largest version increment any change requires, None if nothing changed
+        """
+        bumps = {change.bump for change in self.changes}
+        for bump in reversed(BUMPS):
+            if bump in bumps:
+                return bump
+        return None
+
+
+def _mapping(value) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
+def _diff_other_fields(diff: SpecDiff, path: tuple, what: str, remote: dict, local: dict, compared: tuple):
+    # Anything not compared more closely, e.g. descriptions, examples or defaults, only needs a patch increment
+    for key in sorted(set(remote) | set(local), key=str):
+        if key not in compared and remote.get(key) != local.get(key):
+            change = ADDED if key not in remote else REMOVED if key not in local else CHANGED
+            diff.add(PATCH, change, path + (key,), f"{str(key).capitalize()} of {what} {change}")
+
+
+def _diff_fields(diff: SpecDiff, path: tuple, what: str, remote: dict, local: dict, is_output: bool):
+    # Inputs or outputs of a component, or the fields of the connection
+    for name in remote:
+        if name not in local:
+            diff.add(MAJOR, REMOVED, path + (name,), f"{what} {name} removed")
+    for name, field in local.items():
+        field = _mapping(field)
+        required = bool(field.get(REQUIRED))
+        if name not in remote:
+            if is_output:
+                diff.add(MINOR, ADDED, path + (name,), f"{what} {name} added")
+            elif required:
+                diff.add(MAJOR, ADDED, path + (name,), f"Required {what.lower()} {name} added")
+            else:
+                # Optional connection fields are taken up by existing connections unchanged
+                diff.add(MINOR if path[0] != CONNECTION else PATCH, ADDED, path + (name,),
+                         f"Optional {what.lower()} {name} added")
+            continue
+
+        remote_field = _mapping(remote[name])
+        remote_required = bool(remote_field.get(REQUIRED))
+        if is_output and remote_required and not required:
+            diff.add(MAJOR, CHANGED, path + (name, REQUIRED), f"{what} {name} no longer required")
+        elif not is_output and required and not remote_required:
+            diff.add(MAJOR, CHANGED, path + (name, REQUIRED), f"{what} {name} changed to required")
+        elif remote_required != required:
+            diff.add(PATCH, CHANGED, path + (name, REQUIRED),
+                     f"{what} {name} changed to {'required' if required else 'optional'}")
+        for key in (TITLE, TYPE):
+            if key in remote_field and key in field and remote_field[key] != field[key]:
+                diff.add(MAJOR, CHANGED, path + (name, key), f"{key.capitalize()} of {what.lower()} {name} changed")
+        _diff_other_fields(diff, path + (name,), f"{what.lower()} {name}", remote_field, field,
+                           (TITLE, TYPE, REQUIRED))
+
+
+def _diff_component(diff: SpecDiff, path: tuple, what: str, remote: dict, local: dict):
+    if remote.get(TITLE) != local.get(TITLE):
+        diff.add(MAJOR, CHANGED, path + (TITLE,), f"{what} title changed")
+    for section, is_output in ((INPUT, False), (OUTPUT, True)):
+        if (section in remote) != (section in local):
+            change = REMOVED if section in remote else ADDED
+            diff.add(MAJOR, change, path + (section,), f"{section.capitalize()} section of {what.lower()} {change}")
+        elif section in remote:
+            _diff_fields(diff, path + (section,), f"{section.capitalize()} of {what.lower()}",
+                         _mapping(remote[section]), _mapping(local[section]), is_output)
+    _diff_other_fields(diff, path, what.lower(), remote, local, (TITLE, INPUT, OUTPUT))
+
+
+def _diff_types(diff: SpecDiff, remote: dict, local: dict):
+    for type_name, remote_type in remote.items():
+        path = (TYPES, type_name)
+        if type_name not in local:
+            diff.add(MAJOR, REMOVED, path, f"Type {type_name} removed")
+            continue
+        remote_type, local_type = _mapping(remote_type), _mapping(local[type_name])
+        for name, remote_field in remote_type.items():
+            remote_field = _mapping(remote_field)
+            if name not in local_type:
+                diff.add(MAJOR, REMOVED, path + (name,), f"Field {name} removed from type {type_name}")
+                continue
+            field = _mapping(local_type[name])
+            if remote_field.get(TYPE) != field.get(TYPE):
+                diff.add(MAJOR, CHANGED, path + (name, TYPE), f"Type of field {name} in type {type_name} changed")
+            if bool(remote_field.get(REQUIRED)) != bool(field.get(REQUIRED)):
+                diff.add(MAJOR, CHANGED, path + (name, REQUIRED),
+                         f"Field {name} in type {type_name} changed to "
+                         f"{'required' if field.get(REQUIRED) else 'optional'}")
+            _diff_other_fields(diff, path + (name,), f"field {name} in type {type_name}", remote_field, field,
+                               (TYPE, REQUIRED))
+        for name in local_type:
+            if name not in remote_type:
+                diff.add(PATCH, ADDED, path + (name,), f"Field {name} added to type {type_name}")
+    for type_name in local:
+        if type_name not in remote:
+            diff.add(PATCH, ADDED, (TYPES, type_name), f"Type {type_name} added")
+
+
+def diff_specs(remote: dict, local: dict) -> SpecDiff:
+    """
+    Compares two versions of a plugin spec in one pass, e.g. the one on the base ref against the local one
+    :param remote: Spec dictionary of the earlier version
+    :param local: Spec dictionary of the later version
+    :return: SpecDiff of every action, trigger, task, input, output, type and connection field added, removed
+    or changed. Removing or renaming anything, changing titles or types, and new required inputs need a major
+    version increment, new components, outputs and optional inputs a minor one, anything else a patch.
+    """
+    diff = SpecDiff()
+    for section, what in COMPONENT_SECTIONS.items():
+        remote_components, local_components = _mapping(remote.get(section)), _mapping(local.get(section))
+        for name, component in remote_components.items():
+            if name not in local_components:
+                diff.add(MAJOR, REMOVED, (section, name), f"{what} {name} removed")
+            else:
+                _diff_component(diff, (section, name), f"{what} {name}", _mapping(component),
+                                _mapping(local_components[name]))
+        for name in local_components:
+            if name not in remote_components:
+                diff.add(MINOR, ADDED, (section, name), f"{what} {name} added")
+
+    if (CONNECTION in remote) != (CONNECTION in local):
+        change = REMOVED if CONNECTION in remote else ADDED
+        diff.add(MAJOR, change, (CONNECTION,), f"Connection {change}")
+    elif CONNECTION in remote:
+        _diff_fields(diff, (CONNECTION,), "Connection field", _mapping(remote[CONNECTION]),
+                     _mapping(local[CONNECTION]), is_output=False)
+
+    _diff_types(diff, _mapping(remote.get(TYPES)), _mapping(local.get(TYPES)))
+    _diff_other_fields(diff, (), "the plugin", remote, local,
+                       tuple(COMPONENT_SECTIONS) + (CONNECTION, TYPES, VERSION))
+    return diff
@@ -0,0 +1,122 @@
+import http.client
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from icon_validator.cancellation import CancellationToken, NEVER_CANCELLED, interrupt_connection
+from icon_validator.transport import Cassette, Response, Transport
+
+# Header carrying the headers of the request being replayed, which are part of its key in the cassette
+REQUEST_HEADERS_HEADER = "X-Stand-In-Request-Headers"
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _replay(self):
+        url = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query).get("url", [""])[0]
+        headers = json.loads(self.headers.get(REQUEST_HEADERS_HEADER) or "{}")
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        response = self.server.cassette.lookup(self.command, url, headers)
+        if response is None:
+            body = f"No response to {self.command} {url} was recorded".encode()
+            self.send_response(599)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        self.send_response(response.status)
+        for name, value in response.headers.items():
+            # The body is sent as recorded, however the network sent it
+            if name not in ("content-length", "transfer-encoding", "content-encoding", "connection"):
+                self.send_header(name, value)
+        self.send_header("Content-Length", str(len(response.body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(response.body)
+
+    do_GET = do_HEAD = do_POST = _replay
+
+
+class StandInServer:
+    """
+    Local HTTP server answering for every remote service with the responses recorded in a cassette, so runs
+    can be benchmarked over real sockets without network access. Send requests to it with StandInTransport.
+    """
+
+    def __init__(self, cassette: Cassette, latency: float = 0):
+        """
+        :param cassette: Cassette holding the responses
+        :param latency: Seconds each response takes
+        """
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        self._server.daemon_threads = True
+        self._server.cassette = cassette
+        self._server.latency = latency
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self) -> (str, int):
+        return self._server.server_address
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class StandInTransport(Transport):
+    """
+    Sends every request to a StandInServer instead of the host it is meant for, over a keep-alive
+    connection per thread. Requests the cassette holds no response for fail like unreachable hosts.
+    """
+
+    def __init__(self, address: (str, int), timeout: float = 10):
+        self.address = tuple(address)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def __getstate__(self):
+        # Connections can't be pickled, worker processes open their own
+        return {"address": self.address, "timeout": self.timeout}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def request(self, method: str, url: str, send, headers: dict = None,
+                token: CancellationToken = NEVER_CANCELLED) -> Response:
+        token.raise_if_cancelled()
+        path = "/?" + urllib.parse.urlencode({"url": url})
+        request_headers = {REQUEST_HEADERS_HEADER: json.dumps(headers)} if headers else {}
+        for attempt in range(2):
+            connection = getattr(self._local, "connection", None)
+            if connection is None:
+                connection = self._local.connection = http.client.HTTPConnection(*self.address, timeout=self.timeout)
+            try:
+                with token.on_cancel(interrupt_connection(connection)):
+                    connection.request(method, path, headers=request_headers)
+                    response = connection.getresponse()
+                    body = response.read()
+            except (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionError):
+                connection.close()
+                self._local.connection = None
+                token.raise_if_cancelled()
+                if attempt:
+                    raise
+                # The server closed the idle connection, try again on a fresh one
+                continue
+            if response.status == 599:
+                raise ConnectionRefusedError(body.decode())
+            return Response(response.status, dict(response.getheaders()), body)
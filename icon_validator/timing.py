@@ -1,15 +1,63 @@
-from datetime import datetime
+import time
+
+from icon_validator.styling import *
 
 
 def time_now():
-    return datetime.utcnow()
+    """
+    Returns a reading of the monotonic, high resolution performance counter in seconds.
+    Only the difference between two readings is meaningful.
+    """
+    return time.perf_counter()
+
+
+def cpu_time_now():
+    """
+    Returns the CPU time used so far by the calling thread, in seconds
+    """
+    return time.thread_time()
 
 
 def format_time(start, end):
     """
-    Returns the time delta of two datetimes in a millisecond floating point number.
-    :param start: Start datetime
-    :param end: End dtaetime
+    Returns the time delta of two readings in a millisecond floating point number.
+    :param start: Start reading
+    :param end: End reading
     :return: the milliseconds between start and end, as a floating point number
     """
-    return (end - start).total_seconds() * 1000
+    return (end - start) * 1000
+
+
+def print_timings_table(results: list):
+    """
+    Prints the wall clock and CPU time of every validator, slowest first
+    :param results: ValidatorResults of the run
+    """
+    print(f"{BULLET_OK} {BOLD}Validator timings (slowest first){CEND}")
+    print(f"\t{'Wall ms':>10} {'CPU ms':>10}  Validator")
+    for result in sorted(results, key=lambda r: r.wall_time, reverse=True):
+        cached = " (cached)" if result.cached else ""
+        print(f"\t{result.wall_time:>10.2f} {result.cpu_time:>10.2f}  {result.name}{cached}")
+
+
+def timings_report(directory: str, results: list, time_elapsed: float) -> dict:
+    """
+    Builds the JSON serializable timings of a run
+    :param directory: Directory of the plugin or workflow which was validated
+    :param results: ValidatorResults of the run
+    :param time_elapsed: Total time of the run in milliseconds
+    """
+    return {
+        "directory": directory,
+        "total_ms": time_elapsed,
+        "validators": [
+            {
+                "name": result.name,
+                "wall_ms": result.wall_time,
+                "cpu_ms": result.cpu_time,
+                "passed": result.success,
+                "cached": result.cached,
+            }
+            for result in results
+        ],
+    }
@@ -0,0 +1,192 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+from icon_validator.cancellation import CancellationToken, NEVER_CANCELLED
+from icon_validator.locks import file_lock
+
+
+class HTTPStatusError(OSError):
+    """
+    Raised by Response.raise_for_status for error statuses, an OSError like the errors of requests
+    """
+
+
+class NotRecorded(ConnectionError):
+    """
+    Raised when replaying a request which the cassette holds no response for, which validators report
+    like a host that can't be reached
+    """
+
+
+class Response:
+    """
+    Status, headers and body of an HTTP response, whether it came from the network or a cassette
+    """
+
+    def __init__(self, status: int, headers: dict = None, body: bytes = b""):
+        self.status = status
+        self.headers = {name.lower(): value for name, value in (headers or {}).items()}
+        self.body = body
+
+    @property
+    def status_code(self) -> int:
+        return self.status
+
+    def header(self, name: str, default: str = None) -> str:
+        return self.headers.get(name.lower(), default)
+
+    def json(self):
+        return json.loads(self.body)
+
+    def raise_for_status(self):
+        """
+        :raises HTTPStatusError if the status is 400 or above
+        """
+        if self.status >= 400:
+            raise HTTPStatusError(f"HTTP status {self.status}")
+
+
+def from_requests(response) -> Response:
+    """
+    Converts a requests.Response
+    """
+    return Response(response.status_code, dict(response.headers), response.content)
+
+
+def interaction_key(method: str, url: str, headers: dict = None) -> str:
+    """
+    Returns the key a request is recorded under in a cassette
+    """
+    key = f"{method} {url}"
+    if headers:
+        key += " " + json.dumps(headers, sort_keys=True)
+    return key
+
+
+class Transport:
+    """
+    Sends the requests of network validators. Every client reaching a remote service passes the transport
+    a function sending a request its own way, e.g. over its pooled connections, which this transport calls
+    straight away. Subclasses record those requests or answer them without going to the network.
+    """
+
+    def request(self, method: str, url: str, send, headers: dict = None,
+                token: CancellationToken = NEVER_CANCELLED) -> Response:
+        """
+        :param method: HTTP method
+        :param url: URL requested
+        :param send: Function taking the method, URL and headers and returning the Response from the network
+        :param headers: Request headers
+        :param token: CancellationToken checked before the request is sent
+        :raises OSError or http.client.HTTPException if the request failed
+        """
+        token.raise_if_cancelled()
+        return send(method, url, headers or {})
+
+
+# Transport of runs which neither record nor replay, going straight to the network
+LIVE = Transport()
+
+
+class Cassette:
+    """
+    Responses recorded from the network in a JSON file, keyed by method, URL and request headers
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.interactions = self._load()
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Locks can't be pickled, which parallel runs need to hand the cassette to worker processes
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path) as f:
+                interactions = json.load(f).get("interactions")
+            return interactions if isinstance(interactions, dict) else {}
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def lookup(self, method: str, url: str, headers: dict = None) -> Response:
+        """
+        :return: The recorded Response, None if the request wasn't recorded
+        """
+        with self._lock:
+            recorded = self.interactions.get(interaction_key(method, url, headers))
+        if not isinstance(recorded, dict):
+            return None
+        # Bodies are stored as text, bytes which aren't UTF-8 are escaped and restored
+        return Response(recorded["status"], recorded.get("headers"),
+                        recorded.get("body", "").encode("utf-8", "surrogateescape"))
+
+    def record(self, method: str, url: str, headers: dict, response: Response):
+        """
+        Records a response and writes it to the cassette straight away, keeping responses recorded meanwhile
+        by other processes
+        """
+        key = interaction_key(method, url, headers)
+        recorded = {"status": response.status, "headers": response.headers,
+                    "body": response.body.decode("utf-8", "surrogateescape")}
+        with self._lock:
+            self.interactions[key] = recorded
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with file_lock(self.path):
+            interactions = self._load()
+            interactions[key] = recorded
+            with tempfile.NamedTemporaryFile("w", dir=directory, delete=False) as f:
+                json.dump({"interactions": interactions}, f, indent=1, sort_keys=True)
+            os.replace(f.name, self.path)
+
+
+class RecordingTransport(Transport):
+    """
+    Sends requests to the network and records their responses in a cassette to replay later
+    """
+
+    def __init__(self, cassette: Cassette):
+        self.cassette = cassette
+
+    def request(self, method: str, url: str, send, headers: dict = None,
+                token: CancellationToken = NEVER_CANCELLED) -> Response:
+        response = super().request(method, url, send, headers, token)
+        self.cassette.record(method, url, headers, response)
+        return response
+
+
+class ReplayingTransport(Transport):
+    """
+    Answers requests from a cassette without going to the network, optionally as slowly as a remote service
+    would, so the concurrency of network validators can be benchmarked on a box without network access
+    """
+
+    def __init__(self, cassette: Cassette, latency: float = 0):
+        """
+        :param cassette: Cassette holding the responses
+        :param latency: Seconds each response takes
+        """
+        self.cassette = cassette
+        self.latency = latency
+
+    def request(self, method: str, url: str, send, headers: dict = None,
+                token: CancellationToken = NEVER_CANCELLED) -> Response:
+        token.raise_if_cancelled()
+        if self.latency:
+            time.sleep(self.latency)
+            token.raise_if_cancelled()
+        response = self.cassette.lookup(method, url, headers)
+        if response is None:
+            raise NotRecorded(f"No response to {method} {url} was recorded in {self.cassette.path}")
+        return response
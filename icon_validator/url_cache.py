@@ -0,0 +1,138 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.parse
+
+from icon_validator.locks import file_lock
+
+DEFAULT_URL_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "icon-validator", "urls.json")
+
+# Seconds a URL test is trusted for. Working links rarely break, broken ones are often fixed or
+# only down for a moment, so failures are tested again much sooner
+SUCCESS_TTL = 7 * 24 * 60 * 60
+FAILURE_TTL = 60 * 60
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Returns the form of a URL used as its cache key: scheme and host lower case, without the default
+    port or a fragment, and / for an empty path
+    """
+    parts = urllib.parse.urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    return urllib.parse.urlunsplit((scheme, host, parts.path or "/", parts.query, ""))
+
+
+def is_broken(status: int) -> bool:
+    """
+    :param status: HTTP status of a URL, None if it couldn't be reached
+    """
+    return status is None or status >= 400
+
+
+class URLStatusCache:
+    """
+    Statuses of URLs tested by earlier runs, kept in a local JSON file shared by every plugin and workflow,
+    so links which appear in many help.md files are tested once in a while rather than on every run
+    """
+
+    def __init__(self, path: str = None, success_ttl: float = SUCCESS_TTL, failure_ttl: float = FAILURE_TTL):
+        """
+        :param path: Cache file, defaults to $ICON_VALIDATOR_URL_CACHE_FILE or ~/.cache/icon-validator/urls.json
+        :param success_ttl: Seconds the status of a working URL is reused for
+        :param failure_ttl: Seconds the status of a broken or unreachable URL is reused for
+        """
+        self.path = path or os.environ.get("ICON_VALIDATOR_URL_CACHE_FILE") or DEFAULT_URL_CACHE_FILE
+        self.success_ttl = success_ttl
+        self.failure_ttl = failure_ttl
+        self.entries = self._load()
+        # URLs tested by this process which are not saved yet
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Locks can't be pickled, which parallel runs need to hand the cache to worker processes
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _merge(entries: dict, newer: dict):
+        # Keeps the latest test of each URL
+        for url, entry in newer.items():
+            saved = entries.get(url)
+            if not isinstance(entry, dict):
+                continue
+            if not isinstance(saved, dict) or saved.get("checked", 0) <= entry.get("checked", 0):
+                entries[url] = entry
+
+    def lookup(self, url: str, expired: bool = False) -> dict:
+        """
+        :param url: URL to look up
+        :param expired: Return the entry even if it is older than its TTL
+        :return: Entry holding the "status" of the URL, None if it is not in the cache or expired
+        """
+        with self._lock:
+            entry = self.entries.get(normalize_url(url))
+        if not isinstance(entry, dict) or "status" not in entry:
+            return None
+        ttl = self.failure_ttl if is_broken(entry["status"]) else self.success_ttl
+        if not expired and time.time() - entry.get("checked", 0) > ttl:
+            return None
+        return entry
+
+    def record(self, url: str, status: int):
+        """
+        :param url: URL which was tested
+        :param status: HTTP status of the URL, None if it couldn't be reached
+        """
+        entry = {"status": status, "checked": time.time()}
+        with self._lock:
+            self.entries[normalize_url(url)] = entry
+            self._pending[normalize_url(url)] = entry
+
+    def save(self):
+        """
+        Writes the URLs tested since the last save. The file is re-read under a lock first, so
+        URLs saved meanwhile by other processes, e.g. when validating many plugins at once, are kept.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with file_lock(self.path):
+                entries = self._load()
+                self._merge(entries, pending)
+                with tempfile.NamedTemporaryFile("w", dir=os.path.dirname(self.path), delete=False) as f:
+                    json.dump(entries, f, indent=1, sort_keys=True)
+                os.replace(f.name, self.path)
+            with self._lock:
+                self._merge(self.entries, entries)
+        except OSError:
+            # URLs are just tested again next time
+            pass
@@ -0,0 +1,187 @@
+import http.client
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from icon_validator.cancellation import CancellationToken, NEVER_CANCELLED, interrupt_connection
+from icon_validator.exceptions import ValidationCancelled
+from icon_validator.transport import LIVE, Response, Transport
+from icon_validator.url_cache import URLStatusCache
+
+# Errors a reused keep-alive connection fails with when the server closed it while it was idle
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine, ConnectionError)
+
+
+class _HostConnections:
+    """
+    Keep-alive connections to one host, of which at most a limited number are in use at once
+    """
+
+    def __init__(self, scheme: str, host: str, port: int, timeout: float, limit: int):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        # Held by each thread talking to the host
+        self.slots = threading.BoundedSemaphore(limit)
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def open(self) -> (http.client.HTTPConnection, bool):
+        """
+        :return: Tuple of a connection to the host and whether it was used before
+        """
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout), False
+
+    def keep(self, connection: http.client.HTTPConnection):
+        with self._lock:
+            self._idle.append(connection)
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+
+class URLChecker:
+    """
+    Checks the HTTP status of many URLs at once. Requests to the same host share keep-alive connections,
+    and only a few of them run at the same time, so a file full of links to one site doesn't hammer it.
+    """
+
+    def __init__(self, timeout: float = 5, workers: int = 16, connections_per_host: int = 4,
+                 token: CancellationToken = NEVER_CANCELLED, cache: URLStatusCache = None, cache_only: bool = False,
+                 transport: Transport = LIVE):
+        """
+        :param timeout: Seconds to wait for a host to connect or answer
+        :param workers: URLs checked at the same time
+        :param connections_per_host: URLs of the same host checked at the same time
+        :param token: CancellationToken abandoning the checks, interrupting the requests in flight
+        :param cache: URLStatusCache to reuse recent checks from and record new ones in
+        :param cache_only: Never go to the network, answer from the cache alone, however old its entries are
+        :param transport: Transport sending the requests, by default over the connections kept by the checker
+        """
+        self.timeout = timeout
+        self.workers = workers
+        self.connections_per_host = connections_per_host
+        self.token = token
+        self.cache = cache
+        self.cache_only = cache_only
+        self.transport = transport
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Closes the connections kept alive for later checks
+        """
+        with self._lock:
+            hosts, self._hosts = list(self._hosts.values()), {}
+        for host in hosts:
+            host.close()
+
+    def _connections(self, parts: urllib.parse.SplitResult) -> _HostConnections:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        with self._lock:
+            if key not in self._hosts:
+                self._hosts[key] = _HostConnections(parts.scheme, parts.hostname, port, self.timeout,
+                                                    self.connections_per_host)
+            return self._hosts[key]
+
+    def _request(self, host: _HostConnections, method: str, path: str) -> int:
+        while True:
+            self.token.raise_if_cancelled()
+            connection, reused = host.open()
+            try:
+                with self.token.on_cancel(interrupt_connection(connection)):
+                    connection.request(method, path)
+                    response = connection.getresponse()
+                    if method == "HEAD":
+                        response.read()
+            except _STALE_CONNECTION_ERRORS:
+                connection.close()
+                if reused:
+                    # Try again on a fresh connection
+                    continue
+                raise
+            except Exception:
+                connection.close()
+                raise
+            # A GET is only sent to see the status, the body is never read so the connection can't be reused
+            if method == "HEAD" and not response.will_close:
+                host.keep(connection)
+            else:
+                connection.close()
+            return response.status
+
+    def _send(self, method: str, url: str, headers: dict) -> Response:
+        parts = urllib.parse.urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        return Response(self._request(self._connections(parts), method, path))
+
+    def status(self, url: str) -> int:
+        """
+        Returns the HTTP status of a URL. Servers which refuse or don't implement HEAD requests are asked
+        again with a GET when they answer with an error.
+        :param url: http or https URL
+        :raises OSError or http.client.HTTPException if the URL couldn't be reached
+        :raises ValidationCancelled if the token was cancelled
+        """
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise http.client.InvalidURL(url)
+        with self._connections(parts).slots:
+            status = self.transport.request("HEAD", url, self._send, token=self.token).status
+            if status >= 400:
+                status = self.transport.request("GET", url, self._send, token=self.token).status
+        return status
+
+    def _status_or_none(self, url: str) -> int:
+        try:
+            status = self.status(url)
+        except ValidationCancelled:
+            raise
+        except Exception:
+            # Unreachable, unless the request was interrupted by cancelling
+            self.token.raise_if_cancelled()
+            status = None
+        if self.cache:
+            self.cache.record(url, status)
+        return status
+
+    def check(self, urls: [str]) -> {str: int}:
+        """
+        Checks URLs concurrently
+        :param urls: http or https URLs
+        :return: HTTP status of each URL, None for URLs which couldn't be reached. In cache only mode,
+        URLs the cache doesn't know are left out
+        :raises ValidationCancelled if the token was cancelled
+        """
+        statuses, to_check = {}, []
+        for url in urls:
+            entry = self.cache.lookup(url, expired=self.cache_only) if self.cache else None
+            if entry is not None:
+                statuses[url] = entry["status"]
+            elif not self.cache_only:
+                to_check.append(url)
+
+        if to_check:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(to_check))) as executor:
+                futures = {url: executor.submit(self._status_or_none, url) for url in to_check}
+            for url, future in futures.items():
+                statuses[url] = future.result()
+        return {url: statuses[url] for url in urls if url in statuses}
@@ -1,48 +1,94 @@
 #! /usr/bin/env python3
 
-from icon_plugin_spec.plugin_spec import KomandPluginSpec
-from icon_validator.exceptions import ValidationException
-
-from .rules import VALIDATORS, JENKINS_VALIDATORS, WORKFLOW_VALIDATORS
+from .context import ValidationContext
+from .execution import ParallelRunner, run_sequentially
+from .prefetch import Prefetcher
+from . import rules
 from .styling import *
 from .timing import *
 
 
+def default_validators(spec_file_name="plugin.spec.yaml", run_all=False) -> list:
+    """
+    Returns the validators to run on a plugin or workflow, in execution order. They are new instances on every
+    call, so directories validated one after another by a batch worker don't see each other's failures.
+    :param spec_file_name: Name of the spec file, plugin.spec.yaml or workflow.spec.yaml
+    :param run_all: Include the validators which only run with --all (plugins only)
+    """
+    if spec_file_name == "plugin.spec.yaml":
+        validators = rules.new_validators("VALIDATORS")
+        if run_all:
+            validators = validators + rules.new_validators("JENKINS_VALIDATORS")
+        return validators
+    elif spec_file_name == "workflow.spec.yaml":
+        return rules.new_validators("WORKFLOW_VALIDATORS")
+    return []
+
+
 def validate(
     directory,
     spec_file_name="plugin.spec.yaml",
     fail_fast=False,
     run_all=False,
     validators=list(),
+    parallel=False,
+    workers=None,
+    cache=None,
+    timings=None,
+    events=None,
+    context=None,
+    history=None,
+    budgets=None,
+    selection=None,
+    network=None,
+    prefetch=True,
 ):
-    spec = KomandPluginSpec(directory, spec_file_name)
+    # Shared by every validator so each file is read at most once. Watch mode passes the same
+    # context to every run, invalidating only what changed in between
+    spec = context or ValidationContext(directory, spec_file_name)
+    if network:
+        spec.network = network
+    spec.hash_cache = cache.file_hashes if cache else None
     status = 0  # Resultant return code
     start_time = time_now()
     print(f"{BULLET_OK} {BOLD}Running Integration Validators...{CEND}")
 
     if not validators:
-        if spec_file_name == "plugin.spec.yaml":
-            validators = VALIDATORS
-            if run_all:
-                validators += JENKINS_VALIDATORS
-        elif spec_file_name == "workflow.spec.yaml":
-            validators = WORKFLOW_VALIDATORS
+        validators = default_validators(spec_file_name, run_all)
 
-    validation_failures: [str] = []
-    for v in validators:
-        print(f"{BULLET_OK} Executing validator {v.name}")
-        try:
-            v.validate(spec)
-            success = True
+    if selection:
+        validators, skipped = selection.select(validators, history)
+        if skipped:
+            print(f"{YELLOW}Skipping {len(skipped)} validators outside {selection.describe()}: "
+                  f"{', '.join(v.name for v in skipped)}{RESET_ALL}")
 
-        except ValidationException as e:
-            validation_failures.append(f'Validator "{v.name}" failed! \n\tCause: {e}')
-            # print(f"Validator \"{v.name}\" failed! \n\tCause: {e}")
-            status = 1
-            success = False
+    if events:
+        events = events.bind(directory)
 
-        if not success and fail_fast:
-            break
+    # Fetches from the network and git start with the run, overlapping with the local validators
+    prefetcher = spec.prefetcher = Prefetcher() if prefetch else None
+    if parallel:
+        results = ParallelRunner(workers=workers).run(validators, spec, fail_fast=fail_fast, cache=cache,
+                                                      events=events, history=history, budgets=budgets,
+                                                      prefetcher=prefetcher)
+    else:
+        if fail_fast and history:
+            validators = history.fail_fast_order(validators)
+        results = run_sequentially(validators, spec, fail_fast=fail_fast, cache=cache, events=events,
+                                   budgets=budgets, prefetcher=prefetcher)
+
+    validation_failures: [str] = []
+    completed = []
+    try:
+        for result in results:
+            completed.append(result)
+            if not result.success:
+                validation_failures.append(f'Validator "{result.name}" failed! \n\tCause: {result.error}')
+                status = 1
+    finally:
+        # Nothing is left to pick up what is still being fetched, e.g. after a failure in fail fast mode
+        if prefetcher:
+            prefetcher.cancel()
 
     end_time = time_now()
     time_elapsed = format_time(start=start_time, end=end_time)
@@ -58,5 +104,14 @@ def validate(
         for vf in validation_failures:
             print(f"{vf}\n")
 
-    print(f"\n----\n{BULLET_OK}{BOLD} Total time elapsed: {time_elapsed}ms{CEND}")
+    print("\n----")
+    print_timings_table(completed)
+    print(f"{BULLET_OK}{BOLD} Total time elapsed: {time_elapsed}ms{CEND}")
+    if timings is not None:
+        timings.append(timings_report(directory, completed, time_elapsed))
+    if history:
+        history.record(completed)
+        history.save()
+    if events:
+        events.end(status, time_elapsed)
     return status
@@ -0,0 +1,151 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import yaml
+
+from icon_validator.exceptions import ValidationException
+from icon_validator.remote_spec import DEFAULT_BASE_REF, PLUGIN_DIRNAME, PLUGIN_SPEC, RemoteSpecCache
+from icon_validator.repository import changed_paths_since, open_repo, resolve_ref
+from icon_validator.styling import *
+from icon_validator.timing import *
+
+
+def changed_plugins(paths: [str]) -> [str]:
+    """
+    Names the plugins whose files are among changed paths
+    :param paths: Changed file paths, relative to the root of the repository
+    :return: Plugin names, in the order first seen
+    """
+    names = []
+    for path in paths:
+        parts = path.split("/")
+        if len(parts) > 2 and parts[0] == PLUGIN_DIRNAME:
+            names.append(parts[1])
+    return list(dict.fromkeys(names))
+
+
+def read_base_specs(repo: "Repo", commit: str, plugin_names: [str], cache: RemoteSpecCache = None) -> dict:
+    """
+    Reads the specs of many plugins at a commit through the one `git cat-file --batch` process git keeps open
+    for the repository, rather than walking the commit's tree for each plugin
+    :param repo: Repository the plugins are in
+    :param commit: SHA of the commit to read the specs at
+    :param plugin_names: Plugins to read the specs of
+    :param cache: RemoteSpecCache to take the specs from when stored there
+    :return: Plugin name to its parsed spec, or to the spec's YAML when it wasn't in the cache. Plugins without
+    a spec at the commit, e.g. new ones, are left out
+    """
+    specs = {}
+    for name in plugin_names:
+        spec = cache.lookup(commit, name) if cache else None
+        if spec is None:
+            try:
+                _, _, _, spec = repo.git.get_object_data(f"{commit}:{PLUGIN_DIRNAME}/{name}/{PLUGIN_SPEC}")
+            except ValueError:
+                continue
+        specs[name] = spec
+    return specs
+
+
+class BumpResult:
+    """
+    Outcome of checking the version bump of one plugin
+    """
+
+    def __init__(self, name: str, error: str = None, base_spec: dict = None):
+        """
+        :param name: Name of the plugin
+        :param error: Why the version bump is wrong, None when it is right
+        :param base_spec: Spec on the base ref, when it was parsed for the check
+        """
+        self.name = name
+        self.error = error
+        self.base_spec = base_spec
+
+
+def check_version_bump(name: str, directory: str, base_spec) -> BumpResult:
+    """
+    Checks that a plugin's version was bumped as the changes of its spec need
+    :param name: Name of the plugin
+    :param directory: Directory of the plugin
+    :param base_spec: Spec of the plugin on the base ref, parsed or as YAML
+    """
+    # Imported here, only the processes checking plugins need the validators
+    from icon_validator.rules.plugin_validators.version_bump_validator import VersionBumpValidator
+    parsed = None
+    try:
+        if not isinstance(base_spec, dict):
+            base_spec = parsed = yaml.safe_load(base_spec)
+        with open(os.path.join(directory, PLUGIN_SPEC)) as f:
+            local_spec = yaml.safe_load(f)
+        VersionBumpValidator().validate_bump(base_spec, local_spec)
+    except ValidationException as e:
+        return BumpResult(name, str(e), parsed)
+    except (OSError, yaml.YAMLError, KeyError, TypeError, ValueError, AttributeError) as e:
+        return BumpResult(name, f"Could not compare specs: {e!r}", parsed)
+    return BumpResult(name, base_spec=parsed)
+
+
+def check_version_bumps(path: str, base_ref: str = DEFAULT_BASE_REF, cache: RemoteSpecCache = None,
+                        workers: int = None) -> int:
+    """
+    Checks the version bumps of every plugin changed since the base ref across a repository of plugins, with one
+    `git diff` to find them, one `git cat-file` process to read their specs on the base ref and a pool of worker
+    processes comparing the specs
+    :param path: Directory inside the repository, only plugins below it are checked
+    :param base_ref: Branch, tag or commit plugins are compared against
+    :param cache: RemoteSpecCache to take the specs on the base ref from and store them in
+    :param workers: Maximum number of worker processes, defaults to the CPU count
+    :return: 0 when every changed plugin bumped its version as needed, 1 otherwise
+    """
+    # GitPython is slow to import, and only needed when looking at git history
+    from git.exc import BadName, InvalidGitRepositoryError, NoSuchPathError
+    start_time = time_now()
+    try:
+        repo = open_repo(os.path.abspath(path), search_parent_directories=True)
+        commit = resolve_ref(repo, base_ref)
+    except (InvalidGitRepositoryError, NoSuchPathError):
+        print(f"{BULLET_FAIL} {path} is not in a git repository")
+        return 1
+    except (BadName, ValueError):
+        print(f"{BULLET_FAIL} Remote {base_ref} not found. Pass the branch plugins are merged into with --base-ref")
+        return 1
+
+    root = os.path.realpath(repo.working_tree_dir)
+    scope = os.path.realpath(path)
+    directories = {}
+    for name in changed_plugins(changed_paths_since(repo, commit)):
+        directory = os.path.join(root, PLUGIN_DIRNAME, name)
+        # Removed plugins have nothing left to bump
+        if (directory == scope or directory.startswith(scope + os.sep)) \
+                and os.path.isfile(os.path.join(directory, PLUGIN_SPEC)):
+            directories[name] = directory
+    if not directories:
+        print(f"{BULLET_OK} No plugin changes since {base_ref}")
+        return 0
+
+    base_specs = read_base_specs(repo, commit, list(directories), cache)
+    for name in directories:
+        if name not in base_specs:
+            print(f"{BULLET_OK} {name} is new since {base_ref}, no version bump to check")
+
+    names = list(base_specs)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(check_version_bump, names, [directories[name] for name in names],
+                                    [base_specs[name] for name in names]))
+
+    failed = []
+    for result in results:
+        if result.base_spec is not None and cache:
+            cache.store(commit, result.name, result.base_spec)
+        if result.error:
+            failed.append(result.name)
+            print(f"{BULLET_FAIL} {BOLD}{result.name}{CEND}: {result.error}")
+        else:
+            print(f"{BULLET_OK} {result.name}")
+
+    time_elapsed = format_time(start=start_time, end=time_now())
+    print(f"{BULLET_OK} {len(results) - len(failed)} of {len(results)} changed plugins bumped their version as "
+          f"needed since {base_ref}")
+    print(f"\n----\n{BULLET_OK}{BOLD} Total time elapsed: {time_elapsed}ms{CEND}")
+    return 1 if failed else 0
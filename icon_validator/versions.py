@@ -0,0 +1,12 @@
+import re
+
+_COMPONENT = re.compile(r"(\d+|[a-z]+|\.)")
+
+
+def loose_version_key(version: str) -> list:
+    """
+    Sort key comparing version numbers like distutils' LooseVersion did, e.g. 1.10.0 after 1.9.2,
+    without importing distutils, which is slow to import and gone from Python 3.12
+    """
+    return [int(part) if part.isdigit() else part
+            for part in _COMPONENT.split(version) if part and part != "."]
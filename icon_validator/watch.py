@@ -0,0 +1,286 @@
+import ctypes
+import ctypes.util
+import fnmatch
+import os
+import select
+import struct
+import sys
+import time
+
+from icon_validator.batch import detect_spec_file_name
+from icon_validator.context import ValidationContext
+from icon_validator.rules.validator import SPEC
+from icon_validator.styling import *
+from icon_validator.validate import default_validators, validate
+
+# From <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+# Editors often save in several steps (write a temp file, rename it, touch a backup), so wait for
+# the directory to go quiet for this long before re-running validators
+SETTLE_SECONDS = 0.03
+
+
+def _ignored(name: str) -> bool:
+    # .git, editor swap files and byte code never affect validation
+    return name.startswith(".") or name == "__pycache__" or name.endswith("~") or name.endswith(".swp")
+
+
+class InotifyWatcher:
+    """
+    Reports changed files below a directory using Linux inotify, called through ctypes so no extra
+    dependency is needed
+    """
+
+    def __init__(self, directory: str):
+        """
+        :param directory: Directory to watch, recursively
+        :raises OSError if inotify is not available
+        """
+        self.directory = directory
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this platform")
+        self._libc = libc
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        # Watch descriptor to the directory it watches, relative to self.directory
+        self._watches = {}
+        self._add_tree("")
+
+    def _add_tree(self, relative_directory: str) -> [str]:
+        # Files can be created in a new directory before it is watched, so they are returned as changed
+        found = []
+        for root, dirs, files in os.walk(os.path.join(self.directory, relative_directory)):
+            dirs[:] = [d for d in dirs if not _ignored(d)]
+            self._add_watch(os.path.relpath(root, self.directory))
+            found.extend(os.path.relpath(os.path.join(root, file), self.directory)
+                         for file in files if not _ignored(file))
+        return found
+
+    def _add_watch(self, relative_directory: str):
+        path = os.path.join(self.directory, relative_directory)
+        descriptor = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if descriptor < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+        self._watches[descriptor] = os.path.normpath(relative_directory)
+
+    def _read(self, timeout: float) -> [str]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        changed = []
+        offset = 0
+        while offset < len(data):
+            descriptor, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if descriptor not in self._watches or not name or _ignored(name):
+                continue
+            path = os.path.normpath(os.path.join(self._watches[descriptor], name))
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    changed.extend(self._add_tree(path))
+                continue
+            changed.append(path)
+        return changed
+
+    def wait(self, timeout: float = None) -> [str]:
+        """
+        Blocks until files change
+        :param timeout: Seconds to wait for the first change, forever if None
+        :return: Sorted paths, relative to the directory, of the changed files. Empty on timeout
+        """
+        changed = set(self._read(timeout))
+        while changed:
+            more = self._read(SETTLE_SECONDS)
+            if not more:
+                break
+            changed.update(more)
+        return sorted(changed)
+
+    def close(self):
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """
+    Reports changed files below a directory by comparing modification times and sizes, for
+    platforms without inotify
+    """
+
+    def __init__(self, directory: str, interval: float = 0.5):
+        """
+        :param directory: Directory to watch, recursively
+        :param interval: Seconds between scans
+        """
+        self.directory = directory
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> {str: tuple}:
+        snapshot = {}
+        for root, dirs, files in os.walk(self.directory):
+            dirs[:] = [d for d in dirs if not _ignored(d)]
+            for file in files:
+                if _ignored(file):
+                    continue
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[os.path.relpath(path, self.directory)] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout: float = None) -> [str]:
+        """
+        Blocks until files change
+        :param timeout: Seconds to wait for the first change, forever if None
+        :return: Sorted paths, relative to the directory, of the changed files. Empty on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            changed = {path for path in snapshot.keys() | self._snapshot.keys()
+                       if snapshot.get(path) != self._snapshot.get(path)}
+            self._snapshot = snapshot
+            if changed:
+                return sorted(changed)
+            if deadline is not None and time.monotonic() >= deadline:
+                return []
+            time.sleep(self.interval if deadline is None else max(0, min(self.interval, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+
+def file_watcher(directory: str):
+    """
+    Returns the best available watcher of a directory: inotify on Linux, polling elsewhere
+    """
+    try:
+        return InotifyWatcher(directory)
+    except (OSError, AttributeError):
+        return PollingWatcher(directory)
+
+
+def depends_on(validator, changed: [str], spec_file_name: str) -> bool:
+    """
+    Works out whether a validator has to be re-run after files changed
+    :param validator: Validator to check
+    :param changed: Paths of the changed files relative to the plugin or workflow directory
+    :param spec_file_name: Name of the spec file, plugin.spec.yaml or workflow.spec.yaml
+    :return: True if any of the validator's declared inputs changed. Validators which don't declare their
+    inputs could depend on any file, so they are always re-run
+    """
+    if validator.inputs is None:
+        return True
+
+    for pattern in validator.inputs:
+        pattern = spec_file_name if pattern == SPEC else pattern
+        if any(c in pattern for c in "*?["):
+            # Patterns only match files at the top of the directory, like ValidationContext.matching_files
+            if any(os.sep not in path and fnmatch.fnmatch(path, pattern) for path in changed):
+                return True
+        elif pattern in changed:
+            return True
+    return False
+
+
+def affected_validators(validators: list, changed: [str], spec_file_name: str) -> (list, list):
+    """
+    Splits validators into those to re-run after files changed and the network bound ones skipped
+    :return: Tuple of the validators to re-run and the validators skipped
+    """
+    run, skipped = [], []
+    for validator in validators:
+        if not depends_on(validator, changed, spec_file_name):
+            continue
+        # Checks against remote services without declared inputs would run on every save and dominate
+        # the feedback loop, they still run on the first pass and in a normal icon-validate run
+        if validator.inputs is None and validator.io_bound:
+            skipped.append(validator)
+        else:
+            run.append(validator)
+    return run, skipped
+
+
+def watch(directory: str, run_all: bool = False, parallel: bool = False, workers: int = None, cache=None,
+          events=None, validators: list = None, watcher=None, history=None, budgets=None,
+          selection=None, network=None, prefetch: bool = True) -> int:
+    """
+    Validates a plugin or workflow directory, then re-runs the validators affected by each change to
+    its files until interrupted
+    :param directory: Directory of the plugin or workflow
+    :param run_all: Run all validators (plugins only)
+    :param parallel: Run independent validators concurrently
+    :param workers: Maximum worker processes used when running in parallel
+    :param cache: ResultCache to replay unchanged validator results from
+    :param events: EventStream to report validator starts and finishes to
+    :param validators: Validators to run, defaults to all of those for the plugin or workflow
+    :param watcher: InotifyWatcher or PollingWatcher of the directory, defaults to the best available
+    :param history: RunHistory to schedule validators from and record their durations in
+    :param budgets: TimeBudgets limiting how long each validator may run
+    :param selection: ValidatorSelection picking the validators to run by cost, once for the whole session
+    :param network: NetworkSettings of the validators reaching remote services
+    :param prefetch: Start fetching from the network and git as soon as each run starts
+    :return: Status of the last run, once interrupted
+    """
+    if not os.path.isdir(directory):
+        sys.stderr.write(f"{BULLET_FAIL} Path '{directory}' does not exist\n")
+        return 1
+
+    spec_file_name = detect_spec_file_name(directory)
+    validators = validators or default_validators(spec_file_name, run_all)
+    if selection:
+        validators, skipped = selection.select(validators, history)
+        if skipped:
+            print(f"{YELLOW}Skipping {len(skipped)} validators outside {selection.describe()}: "
+                  f"{', '.join(v.name for v in skipped)}{RESET_ALL}")
+    context = ValidationContext(directory, spec_file_name)
+    watcher = watcher or file_watcher(directory)
+
+    def run(to_run: list) -> int:
+        return validate(directory, spec_file_name, run_all=run_all, validators=to_run, parallel=parallel,
+                        workers=workers, cache=cache, events=events, context=context, history=history,
+                        budgets=budgets, network=network, prefetch=prefetch)
+
+    status = run(validators)
+    try:
+        while True:
+            print(f"\n{BULLET_OK} Watching {directory} for changes ({type(watcher).__name__}), press Ctrl+C to stop")
+            changed = watcher.wait()
+            context.invalidate(changed)
+            to_run, skipped = affected_validators(validators, changed, spec_file_name)
+            print(f"{BULLET_OK} {BOLD}Changed: {', '.join(changed)}{CEND}")
+            if skipped:
+                print(f"{YELLOW}Skipping {', '.join(v.name for v in skipped)}, which run against remote "
+                      f"services. Run icon-validate without --watch to include them{RESET_ALL}")
+            if not to_run:
+                print(f"{BULLET_OK} No validators depend on the changed files")
+                continue
+            status = run(to_run)
+    except KeyboardInterrupt:
+        return status
+    finally:
+        watcher.close()
@@ -0,0 +1,48 @@
+import json
+import subprocess
+import sys
+import unittest
+
+# Modules which take most of the start up time, and are only needed once a validator runs
+HEAVY_MODULES = ["git", "requests", "jsonschema", "urlextract", "validators", "filetype", "pkg_resources"]
+
+# Packages of the validators themselves, imported one by one on first use
+VALIDATOR_PACKAGES = ["icon_validator.rules.plugin_validators", "icon_validator.rules.workflow_validators"]
+
+
+def imported_modules(module: str) -> [str]:
+    """
+    Imports a module in a fresh interpreter
+    :return: Names of every module loaded once it is imported
+    """
+    code = f"import json, sys\nimport {module}\nprint(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def loaded(modules: [str], package: str) -> [str]:
+    return [name for name in modules if name == package or name.startswith(f"{package}.")]
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_command_line_does_not_import_validators(self):
+        # What used to make start up slow, rather than a wall clock budget which depends on the machine
+        modules = imported_modules("icon_validator.cli")
+        for package in HEAVY_MODULES + VALIDATOR_PACKAGES:
+            self.assertEqual(loaded(modules, package), [], f"Importing icon_validator.cli loaded {package}")
+
+    def test_rules_do_not_import_validators(self):
+        modules = imported_modules("icon_validator.rules")
+        for package in HEAVY_MODULES + VALIDATOR_PACKAGES:
+            self.assertEqual(loaded(modules, package), [], f"Importing icon_validator.rules loaded {package}")
+
+    def test_validators_are_imported_on_first_use(self):
+        code = ("import sys\n"
+                "import icon_validator.rules as rules\n"
+                "assert 'icon_validator.rules.plugin_validators.help_validator' not in sys.modules\n"
+                "assert len(rules.WORKFLOW_VALIDATORS) == 22\n"
+                "assert 'icon_validator.rules.plugin_validators.help_validator' not in sys.modules\n"
+                "assert rules.HelpValidator().name == 'HelpValidator'\n"
+                "assert len(rules.VALIDATORS) == 33 and rules.VALIDATORS is rules.VALIDATORS\n")
+        subprocess.run([sys.executable, "-c", code], check=True)
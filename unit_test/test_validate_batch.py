@@ -0,0 +1,54 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from icon_validator import rules
+from icon_validator.batch import detect_spec_file_name, expand_paths, validate_batch
+
+
+class TestValidateBatch(unittest.TestCase):
+
+    def test_detect_spec_file_name(self):
+        self.assertEqual(detect_spec_file_name("plugin_examples/good_plugin"), "plugin.spec.yaml")
+        self.assertEqual(detect_spec_file_name("workflow_examples/Automated_Indicator_Enrichment"), "workflow.spec.yaml")
+
+    def test_expand_paths_globs_and_removes_duplicates(self):
+        paths = expand_paths(["plugin_examples/good_plugin_w*", "plugin_examples/good_plugin_validate_email",
+                              "plugin_examples/good_plugin_with_task"])
+        self.assertEqual(paths, ["plugin_examples/good_plugin_warning_keywords",
+                                 "plugin_examples/good_plugin_with_task",
+                                 "plugin_examples/good_plugin_validate_email"])
+
+    def test_batch_combined_exit_code_and_summary(self):
+        buffer = io.StringIO()
+        with redirect_stdout(buffer):
+            result = validate_batch(["workflow_examples/Automated_Indicator_Enrichment", "plugin_examples/does_not_exist"], workers=2)
+        output = buffer.getvalue()
+        self.assertEqual(result, 1)
+        self.assertIn("Batch summary", output)
+        self.assertIn("failed plugin_examples/does_not_exist", output)
+        self.assertIn("Validating workflow at workflow_examples/Automated_Indicator_Enrichment", output)
+
+    def test_failures_do_not_carry_over_to_later_directories(self):
+        with tempfile.TemporaryDirectory() as root:
+            bad, good = os.path.join(root, "bad"), os.path.join(root, "good")
+            shutil.copytree("plugin_examples/good_plugin", bad)
+            shutil.copytree("plugin_examples/good_plugin", good)
+            os.makedirs(os.path.join(bad, ".output"))
+            # The encode action always outputs data
+            with open(os.path.join(bad, ".output", "action_encode.json"), "w") as f:
+                f.write("{}")
+            buffer = io.StringIO()
+            # One worker validates both directories, the failing one first as it is bigger
+            validators = {"VALIDATORS": [("OutputValidator", "plugin_validators.output_validator")]}
+            with patch.dict(rules._LISTS, validators), redirect_stdout(buffer):
+                result = validate_batch([bad, good], workers=1)
+        output = buffer.getvalue()
+        self.assertEqual(result, 1)
+        self.assertIn(f"failed {bad}", output)
+        self.assertIn(f"passed {good}", output)
+        self.assertIn("1 of 2 directories passed", output)
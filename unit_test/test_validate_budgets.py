@@ -0,0 +1,97 @@
+import argparse
+import io
+import json
+import os
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+
+from icon_validator.budgets import TimeBudgets, parse_budget
+from icon_validator.cancellation import cancellation_of, check_call
+from icon_validator.context import ValidationContext
+from icon_validator.events import EventStream
+from icon_validator.exceptions import ValidationTimeout
+from icon_validator.execution import run_validator
+from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.timing import format_time, time_now
+from icon_validator.validate import validate
+
+
+class HangingSubprocessValidator(KomandPluginValidator):
+    io_bound = True
+    time_budget = 0.2
+
+    def validate(self, spec):
+        check_call(["sleep", "30"], cancellation_of(spec))
+
+
+class UncooperativeValidator(KomandPluginValidator):
+    """
+    Blocks without ever looking at its cancellation token
+    """
+    io_bound = True
+    time_budget = 0.2
+
+    def validate(self, spec):
+        time.sleep(30)
+
+
+class QuickValidator(KomandPluginValidator):
+    time_budget = 0.2
+
+    def validate(self, spec):
+        print("Quick output.")
+
+
+class TestValidateBudgets(unittest.TestCase):
+
+    def setUp(self):
+        self.spec = ValidationContext("plugin_examples/good_plugin")
+
+    def test_validator_over_budget_times_out(self):
+        start = time_now()
+        with redirect_stdout(io.StringIO()):
+            result = run_validator(HangingSubprocessValidator(), self.spec)
+        self.assertIsInstance(result.error, ValidationTimeout)
+        self.assertEqual(result.error.rule_id, "HangingSubprocessValidator")
+        self.assertLess(format_time(start, time_now()), 5000)
+
+    def test_isolated_validator_is_killed(self):
+        start = time_now()
+        with redirect_stdout(io.StringIO()):
+            result = run_validator(UncooperativeValidator(), self.spec, budgets=TimeBudgets(isolate=True))
+        self.assertIsInstance(result.error, ValidationTimeout)
+        self.assertLess(format_time(start, time_now()), 5000)
+
+    def test_isolated_validator_output_and_result_come_back(self):
+        validator = QuickValidator()
+        validator.io_bound = True
+        with redirect_stdout(io.StringIO()) as output:
+            result = run_validator(validator, self.spec, budgets=TimeBudgets(isolate=True))
+        self.assertTrue(result.success)
+        self.assertIn("Quick output.", output.getvalue())
+
+    def test_budget_overrides_by_name(self):
+        budgets = TimeBudgets({"HangingSubprocessValidator": 0, "QuickValidator": 5})
+        self.assertIsNone(budgets.budget_for(HangingSubprocessValidator()))
+        self.assertEqual(budgets.budget_for(QuickValidator()), 5)
+        self.assertEqual(budgets.budget_for(UncooperativeValidator()), 0.2)
+
+    def test_timeout_is_reported_as_event(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "events.ndjson")
+            with redirect_stdout(io.StringIO()):
+                status = validate("plugin_examples/good_plugin", "plugin.spec.yaml", False, False,
+                                  [QuickValidator(), HangingSubprocessValidator()], events=EventStream(path=path))
+            with open(path) as f:
+                events = [json.loads(line) for line in f]
+        self.assertEqual(status, 1)
+        finished = {event["validator"]: event["status"] for event in events if event["event"] == "finish"}
+        self.assertEqual(finished, {"QuickValidator": "passed", "HangingSubprocessValidator": "timeout"})
+
+    def test_parse_budget(self):
+        self.assertEqual(parse_budget("URLValidator=2.5"), ("URLValidator", 2.5))
+        for text in ["URLValidator", "=5", "URLValidator=soon", "URLValidator=-1"]:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_budget(text)
@@ -0,0 +1,129 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+from icon_validator import cache, cli
+from icon_validator.cache import ResultCache
+from icon_validator.exceptions import ValidationException
+from icon_validator.rules.validator import KomandPluginValidator, SPEC
+from icon_validator.validate import validate
+
+from icon_validator.rules.plugin_validators.help_validator import HelpValidator
+from icon_validator.rules.plugin_validators.title_validator import TitleValidator
+
+
+class CountingValidator(KomandPluginValidator):
+    inputs = (SPEC, "help.md")
+    runs = 0
+
+    def validate(self, spec):
+        CountingValidator.runs += 1
+        print(f"counted {spec.spec_dictionary()['name']}")
+
+
+class FailingHelpValidator(KomandPluginValidator):
+    inputs = ("help.md",)
+
+    def validate(self, spec):
+        raise ValidationException(f"help.md has {len(spec.raw_help())} characters.")
+
+
+def run_and_capture(directory, cache, **kwargs):
+    validators = [TitleValidator(), CountingValidator(), HelpValidator(), FailingHelpValidator()]
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        result = validate(directory, "plugin.spec.yaml", False, True, validators, cache=cache, **kwargs)
+    # Drop the elapsed time line, which differs between runs
+    return result, buffer.getvalue().split("\n----\n")[0]
+
+
+class TestValidateCache(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.cache = ResultCache(os.path.join(self.root, "cache"))
+        for name in ["first", "second"]:
+            shutil.copytree("plugin_examples/good_plugin", os.path.join(self.root, name))
+        CountingValidator.runs = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_unchanged_inputs_replay_result_and_output(self):
+        directory = os.path.join(self.root, "first")
+        first_result, first_report = run_and_capture(directory, self.cache)
+        second_result, second_report = run_and_capture(directory, self.cache)
+        self.assertEqual(first_result, 1)
+        self.assertEqual(second_result, 1)
+        self.assertEqual(first_report, second_report)
+        self.assertIn("counted base64", second_report)
+        self.assertIn("help.md has", second_report)
+        self.assertEqual(CountingValidator.runs, 1)
+        self.assertEqual(self.cache.hits, 4)
+
+    def test_identical_inputs_in_another_directory_hit(self):
+        run_and_capture(os.path.join(self.root, "first"), self.cache)
+        run_and_capture(os.path.join(self.root, "second"), self.cache)
+        self.assertEqual(CountingValidator.runs, 1)
+
+    def test_changed_input_invalidates_only_dependent_validators(self):
+        directory = os.path.join(self.root, "first")
+        run_and_capture(directory, self.cache)
+        with open(os.path.join(directory, "help.md"), "a") as f:
+            f.write("\n")
+        hits = self.cache.hits
+        run_and_capture(directory, self.cache)
+        self.assertEqual(CountingValidator.runs, 2)
+        # TitleValidator only depends on the spec
+        self.assertEqual(self.cache.hits - hits, 1)
+
+    def test_parallel_run_uses_cache(self):
+        directory = os.path.join(self.root, "first")
+        _, sequential_report = run_and_capture(directory, self.cache)
+        _, parallel_report = run_and_capture(directory, self.cache, parallel=True, workers=2)
+        self.assertEqual(sequential_report, parallel_report)
+        self.assertEqual(self.cache.hits, 4)
+
+    def test_changed_helper_module_invalidates_results(self):
+        # Validators import shared helpers, e.g. the spec loader, whose changes must not replay stale results
+        package = os.path.join(self.root, "icon_validator")
+        shutil.copytree(cache.PACKAGE_DIRECTORY, package, ignore=shutil.ignore_patterns("__pycache__"))
+        directory = os.path.join(self.root, "first")
+        try:
+            with patch.object(cache, "PACKAGE_DIRECTORY", package):
+                cache._package_fingerprint.cache_clear()
+                run_and_capture(directory, self.cache)
+                with open(os.path.join(package, "styling.py"), "a") as f:
+                    f.write("# changed\n")
+                cache._file_digest.cache_clear()
+                cache._package_fingerprint.cache_clear()
+                run_and_capture(directory, self.cache)
+        finally:
+            cache._package_fingerprint.cache_clear()
+        self.assertEqual(CountingValidator.runs, 2)
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_no_cache_keeps_nothing_between_runs(self):
+        state = os.path.join(self.root, "state")
+        environment = {"ICON_VALIDATOR_CACHE_DIR": os.path.join(state, "results"),
+                       "ICON_VALIDATOR_HISTORY_FILE": os.path.join(state, "history.json"),
+                       "ICON_VALIDATOR_URL_CACHE_FILE": os.path.join(state, "urls.json"),
+                       "ICON_VALIDATOR_KEYWORD_SNAPSHOT_FILE": os.path.join(state, "keywords.json"),
+                       "ICON_VALIDATOR_VERSIONS_FILE": os.path.join(state, "versions.json"),
+                       "ICON_VALIDATOR_REMOTE_SPEC_DIR": os.path.join(state, "remote-specs"),
+                       "ICON_VALIDATOR_HASH_CACHE_FILE": os.path.join(state, "file-hashes.json")}
+        directory = os.path.join(self.root, "first")
+        with patch.dict(os.environ, environment), redirect_stdout(io.StringIO()):
+            cli.run(["--no-cache", "--profile", "offline", directory])
+            self.assertFalse(os.path.exists(state))
+            cli.run(["--profile", "offline", directory])
+            self.assertTrue(os.path.exists(state))
+
+    def test_no_cache_rejects_cache_only_modes(self):
+        with redirect_stdout(io.StringIO()), patch("sys.stderr", io.StringIO()):
+            with self.assertRaises(SystemExit):
+                cli.run(["--no-cache", "--url-cache-only", os.path.join(self.root, "first")])
@@ -0,0 +1,98 @@
+import http.client
+import io
+import json
+import os
+import pickle
+import socket
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+
+from icon_validator.cancellation import CancellationToken, cancellation_of, check_call, interrupt_connection
+from icon_validator.events import EventStream
+from icon_validator.exceptions import ValidationCancelled, ValidationException
+from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.timing import format_time, time_now
+from icon_validator.validate import validate
+
+
+class QuickFailureValidator(KomandPluginValidator):
+
+    def validate(self, spec):
+        raise ValidationException("Broken title.")
+
+
+class SlowSubprocessValidator(KomandPluginValidator):
+    io_bound = True
+
+    def validate(self, spec):
+        check_call(["sleep", "30"], cancellation_of(spec))
+
+
+class TestValidateCancellation(unittest.TestCase):
+
+    def test_cancel_kills_subprocess(self):
+        token = CancellationToken()
+        threading.Timer(0.1, token.cancel).start()
+        start = time_now()
+        with self.assertRaises(ValidationCancelled):
+            check_call(["sleep", "30"], token)
+        self.assertLess(format_time(start, time_now()), 5000)
+
+    def test_cancel_interrupts_pending_http_request(self):
+        # A server which accepts connections but never answers
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        token = CancellationToken()
+        connection = http.client.HTTPConnection("127.0.0.1", server.getsockname()[1], timeout=30)
+        threading.Timer(0.1, token.cancel).start()
+        start = time_now()
+        try:
+            with self.assertRaises(OSError):
+                with token.on_cancel(interrupt_connection(connection)):
+                    connection.request("HEAD", "/")
+                    connection.getresponse()
+        finally:
+            connection.close()
+            server.close()
+        self.assertTrue(token.cancelled)
+        self.assertLess(format_time(start, time_now()), 5000)
+
+    def test_fail_fast_cancels_in_flight_validators(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "events.ndjson")
+            start = time_now()
+            with redirect_stdout(io.StringIO()):
+                status = validate("plugin_examples/good_plugin", "plugin.spec.yaml", True, False,
+                                  [QuickFailureValidator(), SlowSubprocessValidator()], parallel=True,
+                                  events=EventStream(path=path))
+            with open(path) as f:
+                events = [json.loads(line) for line in f]
+        self.assertEqual(status, 1)
+        self.assertLess(format_time(start, time_now()), 10000)
+        finished = {event["validator"]: event["status"] for event in events if event["event"] == "finish"}
+        self.assertEqual(finished, {"QuickFailureValidator": "failed", "SlowSubprocessValidator": "cancelled"})
+
+    def test_fail_fast_stops_at_failure_declared_after_slow_validator(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "events.ndjson")
+            output = io.StringIO()
+            start = time_now()
+            with redirect_stdout(output):
+                status = validate("plugin_examples/good_plugin", "plugin.spec.yaml", True, False,
+                                  [SlowSubprocessValidator(), QuickFailureValidator()], parallel=True,
+                                  events=EventStream(path=path))
+            with open(path) as f:
+                events = [json.loads(line) for line in f]
+        self.assertEqual(status, 1)
+        self.assertLess(format_time(start, time_now()), 10000)
+        finished = {event["validator"]: event["status"] for event in events if event["event"] == "finish"}
+        self.assertEqual(finished, {"QuickFailureValidator": "failed", "SlowSubprocessValidator": "cancelled"})
+        self.assertIn("Broken title.", output.getvalue())
+
+    def test_tokens_are_not_cancelled_across_processes(self):
+        token = CancellationToken()
+        token.cancel()
+        self.assertFalse(pickle.loads(pickle.dumps(token)).cancelled)
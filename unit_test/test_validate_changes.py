@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from git import Repo
+
+from icon_validator.repository import NULL_SHA, changed_directories
+
+
+class TestValidateChanges(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        for name in ["plugins/good_plugin", "plugins/good_plugin_with_task"]:
+            shutil.copytree(f"plugin_examples/{os.path.basename(name)}", os.path.join(self.root, name))
+        shutil.copytree("workflow_examples/help_tests", os.path.join(self.root, "workflows/help_tests"))
+        self.repo = Repo.init(self.root)
+        with self.repo.config_writer() as config:
+            config.set_value("user", "name", "test")
+            config.set_value("user", "email", "test@example.com")
+        self.repo.git.add(A=True)
+        self.repo.git.commit(m="initial")
+        self.initial = self.repo.head.commit.hexsha
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def touch(self, path):
+        with open(os.path.join(self.root, path), "a") as f:
+            f.write("\n")
+
+    def test_changed_since_maps_files_to_directories(self):
+        self.touch("plugins/good_plugin/help.md")
+        self.touch("workflows/help_tests/new_file.txt")
+        self.touch("README.md")
+        self.assertCountEqual(changed_directories(self.root, ref="HEAD"),
+                              [os.path.join(os.path.realpath(self.root), "plugins/good_plugin"),
+                               os.path.join(os.path.realpath(self.root), "workflows/help_tests")])
+
+    def test_changed_since_is_scoped_to_path(self):
+        self.touch("plugins/good_plugin/help.md")
+        self.touch("workflows/help_tests/help.md")
+        self.assertEqual(changed_directories(os.path.join(self.root, "workflows"), ref="HEAD"),
+                         [os.path.join(os.path.realpath(self.root), "workflows/help_tests")])
+
+    def test_pre_push_uses_pushed_commit_range(self):
+        self.touch("plugins/good_plugin_with_task/help.md")
+        self.repo.git.commit("-am", "change")
+        self.touch("plugins/good_plugin/help.md")  # not committed, so not pushed
+        push_lines = [f"refs/heads/master {self.repo.head.commit.hexsha} refs/heads/master {self.initial}"]
+        self.assertEqual(changed_directories(self.root, push_lines=push_lines),
+                         [os.path.join(os.path.realpath(self.root), "plugins/good_plugin_with_task")])
+
+    def test_pre_push_ignores_deleted_branches(self):
+        push_lines = [f"(delete) {NULL_SHA} refs/heads/old {self.initial}"]
+        self.assertEqual(changed_directories(self.root, push_lines=push_lines), [])
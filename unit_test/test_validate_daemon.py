@@ -0,0 +1,115 @@
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from icon_validator import daemon
+
+
+class Counter:
+    # Class attribute state, like many validators keep
+    count = 0
+
+
+def counting_handler(argv):
+    Counter.count += 1
+    print(f"count={Counter.count} cwd={os.getcwd()} argv={argv} env={os.environ.get('DAEMON_TEST')}")
+    if "--fail" in argv:
+        raise SystemExit(3)
+    return 0
+
+
+class TestValidateDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, "daemon.sock")
+        self.pid = None
+
+    def tearDown(self):
+        if self.pid:
+            os.kill(self.pid, signal.SIGTERM)
+            os.waitpid(self.pid, 0)
+        shutil.rmtree(self.root)
+
+    def start_daemon(self):
+        self.pid = os.fork()
+        if self.pid == 0:
+            try:
+                with open(os.devnull, "w") as devnull:
+                    os.dup2(devnull.fileno(), 1)
+                    daemon.serve(self.path, handler=counting_handler)
+            finally:
+                os._exit(0)
+        for _ in range(100):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.path)
+                return
+            except OSError:
+                time.sleep(0.02)
+            finally:
+                probe.close()
+        self.fail("The daemon didn't start")
+
+    def run_remote(self, argv):
+        output_path = os.path.join(self.root, "output.txt")
+        with open(output_path, "w") as output:
+            status = daemon.run_remote(argv, self.path, fds=(0, output.fileno(), output.fileno()))
+        with open(output_path) as output:
+            return status, output.read()
+
+    def test_requests_run_in_client_context_with_fresh_state(self):
+        self.start_daemon()
+        os.environ["DAEMON_TEST"] = "yes"
+        try:
+            first = self.run_remote(["plugins/base64"])
+            second = self.run_remote(["--fail"])
+        finally:
+            del os.environ["DAEMON_TEST"]
+        self.assertEqual(first, (0, f"count=1 cwd={os.getcwd()} argv=['plugins/base64'] env=yes\n"))
+        self.assertEqual(second[0], 3)
+        self.assertIn("count=1", second[1])
+        self.assertEqual(Counter.count, 0)
+
+    def test_no_daemon_falls_back_to_local(self):
+        self.assertIsNone(daemon.run_remote(["plugins/base64"], self.path))
+        # Socket file left behind by a daemon which was killed
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()
+        self.assertIsNone(daemon.run_remote(["plugins/base64"], self.path))
+
+    def test_stale_socket_is_replaced(self):
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(self.path)
+        stale.close()
+        self.start_daemon()
+        self.assertEqual(self.run_remote([])[0], 0)
+
+    def test_opting_out_skips_daemon(self):
+        self.start_daemon()
+        self.assertIsNone(daemon.run_remote(["--no-daemon", "plugins/base64"], self.path))
+
+    def test_platforms_without_peer_credentials_rely_on_socket_permissions(self):
+        # Like macOS, where the daemon used to fail on the first connection
+        first, second = socket.socketpair(socket.AF_UNIX)
+        try:
+            with patch.object(daemon, "PEERCRED", None):
+                self.assertTrue(daemon._same_user(first))
+        finally:
+            first.close()
+            second.close()
+        daemon._listen(self.path).close()
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+    def test_platforms_without_unix_sockets_validate_locally(self):
+        # Like Windows
+        with patch.object(daemon, "SUPPORTED", False), patch("sys.stderr"):
+            self.assertIsNone(daemon.run_remote(["plugins/base64"], self.path))
+            self.assertEqual(daemon.serve(self.path), 1)
+        self.assertFalse(os.path.exists(self.path))
@@ -0,0 +1,80 @@
+import io
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from icon_validator.events import EventStream
+from icon_validator.exceptions import ValidationException
+from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.validate import validate
+
+from icon_validator.rules.plugin_validators.title_validator import TitleValidator
+from icon_validator.rules.plugin_validators.version_pin_validator import VersionPinValidator
+
+
+class LocatedFailureValidator(KomandPluginValidator):
+
+    def validate(self, spec):
+        raise ValidationException("Deliberate failure.", rule_id="deliberate", file="help.md", line=3)
+
+
+class UnlocatedFailureValidator(KomandPluginValidator):
+    io_bound = True
+
+    def validate(self, spec):
+        raise ValidationException("Another failure.")
+
+
+def run_with_events(directory, validators, **kwargs):
+    with tempfile.TemporaryDirectory() as root:
+        path = os.path.join(root, "events.ndjson")
+        with redirect_stdout(io.StringIO()):
+            result = validate(directory, "plugin.spec.yaml", False, True, validators,
+                              events=EventStream(path=path), **kwargs)
+        with open(path) as f:
+            return result, [json.loads(line) for line in f]
+
+
+class TestValidateEvents(unittest.TestCase):
+
+    def test_start_and_finish_events_for_every_validator(self):
+        validators = [TitleValidator(), LocatedFailureValidator(), UnlocatedFailureValidator()]
+        for parallel in (False, True):
+            result, events = run_with_events("plugin_examples/good_plugin", validators, parallel=parallel)
+            self.assertEqual(result, 1)
+            finished = {event["validator"]: event for event in events if event["event"] == "finish"}
+            started = [event["validator"] for event in events if event["event"] == "start"]
+            self.assertCountEqual(started, ["TitleValidator", "LocatedFailureValidator",
+                                            "UnlocatedFailureValidator"])
+            self.assertEqual(finished["TitleValidator"]["status"], "passed")
+            self.assertEqual(finished["LocatedFailureValidator"]["status"], "failed")
+            self.assertEqual(finished["LocatedFailureValidator"]["message"], "Deliberate failure.")
+            self.assertEqual(finished["LocatedFailureValidator"]["rule_id"], "deliberate")
+            self.assertEqual(finished["LocatedFailureValidator"]["file"], "help.md")
+            self.assertEqual(finished["LocatedFailureValidator"]["line"], 3)
+            # Without an explicit rule id, failures are attributed to the validator's class
+            self.assertEqual(finished["UnlocatedFailureValidator"]["rule_id"], "UnlocatedFailureValidator")
+            self.assertEqual(events[-1]["event"], "end")
+            self.assertEqual(events[-1]["status"], "failed")
+            self.assertTrue(all(event["directory"] == "plugin_examples/good_plugin" for event in events))
+
+    def test_version_pin_failure_points_at_requirement(self):
+        with tempfile.TemporaryDirectory() as root:
+            directory = os.path.join(root, "plugin")
+            shutil.copytree("plugin_examples/good_plugin", directory)
+            with open(os.path.join(directory, "requirements.txt"), "w") as requirements:
+                requirements.write("# List third-party dependencies here\nrequests==2.22.0\nlxml\n")
+            _, events = run_with_events(directory, [VersionPinValidator()])
+        finish = [event for event in events if event["event"] == "finish"][0]
+        self.assertEqual(finish["status"], "failed")
+        self.assertEqual(finish["file"], "requirements.txt")
+        self.assertEqual(finish["line"], 3)
+
+    def test_validation_exception_survives_pickling(self):
+        error = pickle.loads(pickle.dumps(ValidationException("Broken.", rule_id="rule", file="Dockerfile", line=2)))
+        self.assertEqual(str(error), "Broken.")
+        self.assertEqual((error.rule_id, error.file, error.line), ("rule", "Dockerfile", 2))
@@ -0,0 +1,107 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from icon_validator.extension_versions import ExtensionVersions
+from icon_validator.network import NetworkSettings
+from icon_validator.rules.plugin_validators.version_validator import VersionValidator
+from icon_validator.validate import validate
+
+PUBLISHED = {"active_directory_ldap": "5.3.1", "base64": "1.1.6", "rapid7_insightidr": "4.0.0"}
+
+
+class ExtensionsHandler(BaseHTTPRequestHandler):
+    """
+    Answers like the extensions API of the Extension Library, slowly
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+            self.server.in_flight += 1
+            self.server.most_in_flight = max(self.server.most_in_flight, self.server.in_flight)
+        time.sleep(0.1)
+        with self.server.lock:
+            self.server.in_flight -= 1
+        name = self.path.rsplit("/", 1)[-1]
+        if name in PUBLISHED:
+            body = json.dumps({"name": name, "version": PUBLISHED[name]}).encode()
+            self.send_response(200)
+        else:
+            body = b'{"message": "Not found"}'
+            self.send_response(404)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestValidateExtensionVersions(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, "versions.json")
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ExtensionsHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.requests = self.server.in_flight = self.server.most_in_flight = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/public/extensions"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.root)
+
+    def test_prefetch_looks_up_versions_concurrently_once(self):
+        versions = ExtensionVersions(self.path, url=self.url)
+        versions.prefetch(list(PUBLISHED) + ["unpublished", "base64"])
+        self.assertEqual(self.server.requests, 4)
+        self.assertGreater(self.server.most_in_flight, 1)
+        # Looked up versions come from memory in this run and from the file in the next one
+        self.assertEqual(versions.version("base64"), "1.1.6")
+        self.assertIsNone(ExtensionVersions(self.path, url=self.url).version("unpublished"))
+        self.assertEqual(self.server.requests, 4)
+
+    def test_expired_versions_are_looked_up_again(self):
+        ExtensionVersions(self.path, url=self.url).prefetch(["base64"])
+        self.assertEqual(ExtensionVersions(self.path, ttl=0, url=self.url).version("base64"), "1.1.6")
+        self.assertEqual(self.server.requests, 2)
+
+    def validate(self, network):
+        with redirect_stdout(io.StringIO()) as output:
+            status = validate("plugin_examples/version_validator", "plugin.spec.yaml", False, False,
+                              [VersionValidator()], network=network)
+        return status, output.getvalue()
+
+    def test_validator_compares_against_published_version(self):
+        network = NetworkSettings(extension_versions=ExtensionVersions(self.path, url=self.url))
+        status, _ = self.validate(network)
+        self.assertEqual(status, 0)
+        # Published under the version in plugin.spec.yaml
+        PUBLISHED["active_directory_ldap"], published = "3.2.7", PUBLISHED["active_directory_ldap"]
+        try:
+            status, output = self.validate(NetworkSettings(extension_versions=ExtensionVersions(self.path, ttl=0,
+                                                                                                url=self.url)))
+        finally:
+            PUBLISHED["active_directory_ldap"] = published
+        self.assertEqual(status, 1)
+        self.assertIn("modified without a version change", output)
+
+    def test_snapshot_only_never_looks_up(self):
+        network = NetworkSettings(extension_versions=ExtensionVersions(self.path, url=self.url),
+                                  version_snapshot_only=True)
+        status, output = self.validate(network)
+        self.assertEqual(status, 0)
+        self.assertIn("Skipping the version bump check", output)
+        self.assertEqual(self.server.requests, 0)
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from icon_validator import file_hashes
+from icon_validator.exceptions import ValidationException
+from icon_validator.file_hashes import FileHashCache, hash_files, md5_file
+from icon_validator.rules.plugin_validators.regeneration_validator import ChecksumHandler
+
+PLUGIN_NAME = "synthetic"
+ACTIONS = 400
+TRIGGERS = 50
+
+
+def write(path: str, contents: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(contents)
+
+
+def md5_of(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+
+def age(path: str):
+    # Files written just now are too fresh for the cache to trust their modification time
+    old = time.time() - 60
+    os.utime(path, (old, old))
+
+
+class TestValidateFileHashes(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.plugin = os.path.join(self.root, PLUGIN_NAME)
+        package = os.path.join(self.plugin, f"icon_{PLUGIN_NAME}")
+        write(os.path.join(self.plugin, "plugin.spec.yaml"), b"name: synthetic\nversion: 1.0.0\n")
+        write(os.path.join(self.plugin, "setup.py"), b"from setuptools import setup\n")
+        # Bigger than a chunk, so it is read in several
+        write(os.path.join(self.plugin, "bin", f"icon_{PLUGIN_NAME}"), os.urandom(3 * file_hashes.CHUNK_SIZE + 7))
+        schemas = {}
+        for kind, count in (("actions", ACTIONS), ("triggers", TRIGGERS)):
+            for i in range(count):
+                path = os.path.join(package, kind, f"{kind[:-1]}_{i}", "schema.py")
+                write(path, f"# {kind} {i}\n".encode() * 200)
+                schemas[f"{kind[:-1]}_{i}/schema.py"] = path
+        connection = os.path.join(package, "connection", "schema.py")
+        write(connection, b"# connection\n")
+        schemas["connection/schema.py"] = connection
+        # Dependencies installed into the plugin, whose schemas aren't the plugin's
+        write(os.path.join(self.plugin, "venv", "pyvenv.cfg"), b"home = /usr/bin\n")
+        write(os.path.join(self.plugin, "venv", "lib", "other", "actions", "x", "schema.py"), b"# other\n")
+        write(os.path.join(self.plugin, ".tox", "lib", "y", "schema.py"), b"# other\n")
+
+        checksum = {
+            "spec": md5_of(os.path.join(self.plugin, "plugin.spec.yaml")),
+            "manifest": md5_of(os.path.join(self.plugin, "bin", f"icon_{PLUGIN_NAME}")),
+            "setup": md5_of(os.path.join(self.plugin, "setup.py")),
+            "schemas": [{"identifier": identifier, "hash": md5_of(path)} for identifier, path in schemas.items()],
+        }
+        write(os.path.join(self.plugin, ".CHECKSUM"), json.dumps(checksum).encode())
+        for directory, _, files in os.walk(self.plugin):
+            for name in files:
+                age(os.path.join(directory, name))
+        self.schemas = schemas
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def run_handler(self, cache: FileHashCache = None):
+        ChecksumHandler(plugin_name=PLUGIN_NAME, plugin_directory=self.plugin, hash_cache=cache).run_from_validator()
+
+    def test_md5_file_matches_hashlib(self):
+        path = os.path.join(self.plugin, "bin", f"icon_{PLUGIN_NAME}")
+        self.assertEqual(md5_file(path), md5_of(path))
+
+    def test_hash_files_leaves_out_missing_files(self):
+        existing = self.schemas["connection/schema.py"]
+        self.assertEqual(hash_files([existing, os.path.join(self.root, "missing")]), {existing: md5_of(existing)})
+
+    def test_vendored_and_virtualenv_schemas_are_skipped(self):
+        self.run_handler()
+
+    def test_changed_schema_fails(self):
+        path = self.schemas["action_7/schema.py"]
+        with open(path, "ab") as f:
+            f.write(b"# changed\n")
+        with self.assertRaises(ValidationException):
+            self.run_handler()
+
+    def test_cache_is_invalidated_by_stat_changes(self):
+        cache = FileHashCache(os.path.join(self.root, "file-hashes.json"))
+        self.run_handler(cache)
+        path = self.schemas["action_7/schema.py"]
+        # Same size and modification time, different contents: a new inode tells them apart
+        stat = os.stat(path)
+        # Kept, so its inode can't be reused for the new file
+        os.rename(path, f"{path}.old")
+        write(path, open(self.schemas["action_8/schema.py"], "rb").read().replace(b"8", b"9"))
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        with self.assertRaises(ValidationException):
+            self.run_handler(FileHashCache(cache.path))
+
+    def test_recently_modified_files_are_not_cached(self):
+        cache = FileHashCache(os.path.join(self.root, "file-hashes.json"))
+        path = self.schemas["connection/schema.py"]
+        os.utime(path)
+        hash_files([path], cache)
+        self.assertEqual(cache.entries, {})
+
+    def test_benchmark_hundreds_of_actions(self):
+        # Cold, then with the hashes of the previous run: unchanged files are only stat'ed
+        cache_path = os.path.join(self.root, "file-hashes.json")
+        timings = {}
+        with patch.object(file_hashes, "md5_file", wraps=md5_file) as hashed:
+            start = time.perf_counter()
+            self.run_handler(FileHashCache(cache_path))
+            timings["cold"] = time.perf_counter() - start
+            self.assertEqual(hashed.call_count, ACTIONS + TRIGGERS + 4)
+
+            hashed.reset_mock()
+            start = time.perf_counter()
+            self.run_handler(FileHashCache(cache_path))
+            timings["cached"] = time.perf_counter() - start
+            self.assertEqual(hashed.call_count, 0)
+
+            # One changed schema is the only file read again
+            path = self.schemas["action_7/schema.py"]
+            with open(path, "ab") as f:
+                f.write(b"# changed\n")
+            age(path)
+            with self.assertRaises(ValidationException):
+                self.run_handler(FileHashCache(cache_path))
+            self.assertEqual(hashed.call_count, 1)
+        self.assertLess(timings["cached"], timings["cold"] * 2)
@@ -0,0 +1,119 @@
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import MagicMock, patch
+
+from icon_validator import locks
+from icon_validator.context import ValidationContext
+from icon_validator.exceptions import ValidationException
+from icon_validator.execution import ParallelRunner, ValidatorResult
+from icon_validator.history import RunHistory
+from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.validate import validate
+
+
+class SlowValidator(KomandPluginValidator):
+
+    def validate(self, spec):
+        time.sleep(0.05)
+
+
+class OtherSlowValidator(SlowValidator):
+    pass
+
+
+class BrokenValidator(KomandPluginValidator):
+
+    def validate(self, spec):
+        raise ValidationException("Always broken.")
+
+
+class StartOrderValidator(KomandPluginValidator):
+    """
+    Appends its name to a file when it starts, to see the order a worker picked validators up in
+    """
+    log = None
+
+    def validate(self, spec):
+        with open(self.log, "a") as f:
+            f.write(f"{self.name}\n")
+
+
+def result(name, wall_time, failed=False, cached=False):
+    result = ValidatorResult(name, error=ValidationException("Failed.") if failed else None, cached=cached)
+    result.wall_time = wall_time
+    return result
+
+
+class TestValidateHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, "history.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_saves_from_several_processes_are_merged(self):
+        first, second = RunHistory(self.path), RunHistory(self.path)
+        first.record([result("A", 10.0)])
+        second.record([result("B", 20.0), result("C", 0.0, cached=True)])
+        first.save()
+        second.save()
+        entries = RunHistory(self.path).entries
+        self.assertEqual(sorted(entries), ["A", "B"])
+        self.assertEqual(entries["B"]["ms"], 20.0)
+
+    def test_saves_without_file_locking(self):
+        # Platforms with neither fcntl nor msvcrt still save, without a lock
+        with patch.object(locks, "fcntl", None), patch.object(locks, "msvcrt", None):
+            history = RunHistory(self.path)
+            history.record([result("A", 10.0)])
+            history.save()
+        self.assertEqual(sorted(RunHistory(self.path).entries), ["A"])
+
+    def test_saves_lock_with_msvcrt_on_windows(self):
+        msvcrt = MagicMock(LK_LOCK=1, LK_UNLCK=0)
+        with patch.object(locks, "fcntl", None), patch.object(locks, "msvcrt", msvcrt):
+            history = RunHistory(self.path)
+            history.record([result("A", 10.0)])
+            history.save()
+        self.assertEqual([call.args[1:] for call in msvcrt.locking.call_args_list], [(1, 1), (0, 1)])
+        self.assertEqual(sorted(RunHistory(self.path).entries), ["A"])
+
+    def test_cheap_and_failure_prone_validators_come_first(self):
+        history = RunHistory(self.path)
+        history.record([result("Slow", 500.0), result("Cheap", 2.0), result("Flaky", 50.0, failed=True)])
+        validators = [KomandPluginValidator(name) for name in ["Slow", "Flaky", "Cheap", "New"]]
+        ordered = [v.name for v in history.fail_fast_order(validators)]
+        self.assertEqual(ordered, ["Flaky", "New", "Cheap", "Slow"])
+        self.assertEqual([v.name for v in history.longest_first(validators)], ["Slow", "Flaky", "New", "Cheap"])
+
+    def test_fail_fast_runs_previously_failing_validator_first(self):
+        history = RunHistory(self.path)
+        validators = [SlowValidator(), OtherSlowValidator(), BrokenValidator()]
+        for _ in range(2):
+            with redirect_stdout(io.StringIO()) as output:
+                status = validate("plugin_examples/good_plugin", "plugin.spec.yaml", True, False, validators,
+                                  history=history)
+            self.assertEqual(status, 1)
+        self.assertNotIn("Executing validator SlowValidator", output.getvalue())
+        self.assertIn("Executing validator BrokenValidator", output.getvalue())
+        self.assertEqual(RunHistory(self.path).entries["BrokenValidator"]["runs"], 2)
+
+    def test_parallel_runner_starts_longest_validators_first(self):
+        StartOrderValidator.log = os.path.join(self.root, "started.txt")
+        history = RunHistory(self.path)
+        history.record([result("Short", 1.0), result("Long", 900.0), result("Medium", 40.0)])
+        validators = [StartOrderValidator(name) for name in ["Short", "Medium", "Long"]]
+        spec = ValidationContext("plugin_examples/good_plugin")
+        with redirect_stdout(io.StringIO()):
+            results = list(ParallelRunner(workers=1).run(validators, spec, history=history))
+        # Results are still reported in declared order
+        self.assertEqual([r.name for r in results], ["Short", "Medium", "Long"])
+        with open(StartOrderValidator.log) as f:
+            self.assertEqual(f.read().split(), ["Long", "Medium", "Short"])
@@ -0,0 +1,133 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import urllib.parse
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from icon_validator.context import ValidationContext
+from icon_validator.keywords import KeywordSnapshot
+from icon_validator.network import NetworkSettings
+from icon_validator.rules.plugin_validators.unapproved_keywords_validator import UnapprovedKeywordsValidator
+from icon_validator.validate import validate
+
+# Pages of the stand-in tags API, by cursor
+PAGES = {
+    "": {"results": [{"type": "keyword", "name": "base64"}, {"type": "vendor", "name": "rapid7"}],
+         "pageInfo": {"hasNextPage": True, "endCursor": "2"}},
+    "2": {"results": [{"type": "keyword", "name": "encoder"}, {"type": "keyword", "name": "decoder"}],
+          "pageInfo": {"hasNextPage": False, "endCursor": None}},
+}
+ETAG = '"keywords-v1"'
+
+
+class TagsHandler(BaseHTTPRequestHandler):
+    """
+    Answers like the tags API of the Extension Library, including conditional requests on the first page
+    """
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests += 1
+        cursor = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query).get("after", [""])[0]
+        if not cursor and self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps(PAGES[cursor]).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if not cursor:
+            self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestValidateKeywords(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, "keywords.json")
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), TagsHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.requests = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v2/public/tags"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.root)
+
+    def validate(self, directory, network):
+        with redirect_stdout(io.StringIO()) as output:
+            status = validate(directory, "plugin.spec.yaml", False, False, [UnapprovedKeywordsValidator()],
+                              network=network)
+        self.assertEqual(status, 0)
+        return output.getvalue()
+
+    def test_keywords_are_downloaded_once_for_many_plugins(self):
+        network = NetworkSettings(keyword_snapshot=KeywordSnapshot(self.path, url=self.url))
+        self.assertNotIn("Unsupported keywords", self.validate("plugin_examples/good_plugin", network))
+        output = self.validate("plugin_examples/good_plugin_warning_keywords", network)
+        self.assertIn("Unsupported keywords found: utilities", output)
+        # A later run, e.g. another batch worker, reads the snapshot file
+        self.validate("plugin_examples/good_plugin", NetworkSettings(keyword_snapshot=KeywordSnapshot(self.path,
+                                                                                                      url=self.url)))
+        self.assertEqual(self.server.requests, len(PAGES))
+
+    def test_expired_snapshot_is_revalidated_with_etag(self):
+        KeywordSnapshot(self.path, url=self.url).approved_keywords()
+        with open(self.path) as f:
+            fetched = json.load(f)["fetched"]
+        time.sleep(0.01)
+        keywords = KeywordSnapshot(self.path, ttl=0, url=self.url).approved_keywords()
+        self.assertEqual(keywords, frozenset(["base64", "encoder", "decoder"]))
+        # Only the first page was asked for again, and the snapshot is good for another TTL
+        self.assertEqual(self.server.requests, len(PAGES) + 1)
+        with open(self.path) as f:
+            self.assertGreater(json.load(f)["fetched"], fetched)
+
+    def test_offline_uses_stale_snapshot(self):
+        KeywordSnapshot(self.path, url=self.url).approved_keywords()
+        requests = self.server.requests
+        network = NetworkSettings(keyword_snapshot=KeywordSnapshot(self.path, ttl=0, url=self.url),
+                                  keyword_snapshot_only=True)
+        self.assertIn("Unsupported keywords found: utilities",
+                      self.validate("plugin_examples/good_plugin_warning_keywords", network))
+        self.assertEqual(self.server.requests, requests)
+
+    def test_offline_without_snapshot_skips_check(self):
+        network = NetworkSettings(keyword_snapshot=KeywordSnapshot(self.path, url=self.url),
+                                  keyword_snapshot_only=True)
+        self.assertIn("Skipping the keyword check", self.validate("plugin_examples/good_plugin", network))
+        self.assertEqual(self.server.requests, 0)
+
+    def test_refresh_failure_is_reported_by_the_validator(self):
+        KeywordSnapshot(self.path, url=self.url).approved_keywords()
+        self.server.shutdown()
+        self.server.server_close()
+        network = NetworkSettings(keyword_snapshot=KeywordSnapshot(self.path, ttl=0, url=self.url))
+        context = ValidationContext("plugin_examples/good_plugin")
+        context.network = network
+        # Fetches run on prefetch threads, where printing would land in another validator's output
+        with redirect_stdout(io.StringIO()) as output:
+            keywords, warning = UnapprovedKeywordsValidator().fetch(context)
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(keywords, frozenset(["base64", "encoder", "decoder"]))
+        self.assertIn("Couldn't refresh the approved keywords", warning)
+
+        output = self.validate("plugin_examples/good_plugin", network)
+        self.assertIn("Couldn't refresh the approved keywords", output)
+        self.assertLess(output.index("Executing validator UnapprovedKeywordsValidator"),
+                        output.index("Couldn't refresh the approved keywords"))
@@ -0,0 +1,98 @@
+import io
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+
+from icon_validator.cancellation import cancellation_of
+from icon_validator.exceptions import ValidationException
+from icon_validator.prefetch import prefetcher_of
+from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.validate import validate
+
+
+class LocalValidator(KomandPluginValidator):
+    """
+    Stands for a CPU bound validator reading the plugin's files
+    """
+
+    def __init__(self, seconds: float = 0.3, fails: bool = False):
+        super().__init__()
+        self.seconds = seconds
+        self.fails = fails
+
+    def validate(self, spec):
+        time.sleep(self.seconds)
+        if self.fails:
+            raise ValidationException("Local check failed")
+
+
+class RemoteValidator(KomandPluginValidator):
+    """
+    Stands for a validator waiting on a remote service
+    """
+    io_bound = True
+
+    def __init__(self, seconds: float = 0.3, error: Exception = None):
+        super().__init__()
+        self.seconds = seconds
+        self.error = error
+        self.fetches = 0
+        self.fetch_cancelled = threading.Event()
+        self.received = None
+
+    def fetch(self, spec):
+        self.fetches += 1
+        token = cancellation_of(spec)
+        with token.on_cancel(self.fetch_cancelled.set):
+            self.fetch_cancelled.wait(self.seconds)
+        token.raise_if_cancelled()
+        if self.error:
+            raise self.error
+        return "published"
+
+    def validate(self, spec):
+        self.received = prefetcher_of(spec).result(self, spec)
+
+
+class TestValidatePrefetch(unittest.TestCase):
+
+    def validate(self, validators, **kwargs) -> (int, float):
+        start = time.monotonic()
+        with redirect_stdout(io.StringIO()):
+            status = validate("plugin_examples/good_plugin", "plugin.spec.yaml", validators=validators, **kwargs)
+        return status, time.monotonic() - start
+
+    def test_fetch_overlaps_with_local_validators(self):
+        remote = RemoteValidator()
+        status, elapsed = self.validate([LocalValidator(), remote])
+        self.assertEqual(status, 0)
+        self.assertLess(elapsed, 0.55)
+        self.assertEqual((remote.received, remote.fetches), ("published", 1))
+
+    def test_fetch_waits_for_its_turn_without_prefetch(self):
+        remote = RemoteValidator()
+        status, elapsed = self.validate([LocalValidator(), remote], prefetch=False)
+        self.assertEqual(status, 0)
+        self.assertGreaterEqual(elapsed, 0.6)
+        self.assertEqual((remote.received, remote.fetches), ("published", 1))
+
+    def test_fetch_runs_once_in_parallel_runs(self):
+        remote = RemoteValidator()
+        status, _ = self.validate([LocalValidator(), remote], parallel=True)
+        self.assertEqual(status, 0)
+        self.assertEqual(remote.fetches, 1)
+
+    def test_fetch_errors_fail_their_validator(self):
+        remote = RemoteValidator(seconds=0, error=ValidationException("Remote check failed"))
+        status, _ = self.validate([LocalValidator(seconds=0), remote])
+        self.assertEqual(status, 1)
+        self.assertEqual(remote.fetches, 1)
+
+    def test_fail_fast_cancels_fetches(self):
+        remote = RemoteValidator(seconds=5)
+        status, elapsed = self.validate([LocalValidator(seconds=0.1, fails=True), remote], fail_fast=True)
+        self.assertEqual(status, 1)
+        self.assertTrue(remote.fetch_cancelled.wait(1))
+        self.assertLess(elapsed, 1)
+        self.assertIsNone(remote.received)
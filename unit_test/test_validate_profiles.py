@@ -0,0 +1,67 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from icon_validator import rules
+from icon_validator.execution import ValidatorResult
+from icon_validator.history import RunHistory
+from icon_validator.profiles import ValidatorSelection
+from icon_validator.rules.validator import COST_CLASSES, DOCKER, NETWORK, PURE_SPEC, SPEC, KomandPluginValidator
+from icon_validator.validate import validate
+
+
+class NetworkValidator(KomandPluginValidator):
+    cost_class = NETWORK
+
+
+class SpecValidator(KomandPluginValidator):
+    cost_class = PURE_SPEC
+
+
+class TestValidateProfiles(unittest.TestCase):
+
+    def test_every_validator_has_a_cost_class(self):
+        for validator in rules.VALIDATORS + rules.JENKINS_VALIDATORS + rules.WORKFLOW_VALIDATORS:
+            self.assertIn(validator.cost_class, COST_CLASSES, validator.name)
+
+    def test_fast_profile_only_reads_spec_and_help(self):
+        selected, skipped = ValidatorSelection("fast").select(rules.VALIDATORS + rules.JENKINS_VALIDATORS)
+        self.assertIn("HelpValidator", [v.name for v in selected])
+        self.assertIn("FilesValidator", [v.name for v in skipped])
+        for validator in selected:
+            self.assertTrue(set(validator.inputs) <= {SPEC, "help.md"}, validator.name)
+
+    def test_offline_profile_leaves_out_network_and_docker(self):
+        selected, skipped = ValidatorSelection("offline").select(rules.VALIDATORS + rules.JENKINS_VALIDATORS)
+        self.assertFalse([v.name for v in selected if v.cost_class in (NETWORK, DOCKER)])
+        self.assertIn("URLValidator", [v.name for v in skipped])
+        self.assertIn("DockerValidator", [v.name for v in skipped])
+
+    def test_budget_keeps_cheapest_validators_in_declared_order(self):
+        root = tempfile.mkdtemp()
+        try:
+            history = RunHistory(os.path.join(root, "history.json"))
+            results = [ValidatorResult(name) for name in ["A", "B", "C"]]
+            for result, wall_time in zip(results, [50.0, 10.0, 30.0]):
+                result.wall_time = wall_time
+            history.record(results)
+            validators = [SpecValidator(name) for name in ["A", "B", "C", "D"]]
+            selected, skipped = ValidatorSelection(budget_ms=45).select(validators, history)
+        finally:
+            shutil.rmtree(root)
+        # D is unknown to the history and estimated from its cost class
+        self.assertEqual([v.name for v in selected], ["B", "C", "D"])
+        self.assertEqual([v.name for v in skipped], ["A"])
+
+    def test_validate_skips_validators_outside_profile(self):
+        with redirect_stdout(io.StringIO()) as output:
+            status = validate("plugin_examples/good_plugin", "plugin.spec.yaml",
+                              validators=[SpecValidator(), NetworkValidator()],
+                              selection=ValidatorSelection("fast"))
+        self.assertEqual(status, 0)
+        self.assertIn("Executing validator SpecValidator", output.getvalue())
+        self.assertNotIn("Executing validator NetworkValidator", output.getvalue())
+        self.assertIn("Skipping 1 validators outside the fast profile: NetworkValidator", output.getvalue())
@@ -0,0 +1,126 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import yaml
+from git import Repo
+
+from icon_validator.context import ValidationContext
+from icon_validator.exceptions import ValidationException
+from icon_validator.network import NetworkSettings
+from icon_validator.remote_spec import RemoteSpecCache, _parse_spec_blob, load_released_specs, spec_blobs
+from icon_validator.repository import open_repo
+from icon_validator.rules.plugin_validators.version_bump_validator import VersionBumpValidator
+
+PLUGIN_NAME = "active_directory_ldap"
+
+
+class TestValidateReleases(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.repository = os.path.join(self.root, "repository")
+        self.plugin = os.path.join(self.repository, "plugins", PLUGIN_NAME)
+        shutil.copytree("plugin_examples/version_validator", self.plugin)
+        self.repo = Repo.init(self.repository)
+        with self.repo.config_writer() as config:
+            config.set_value("user", "name", "test")
+            config.set_value("user", "email", "test@example.com")
+        self.repo.git.add(A=True)
+        self.repo.git.commit(m="3.2.7")
+        with open(os.path.join(self.plugin, "plugin.spec.yaml")) as f:
+            self.first = yaml.safe_load(f)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def write_spec(self, spec: dict):
+        with open(os.path.join(self.plugin, "plugin.spec.yaml"), "w") as f:
+            yaml.safe_dump(spec, f)
+
+    def release(self, spec: dict):
+        self.write_spec(spec)
+        self.repo.git.commit("-am", spec["version"])
+        # Stands for the remote branch plugins are merged into
+        self.repo.git.update_ref("refs/remotes/origin/master", "HEAD")
+
+    def spec(self, version: str, without_delete: bool = False) -> dict:
+        spec = yaml.safe_load(yaml.safe_dump(self.first))
+        spec["version"] = version
+        if without_delete:
+            del spec["actions"]["delete"]
+        return spec
+
+    def test_each_version_is_returned_once_newest_first(self):
+        self.release(self.spec("3.3.0"))
+        patched = self.spec("3.3.0")
+        patched["description"] = "Patched before the release"
+        self.release(patched)
+        self.release(self.spec("3.4.0"))
+
+        specs = load_released_specs(self.repository, PLUGIN_NAME)
+        self.assertEqual([spec["version"] for spec in specs], ["3.4.0", "3.3.0", "3.2.7"])
+        self.assertEqual(specs[1]["description"], "Patched before the release")
+        self.assertEqual([spec["version"] for spec in load_released_specs(self.repository, PLUGIN_NAME, last=2)],
+                         ["3.4.0", "3.3.0"])
+
+    def test_last_releases_are_counted_before_the_base_ref(self):
+        self.release(self.spec("3.3.0"))
+        self.release(self.spec("3.4.0"))
+        context = ValidationContext(self.plugin)
+        context.network = NetworkSettings(releases=1)
+        # The release on the base ref is compared against anyway, one more is checked on top of it
+        self.assertEqual([spec["version"] for spec in VersionBumpValidator.get_released_specs(context)],
+                         ["3.4.0", "3.3.0"])
+
+    def test_branches_merged_in_are_not_releases(self):
+        self.repo.git.checkout("-b", "feature")
+        self.release(self.spec("3.2.8"))
+        self.release(self.spec("3.3.0"))
+        self.repo.git.checkout("master")
+        self.repo.git.merge("--no-ff", "feature", m="Merge feature")
+        self.repo.git.update_ref("refs/remotes/origin/master", "HEAD")
+
+        specs = load_released_specs(self.repository, PLUGIN_NAME)
+        self.assertEqual([spec["version"] for spec in specs], ["3.3.0", "3.2.7"])
+
+    def test_identical_specs_are_parsed_once(self):
+        self.release(self.spec("3.3.0"))
+        # Back to the spec of the first release, the same blob again
+        self.repo.git.revert("--no-edit", "HEAD")
+        repo = open_repo(self.repository)
+        blobs = spec_blobs(repo, self.repo.head.commit.hexsha, PLUGIN_NAME)
+        self.assertEqual(len(blobs), 3)
+        self.assertEqual(blobs[0][1], blobs[2][1])
+
+        misses = _parse_spec_blob.cache_info().misses
+        load_released_specs(self.repository, PLUGIN_NAME)
+        self.assertEqual(_parse_spec_blob.cache_info().misses - misses, 2)
+
+    def test_parsed_specs_are_cached_by_blob(self):
+        self.release(self.spec("3.3.0"))
+        cache = RemoteSpecCache(os.path.join(self.root, "remote-specs"))
+        load_released_specs(self.repository, PLUGIN_NAME, cache=cache)
+        _, blob = spec_blobs(open_repo(self.repository), self.repo.head.commit.hexsha, PLUGIN_NAME)[0]
+        self.assertEqual(cache.lookup(blob, PLUGIN_NAME)["version"], "3.3.0")
+
+    def test_breaking_change_since_an_older_release_fails(self):
+        # The action was removed without a major version increment once already
+        self.release(self.spec("3.3.0", without_delete=True))
+        local = self.spec("3.4.0", without_delete=True)
+        local["actions"]["new_action"] = {"title": "New Action", "description": "Added"}
+        remote = load_released_specs(self.repository, PLUGIN_NAME, last=1)
+        self.assertEqual(remote[0]["version"], "3.3.0")
+
+        validator = VersionBumpValidator()
+        validator.validate_bump(remote[0], local)
+        validator.validate_releases(remote[1:], local)
+        with self.assertRaisesRegex(ValidationException, "(?s)Compared to release 3.2.7, .*Action delete removed"):
+            validator.validate_releases(load_released_specs(self.repository, PLUGIN_NAME)[1:], local)
+
+    def test_releases_of_an_earlier_major_version_pass(self):
+        self.release(self.spec("4.0.0", without_delete=True))
+        local = self.spec("4.1.0", without_delete=True)
+        local["actions"]["new_action"] = {"title": "New Action", "description": "Added"}
+        VersionBumpValidator().validate_releases(load_released_specs(self.repository, PLUGIN_NAME), local)
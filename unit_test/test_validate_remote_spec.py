@@ -0,0 +1,77 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+import yaml
+from git import Repo
+
+from icon_validator.exceptions import ValidationException
+from icon_validator.remote_spec import RemoteSpecCache, load_remote_spec
+from icon_validator.repository import open_repo, resolve_ref
+
+PLUGIN_NAME = "active_directory_ldap"
+
+
+class TestValidateRemoteSpec(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.repository = os.path.join(self.root, "repository")
+        self.plugin = os.path.join(self.repository, "plugins", PLUGIN_NAME)
+        shutil.copytree("plugin_examples/version_validator", self.plugin)
+        self.repo = Repo.init(self.repository)
+        with self.repo.config_writer() as config:
+            config.set_value("user", "name", "test")
+            config.set_value("user", "email", "test@example.com")
+        self.repo.git.add(A=True)
+        self.repo.git.commit(m="initial")
+        # Stands for the remote branch plugins are merged into
+        self.repo.git.update_ref("refs/remotes/origin/master", "HEAD")
+        self.cache = RemoteSpecCache(os.path.join(self.root, "remote-specs"))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def commit_version(self, version: str) -> str:
+        path = os.path.join(self.plugin, "plugin.spec.yaml")
+        with open(path) as f:
+            text = f.read()
+        with open(path, "w") as f:
+            f.write(text.replace("version: 3.2.7", f"version: {version}"))
+        self.repo.git.commit("-am", f"Version {version}")
+        return self.repo.head.commit.hexsha
+
+    def test_spec_is_read_from_base_ref(self):
+        with open(os.path.join(self.plugin, "plugin.spec.yaml")) as f:
+            expected = yaml.safe_load(f)
+        self.commit_version("3.3.0")
+        self.assertEqual(load_remote_spec(self.repository, PLUGIN_NAME), expected)
+        self.assertEqual(load_remote_spec(self.repository, PLUGIN_NAME, "master")["version"], "3.3.0")
+
+    def test_cached_spec_skips_git(self):
+        commit = self.repo.head.commit.hexsha
+        self.assertEqual(load_remote_spec(self.repository, PLUGIN_NAME, cache=self.cache)["version"], "3.2.7")
+        path = self.cache._path(commit, PLUGIN_NAME)
+        with open(path, "w") as f:
+            json.dump({"version": "from the cache"}, f)
+        self.assertEqual(load_remote_spec(self.repository, PLUGIN_NAME, cache=self.cache)["version"],
+                         "from the cache")
+
+    def test_resolved_ref_follows_moves(self):
+        repo = open_repo(self.repository)
+        initial = resolve_ref(repo, "origin/master")
+        self.assertEqual(initial, self.repo.head.commit.hexsha)
+        moved = self.commit_version("3.3.0")
+        self.repo.git.update_ref("refs/remotes/origin/master", moved)
+        self.assertEqual(resolve_ref(repo, "origin/master"), moved)
+        self.assertEqual(load_remote_spec(self.repository, PLUGIN_NAME, cache=self.cache)["version"], "3.3.0")
+
+    def test_missing_ref_or_plugin(self):
+        with self.assertRaisesRegex(ValidationException, "Remote origin/main not found"):
+            load_remote_spec(self.repository, PLUGIN_NAME, "origin/main")
+        with self.assertRaisesRegex(ValidationException, "plugin.spec.yaml not found in remote repo"):
+            load_remote_spec(self.repository, "unknown_plugin")
+        with self.assertRaisesRegex(ValidationException, "Incorrect directory passed"):
+            load_remote_spec(self.root, PLUGIN_NAME)
@@ -0,0 +1,83 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from icon_validator.validate import validate
+from icon_validator.exceptions import ValidationException
+from icon_validator.rules.validator import KomandPluginValidator
+
+# Import plugin validators to pass to tests
+from icon_validator.rules.plugin_validators.help_validator import HelpValidator
+from icon_validator.rules.plugin_validators.title_validator import TitleValidator
+from icon_validator.rules.plugin_validators.profanity_validator import ProfanityValidator
+from icon_validator.rules.plugin_validators.acronym_validator import AcronymValidator
+from icon_validator.rules.plugin_validators.changelog_validator import ChangelogValidator
+
+
+class PrintingIOValidator(KomandPluginValidator):
+    io_bound = True
+
+    def validate(self, spec):
+        print(f"checked {spec.spec_dictionary()['name']} over the network")
+
+
+class FailingValidator(KomandPluginValidator):
+
+    def validate(self, spec):
+        print("about to fail")
+        raise ValidationException("Deliberate failure.")
+
+
+def run_and_capture(*args, **kwargs):
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        result = validate(*args, **kwargs)
+    # Drop the elapsed time line, which differs between runs
+    report = buffer.getvalue().split("\n----\n")[0]
+    return result, report
+
+
+class TestValidateRunner(unittest.TestCase):
+
+    def test_parallel_report_matches_sequential(self):
+        directory_to_test = "plugin_examples/good_plugin"
+        file_to_test = "plugin.spec.yaml"
+        validators = [HelpValidator(), PrintingIOValidator(), TitleValidator(), ProfanityValidator(),
+                      FailingValidator(), AcronymValidator(), ChangelogValidator()]
+        sequential_result, sequential_report = run_and_capture(directory_to_test, file_to_test, False, True,
+                                                               validators)
+        parallel_result, parallel_report = run_and_capture(directory_to_test, file_to_test, False, True,
+                                                           validators, parallel=True, workers=2)
+        self.assertEqual(sequential_result, 1)
+        self.assertEqual(parallel_result, 1)
+        self.assertEqual(sequential_report, parallel_report)
+        self.assertIn("checked base64 over the network", parallel_report)
+
+    def test_parallel_fail_fast_stops_at_first_failure(self):
+        directory_to_test = "plugin_examples/good_plugin"
+        file_to_test = "plugin.spec.yaml"
+        validators = [TitleValidator(), FailingValidator(), PrintingIOValidator()]
+        result, report = run_and_capture(directory_to_test, file_to_test, True, True, validators, parallel=True)
+        self.assertEqual(result, 1)
+        self.assertIn("about to fail", report)
+        self.assertNotIn("PrintingIOValidator", report)
+
+    def test_timings_are_recorded_per_validator(self):
+        directory_to_test = "plugin_examples/good_plugin"
+        file_to_test = "plugin.spec.yaml"
+        validators = [TitleValidator(), PrintingIOValidator(), FailingValidator()]
+        for parallel in (False, True):
+            timings = []
+            buffer = io.StringIO()
+            with redirect_stdout(buffer):
+                validate(directory_to_test, file_to_test, False, True, validators, parallel=parallel,
+                         timings=timings)
+            self.assertIn("Validator timings (slowest first)", buffer.getvalue())
+            self.assertEqual(len(timings), 1)
+            self.assertEqual(timings[0]["directory"], directory_to_test)
+            self.assertEqual([v["name"] for v in timings[0]["validators"]],
+                             ["TitleValidator", "PrintingIOValidator", "FailingValidator"])
+            self.assertEqual([v["passed"] for v in timings[0]["validators"]], [True, True, False])
+            for timing in timings[0]["validators"]:
+                self.assertGreater(timing["wall_ms"], 0)
+                self.assertGreaterEqual(timing["cpu_ms"], 0)
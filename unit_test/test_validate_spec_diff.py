@@ -0,0 +1,88 @@
+import copy
+import unittest
+
+import yaml
+
+from icon_validator.exceptions import ValidationException
+from icon_validator.rules.plugin_validators.version_bump_validator import VersionBumpValidator
+from icon_validator.spec_diff import MAJOR, MINOR, PATCH, diff_specs
+
+
+def load_spec(path: str) -> dict:
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+class TestValidateSpecDiff(unittest.TestCase):
+
+    def setUp(self):
+        self.remote = load_spec("plugin_examples/plugin_major_version_bump_all/plugin.spec.remote.yaml")
+        self.local = copy.deepcopy(self.remote)
+        self.action = next(iter(self.local["actions"]))
+
+    def bumps(self) -> [tuple]:
+        return [(change.bump, change.path) for change in diff_specs(self.remote, self.local).changes]
+
+    def test_unchanged_spec_has_no_changes(self):
+        diff = diff_specs(self.remote, self.local)
+        self.assertFalse(diff)
+        self.assertIsNone(diff.required_bump)
+
+    def test_changes_are_classified(self):
+        action = self.local["actions"][self.action]
+        action["title"] = "Renamed"
+        action["description"] = "Reworded"
+        action.setdefault("input", {})["new_required"] = {"type": "string", "title": "New", "required": True}
+        action["input"]["new_optional"] = {"type": "string", "title": "New", "required": False}
+        self.local["actions"]["new_action"] = {"title": "New Action"}
+        self.local["tasks"] = {"new_task": {"title": "New Task"}}
+
+        self.assertCountEqual(self.bumps(), [
+            (MAJOR, ("actions", self.action, "title")),
+            (PATCH, ("actions", self.action, "description")),
+            (MAJOR, ("actions", self.action, "input", "new_required")),
+            (MINOR, ("actions", self.action, "input", "new_optional")),
+            (MINOR, ("actions", "new_action")),
+            (MINOR, ("tasks", "new_task")),
+        ])
+        self.assertEqual(diff_specs(self.remote, self.local).required_bump, MAJOR)
+
+    def test_removals_need_a_major_increment(self):
+        removed = self.local["actions"].pop(self.action)
+        self.local["actions"]["renamed"] = removed
+        self.local.pop("connection", None)
+        diff = diff_specs(self.remote, self.local)
+        self.assertCountEqual([change.message for change in diff.of(MAJOR)],
+                              [f"Action {self.action} removed", "Connection removed"])
+        self.assertEqual([change.path for change in diff.of(MINOR)], [("actions", "renamed")])
+
+    def test_every_change_is_reported_at_once(self):
+        self.local["actions"][self.action]["title"] = "Renamed"
+        self.local["actions"]["new_action"] = {"title": "New Action"}
+        with self.assertRaises(ValidationException) as context:
+            self.validate(self.remote, self.local)
+        message = str(context.exception)
+        self.assertIn("Please change the plugin version to 6.0.0", message)
+        self.assertIn(f"Action {self.action} title changed", message)
+        self.assertIn("Action new_action added", message)
+
+    def test_minor_increment_covers_additions(self):
+        self.local["actions"]["new_action"] = {"title": "New Action"}
+        self.local["version"] = "5.0.6"
+        with self.assertRaisesRegex(ValidationException, "Please change the plugin version to 5.1.0"):
+            self.validate(self.remote, self.local)
+        self.local["version"] = "5.1.0"
+        self.validate(self.remote, self.local)
+
+    def test_major_changes_are_reported_before_minor_version_format(self):
+        self.local["actions"][self.action]["title"] = "Renamed"
+        self.local["version"] = "5.1.1"
+        with self.assertRaisesRegex(ValidationException, "Please change the plugin version to 6.0.0"):
+            self.validate(self.remote, self.local)
+        self.local["actions"][self.action]["title"] = self.remote["actions"][self.action]["title"]
+        with self.assertRaisesRegex(ValidationException, "Minor version increment should set patch version to 0"):
+            self.validate(self.remote, self.local)
+
+    @staticmethod
+    def validate(remote: dict, local: dict):
+        VersionBumpValidator().validate_bump(remote, local)
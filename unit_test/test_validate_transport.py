@@ -0,0 +1,115 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stdout
+from http.server import ThreadingHTTPServer
+
+from icon_validator.extension_versions import EXTENSIONS_URL, fetch_extension_version
+from icon_validator.keywords import TAGS_URL, fetch_approved_keywords
+from icon_validator.network import NetworkSettings
+from icon_validator.rules.plugin_validators.unapproved_keywords_validator import UnapprovedKeywordsValidator
+from icon_validator.rules.plugin_validators.version_validator import VersionValidator
+from icon_validator.stand_in import StandInServer, StandInTransport
+from icon_validator.transport import Cassette, RecordingTransport, ReplayingTransport, Response
+from icon_validator.url_checker import URLChecker
+from icon_validator.validate import validate
+from test_validate_extension_versions import ExtensionsHandler
+from test_validate_keywords import TagsHandler
+
+
+def serve(handler) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = server.in_flight = server.most_in_flight = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class TestValidateTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, "cassette.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_recorded_responses_are_replayed_without_network(self):
+        tags, extensions = serve(TagsHandler), serve(ExtensionsHandler)
+        tags_url = f"http://127.0.0.1:{tags.server_address[1]}/v2/public/tags"
+        extensions_url = f"http://127.0.0.1:{extensions.server_address[1]}/v1/public/extensions"
+        recording = RecordingTransport(Cassette(self.path))
+        try:
+            recorded = fetch_approved_keywords(tags_url, transport=recording)
+            version = fetch_extension_version("base64", extensions_url, transport=recording)
+            unpublished = fetch_extension_version("unpublished", extensions_url, transport=recording)
+        finally:
+            for server in (tags, extensions):
+                server.shutdown()
+                server.server_close()
+
+        replaying = ReplayingTransport(Cassette(self.path))
+        self.assertEqual(fetch_approved_keywords(tags_url, transport=replaying), recorded)
+        self.assertEqual(recorded[0], ["base64", "encoder", "decoder"])
+        self.assertEqual(fetch_extension_version("base64", extensions_url, transport=replaying), version)
+        self.assertEqual(version, "1.1.6")
+        self.assertIsNone(fetch_extension_version("unpublished", extensions_url, transport=replaying))
+        self.assertIsNone(unpublished)
+
+    def test_unrecorded_requests_fail_like_unreachable_hosts(self):
+        with URLChecker(transport=ReplayingTransport(Cassette(self.path))) as checker:
+            self.assertEqual(checker.check(["https://example.com/docs"]), {"https://example.com/docs": None})
+        with self.assertRaises(OSError):
+            fetch_approved_keywords(transport=ReplayingTransport(Cassette(self.path)))
+
+    def record_plugin_responses(self) -> Cassette:
+        cassette = Cassette(self.path)
+        cassette.record("GET", f"{TAGS_URL}?first=1000&", None, Response(200, body=(
+            b'{"results": [{"type": "keyword", "name": "ldap"}, {"type": "keyword", "name": "microsoft"}], '
+            b'"pageInfo": {"hasNextPage": false, "endCursor": null}}')))
+        cassette.record("GET", f"{EXTENSIONS_URL}/active_directory_ldap", None,
+                        Response(200, {"Content-Type": "application/json"}, b'{"version": "3.2.7"}'))
+        return cassette
+
+    def validate(self, transport) -> (int, str):
+        with redirect_stdout(io.StringIO()) as output:
+            status = validate("plugin_examples/version_validator", "plugin.spec.yaml", False, False,
+                              [UnapprovedKeywordsValidator(), VersionValidator()],
+                              network=NetworkSettings(transport=transport))
+        return status, output.getvalue()
+
+    def test_validators_replay_cassette(self):
+        self.record_plugin_responses()
+        status, output = self.validate(ReplayingTransport(Cassette(self.path)))
+        self.assertEqual(status, 1)
+        self.assertIn("Unsupported keywords found: active directory", output)
+        self.assertIn("modified without a version change", output)
+
+    def test_validators_replay_cassette_from_stand_in_server(self):
+        with StandInServer(self.record_plugin_responses()) as server:
+            status, output = self.validate(StandInTransport(server.address))
+        self.assertEqual(status, 1)
+        self.assertIn("Unsupported keywords found: active directory", output)
+        self.assertIn("modified without a version change", output)
+
+    def test_replay_latency_shows_concurrency(self):
+        cassette = Cassette(self.path)
+        urls = [f"https://docs-{i}.example.com/" for i in range(8)] + [f"https://example.com/{i}" for i in range(8)]
+        for url in urls:
+            cassette.record("HEAD", url, None, Response(200))
+        for transport in (ReplayingTransport(cassette, latency=0.1), None):
+            with StandInServer(cassette, latency=0.1) as server:
+                with URLChecker(workers=16, connections_per_host=4,
+                                transport=transport or StandInTransport(server.address)) as checker:
+                    start = time.monotonic()
+                    statuses = checker.check(urls)
+                    elapsed = time.monotonic() - start
+            self.assertEqual(set(statuses.values()), {200})
+            # 8 hosts checked at once, and the 8 URLs of example.com four at a time
+            self.assertGreaterEqual(elapsed, 0.2)
+            self.assertLess(elapsed, 0.6)
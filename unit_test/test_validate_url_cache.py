@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import ThreadingHTTPServer
+
+from icon_validator.network import NetworkSettings
+from icon_validator.rules.plugin_validators.url_validator import URLValidator
+from icon_validator.url_cache import URLStatusCache, normalize_url
+from icon_validator.url_checker import URLChecker
+from test_validate_urls import StandInHandler
+
+
+class CountingHandler(StandInHandler):
+
+    def respond(self, body: bool):
+        with self.server.lock:
+            self.server.requests += 1
+        super().respond(body)
+
+
+class TestValidateURLCache(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, "urls.json")
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), CountingHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.connections = self.server.in_flight = self.server.most_in_flight = self.server.requests = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.root)
+
+    def check(self, urls, cache_only=False, **kwargs):
+        cache = URLStatusCache(self.path, **kwargs)
+        with URLChecker(cache=cache, cache_only=cache_only) as checker:
+            statuses = checker.check(urls)
+        cache.save()
+        return statuses
+
+    def test_normalized_urls(self):
+        self.assertEqual(normalize_url("HTTPS://Docs.Example.com:443/a?b=1#top"), "https://docs.example.com/a?b=1")
+        self.assertEqual(normalize_url("http://example.com"), "http://example.com/")
+        self.assertEqual(normalize_url("http://example.com:8080/"), "http://example.com:8080/")
+
+    def test_results_are_reused_across_runs(self):
+        urls = [f"{self.base}/docs", f"{self.base}/missing"]
+        self.assertEqual(self.check(urls), {urls[0]: 200, urls[1]: 404})
+        tested = self.server.requests
+        self.assertEqual(self.check(urls), {urls[0]: 200, urls[1]: 404})
+        self.assertEqual(self.server.requests, tested)
+
+    def test_failures_expire_sooner(self):
+        urls = [f"{self.base}/docs", f"{self.base}/missing"]
+        self.check(urls)
+        tested = self.server.requests
+        self.check(urls, failure_ttl=0)
+        # Only the broken link is tested again, with a HEAD and a GET
+        self.assertEqual(self.server.requests, tested + 2)
+
+    def test_saves_from_several_processes_are_merged(self):
+        first, second = URLStatusCache(self.path), URLStatusCache(self.path)
+        first.record("http://a.example.com/", 200)
+        second.record("http://b.example.com/", None)
+        first.save()
+        second.save()
+        self.assertEqual(sorted(URLStatusCache(self.path).entries), ["http://a.example.com/", "http://b.example.com/"])
+
+    def test_cache_only_reports_cached_failures(self):
+        self.check([f"{self.base}/missing"], failure_ttl=0)
+        tested = self.server.requests
+        network = NetworkSettings(url_cache=URLStatusCache(self.path, failure_ttl=0), url_cache_only=True)
+        help_text = f"See {self.base}/missing and {self.base}/docs."
+        validator = URLValidator()
+        with validator.url_checker(network=network) as checker:
+            broken = validator.inspect_file_for_urls_and_test_them(help_text, checker=checker)
+        self.assertEqual(broken, [f"{self.base}/missing"])
+        self.assertEqual(self.server.requests, tested)
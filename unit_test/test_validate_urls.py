@@ -0,0 +1,92 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from icon_validator.rules.plugin_validators.url_validator import URLValidator
+from icon_validator.url_checker import URLChecker
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Answers like a web server hosting the links of a help.md
+    """
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def respond(self, body: bool):
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.most_in_flight = max(self.server.most_in_flight, self.server.in_flight)
+        try:
+            if self.path.startswith("/slow"):
+                time.sleep(0.2)
+            if self.path.startswith("/missing"):
+                status = 404
+            elif self.path.startswith("/no-head") and not body:
+                status = 405
+            else:
+                status = 200
+            self.send_response(status)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            if body:
+                self.wfile.write(b"ok")
+        finally:
+            with self.server.lock:
+                self.server.in_flight -= 1
+
+    def do_HEAD(self):
+        self.respond(body=False)
+
+    def do_GET(self):
+        self.respond(body=True)
+
+
+class TestValidateURLs(unittest.TestCase):
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.connections = self.server.in_flight = self.server.most_in_flight = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_statuses_with_get_fallback(self):
+        with URLChecker(timeout=5) as checker:
+            statuses = checker.check([f"{self.base}/docs", f"{self.base}/missing", f"{self.base}/no-head",
+                                      "http://127.0.0.1:1/refused"])
+        self.assertEqual(list(statuses.values()), [200, 404, 200, None])
+
+    def test_connections_are_reused_and_capped_per_host(self):
+        urls = [f"{self.base}/slow/{i}" for i in range(12)]
+        with URLChecker(timeout=5, workers=8, connections_per_host=3) as checker:
+            start = time.monotonic()
+            statuses = checker.check(urls)
+            elapsed = time.monotonic() - start
+            # The second round goes over the connections kept alive by the first
+            checker.check([f"{self.base}/docs/{i}" for i in range(3)])
+        self.assertEqual(set(statuses.values()), {200})
+        self.assertEqual(self.server.most_in_flight, 3)
+        self.assertEqual(self.server.connections, 3)
+        # 12 slow URLs, 3 at a time, instead of one after the other
+        self.assertLess(elapsed, 12 * 0.2)
+
+    def test_validator_reports_broken_links(self):
+        help_text = f"See {self.base}/docs and {self.base}/missing or {self.base}/docs again."
+        validator = URLValidator()
+        self.assertEqual(validator.inspect_file_for_urls_and_test_them(help_text), [f"{self.base}/missing"])
+        # Links already tested are not tested again
+        self.assertEqual(validator.inspect_file_for_urls_and_test_them(help_text), [])
@@ -0,0 +1,96 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+import yaml
+from git import Repo
+
+from icon_validator.remote_spec import RemoteSpecCache
+from icon_validator.repository import open_repo
+from icon_validator.version_bumps import changed_plugins, check_version_bumps, read_base_specs
+
+PLUGINS = ["bumped", "not_bumped", "unchanged"]
+
+
+class TestValidateVersionBumps(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.repository = os.path.join(self.root, "repository")
+        for name in PLUGINS:
+            shutil.copytree("plugin_examples/version_validator", os.path.join(self.repository, "plugins", name))
+        self.repo = Repo.init(self.repository)
+        with self.repo.config_writer() as config:
+            config.set_value("user", "name", "test")
+            config.set_value("user", "email", "test@example.com")
+        self.repo.git.add(A=True)
+        self.repo.git.commit(m="initial")
+        # Stands for the remote branch plugins are merged into
+        self.repo.git.update_ref("refs/remotes/origin/master", "HEAD")
+        self.cache = RemoteSpecCache(os.path.join(self.root, "remote-specs"))
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def add_action(self, name: str, version: str = None):
+        path = os.path.join(self.repository, "plugins", name, "plugin.spec.yaml")
+        with open(path) as f:
+            spec = yaml.safe_load(f)
+        spec["actions"]["new_action"] = {"title": "New Action", "description": "Added"}
+        if version:
+            spec["version"] = version
+        with open(path, "w") as f:
+            yaml.safe_dump(spec, f)
+
+    def check(self, path: str = None, cache: RemoteSpecCache = None) -> (int, str):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            status = check_version_bumps(path or self.repository, cache=cache, workers=2)
+        return status, output.getvalue()
+
+    def test_changed_plugins(self):
+        self.assertEqual(changed_plugins(["plugins/a/plugin.spec.yaml", "README.md", "plugins/b/help.md",
+                                          "plugins/a/bin/a", "plugins/README.md"]), ["a", "b"])
+
+    def test_only_changed_plugins_are_checked(self):
+        self.add_action("bumped", "3.3.0")
+        self.add_action("not_bumped")
+        shutil.copytree("plugin_examples/version_validator", os.path.join(self.repository, "plugins", "new"))
+
+        status, output = self.check()
+        self.assertEqual(status, 1)
+        self.assertIn("not_bumped", output)
+        self.assertIn("Please change the plugin version to 3.3.0", output)
+        self.assertIn("new is new since origin/master", output)
+        self.assertIn("1 of 2 changed plugins", output)
+        self.assertNotIn("unchanged", output)
+
+        status, output = self.check(os.path.join(self.repository, "plugins", "bumped"))
+        self.assertEqual(status, 0)
+        self.assertIn("1 of 1 changed plugins", output)
+
+    def test_nothing_changed(self):
+        status, output = self.check()
+        self.assertEqual(status, 0)
+        self.assertIn("No plugin changes since origin/master", output)
+
+    def test_base_specs_are_read_through_one_process(self):
+        repo = open_repo(self.repository)
+        commit = self.repo.head.commit.hexsha
+        specs = read_base_specs(repo, commit, PLUGINS + ["missing"])
+        self.assertEqual(list(specs), PLUGINS)
+        process = repo.git.cat_file_all
+        self.assertIsNotNone(process)
+        read_base_specs(repo, commit, PLUGINS)
+        self.assertIs(repo.git.cat_file_all, process)
+
+    def test_parsed_base_specs_are_cached(self):
+        self.add_action("not_bumped")
+        commit = self.repo.head.commit.hexsha
+        self.assertEqual(self.check(cache=self.cache)[0], 1)
+        self.assertEqual(self.cache.lookup(commit, "not_bumped")["version"], "3.2.7")
+        self.assertIsInstance(read_base_specs(open_repo(self.repository), commit, ["not_bumped"],
+                                              self.cache)["not_bumped"], dict)
@@ -0,0 +1,165 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+
+from icon_validator.context import ValidationContext
+from icon_validator.rules import VALIDATORS, WORKFLOW_VALIDATORS
+from icon_validator.rules.validator import KomandPluginValidator
+from icon_validator.watch import InotifyWatcher, PollingWatcher, affected_validators, watch
+
+from icon_validator.rules.plugin_validators.output_validator import OutputValidator
+from icon_validator.rules.plugin_validators.title_validator import TitleValidator
+
+
+class HelpLengthValidator(KomandPluginValidator):
+    inputs = ("help.md",)
+    lengths = []
+
+    def validate(self, spec):
+        HelpLengthValidator.lengths.append(len(spec.raw_help()))
+
+
+class ScriptedWatcher:
+    """
+    Reports the given changes, one per wait, then stops the watch like Ctrl+C would
+    """
+
+    def __init__(self, directory, changes):
+        self.directory = directory
+        self.changes = list(changes)
+        self.closed = False
+
+    def wait(self, timeout=None):
+        if not self.changes:
+            raise KeyboardInterrupt
+        change = self.changes.pop(0)
+        with open(os.path.join(self.directory, change), "a") as f:
+            f.write("\nMore help.\n")
+        return [change]
+
+    def close(self):
+        self.closed = True
+
+
+class FixingWatcher(ScriptedWatcher):
+    """
+    Reports the removal of the given files, one per wait, then stops the watch
+    """
+
+    def wait(self, timeout=None):
+        if not self.changes:
+            raise KeyboardInterrupt
+        change = self.changes.pop(0)
+        os.remove(os.path.join(self.directory, change))
+        return [change]
+
+
+def names(validators):
+    return [validator.name for validator in validators]
+
+
+class TestValidateWatch(unittest.TestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.directory = os.path.join(self.root, "plugin")
+        shutil.copytree("plugin_examples/good_plugin", self.directory)
+        HelpLengthValidator.lengths = []
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_help_edit_reruns_help_validators(self):
+        run, skipped = affected_validators(VALIDATORS, ["help.md"], "plugin.spec.yaml")
+        for name in ["HelpValidator", "HelpInputOutputValidator", "ChangelogValidator", "AcronymValidator",
+                     "ProfanityValidator", "HelpExampleValidator"]:
+            self.assertIn(name, names(run))
+        for name in ["TitleValidator", "VersionPinValidator", "DockerfileParentValidator"]:
+            self.assertNotIn(name, names(run))
+        # Undeclared inputs could be anything, but remote checks are left for a full run
+        self.assertIn("RuntimeValidator", names(run))
+        self.assertIn("VersionValidator", names(skipped))
+
+    def test_spec_edit_reruns_spec_validators(self):
+        run, _ = affected_validators(VALIDATORS, ["plugin.spec.yaml"], "plugin.spec.yaml")
+        self.assertIn("TitleValidator", names(run))
+        self.assertIn("HelpValidator", names(run))
+        self.assertNotIn("HelpExampleValidator", names(run))
+        self.assertNotIn("VersionPinValidator", names(run))
+
+    def test_glob_inputs_only_match_top_level_files(self):
+        run, _ = affected_validators(WORKFLOW_VALIDATORS, ["Example.icon"], "workflow.spec.yaml")
+        self.assertIn("WorkflowICONFileValidator", names(run))
+        run, _ = affected_validators(WORKFLOW_VALIDATORS, [os.path.join("old", "Example.icon")],
+                                     "workflow.spec.yaml")
+        self.assertNotIn("WorkflowICONFileValidator", names(run))
+
+    def test_invalidate_only_reloads_changed_files(self):
+        context = ValidationContext(self.directory)
+        context.spec_dictionary()
+        original = context.raw_help()
+        with open(os.path.join(self.directory, "help.md"), "a") as f:
+            f.write("\nMore help.\n")
+        context.invalidate(["help.md"])
+        self.assertEqual(context.raw_help(), original + "\nMore help.\n")
+        context.spec_dictionary()
+        self.assertEqual(context.load_counts["help.md"], 2)
+        self.assertEqual(context.load_counts["plugin.spec.yaml"], 1)
+
+    def test_watch_reruns_affected_validators_on_the_same_context(self):
+        watcher = ScriptedWatcher(self.directory, ["help.md", "help.md"])
+        with redirect_stdout(io.StringIO()) as output:
+            status = watch(self.directory, validators=[TitleValidator(), HelpLengthValidator()], watcher=watcher)
+        self.assertEqual(status, 0)
+        self.assertTrue(watcher.closed)
+        self.assertEqual(len(HelpLengthValidator.lengths), 3)
+        self.assertEqual(len(set(HelpLengthValidator.lengths)), 3)
+        # TitleValidator only depends on the spec
+        self.assertEqual(output.getvalue().count("Executing validator Title"), 1)
+
+    def test_fixed_failure_passes_on_rerun(self):
+        output_file = os.path.join(".output", "action_encode.json")
+        os.makedirs(os.path.join(self.directory, ".output"))
+        # The encode action always outputs data
+        with open(os.path.join(self.directory, output_file), "w") as f:
+            f.write("{}")
+        watcher = FixingWatcher(self.directory, [output_file])
+        with redirect_stdout(io.StringIO()) as output:
+            status = watch(self.directory, validators=[OutputValidator()], watcher=watcher)
+        self.assertEqual(status, 0)
+        self.assertEqual(output.getvalue().count("Action:encode"), 1)
+
+    def check_watcher_reports_changes(self, watcher):
+        def edit():
+            with open(os.path.join(self.directory, "help.md"), "a") as f:
+                f.write("\nMore help.\n")
+            os.makedirs(os.path.join(self.directory, "komand_base64", "helpers"), exist_ok=True)
+            with open(os.path.join(self.directory, "komand_base64", "helpers", "new.py"), "w") as f:
+                f.write("\n")
+
+        try:
+            timer = threading.Timer(0.1, edit)
+            timer.start()
+            changed = set(watcher.wait(timeout=5))
+            timer.join()
+            while os.path.join("komand_base64", "helpers", "new.py") not in changed:
+                more = watcher.wait(timeout=5)
+                self.assertTrue(more, f"Only saw {changed}")
+                changed.update(more)
+            self.assertIn("help.md", changed)
+        finally:
+            watcher.close()
+
+    def test_inotify_watcher_reports_changes(self):
+        try:
+            watcher = InotifyWatcher(self.directory)
+        except OSError:
+            self.skipTest("inotify is not available")
+        self.check_watcher_reports_changes(watcher)
+
+    def test_polling_watcher_reports_changes(self):
+        self.check_watcher_reports_changes(PollingWatcher(self.directory, interval=0.05))
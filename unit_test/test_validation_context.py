@@ -0,0 +1,49 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from icon_validator.context import ValidationContext
+from icon_validator.execution import run_sequentially
+from icon_validator.rules import WORKFLOW_VALIDATORS
+
+# Import plugin validators which read files other than the spec
+from icon_validator.rules.plugin_validators.runtime_validator import RuntimeValidator
+from icon_validator.rules.plugin_validators.cloud_ready_validator import CloudReadyValidator
+from icon_validator.rules.plugin_validators.version_pin_validator import VersionPinValidator
+from icon_validator.rules.plugin_validators.credentials_validator import CredentialsValidator
+from icon_validator.rules.plugin_validators.json_validator import JSONValidator
+from icon_validator.rules.plugin_validators.confidential_validator import ConfidentialValidator
+from icon_validator.rules.plugin_validators.help_validator import HelpValidator
+from icon_validator.rules.plugin_validators.changelog_validator import ChangelogValidator
+
+
+def run_validators(validators, context):
+    with redirect_stdout(io.StringIO()):
+        return list(run_sequentially(validators, context))
+
+
+class TestValidationContext(unittest.TestCase):
+
+    def test_plugin_files_are_read_once(self):
+        context = ValidationContext("plugin_examples/good_test", "plugin.spec.yaml")
+        validators = [RuntimeValidator(), CloudReadyValidator(), VersionPinValidator(), CredentialsValidator(),
+                      JSONValidator(), ConfidentialValidator(), HelpValidator(), ChangelogValidator()]
+        run_validators(validators + validators, context)
+        for artifact in ["plugin.spec.yaml", "help.md", "Dockerfile", "requirements.txt"]:
+            self.assertIn(artifact, context.load_counts)
+        self.assertTrue(any(path.startswith("tests/") for path in context.load_counts))
+        self.assertEqual(set(context.load_counts.values()), {1})
+
+    def test_workflow_files_are_read_once(self):
+        context = ValidationContext("workflow_examples/Automated_Indicator_Enrichment", "workflow.spec.yaml")
+        # Network validators are left out, they don't read files other than the spec
+        run_validators([validator for validator in WORKFLOW_VALIDATORS if not validator.io_bound], context)
+        self.assertEqual(context.load_counts["Automated_Indicator_Enrichment.icon"], 1)
+        self.assertEqual(set(context.load_counts.values()), {1})
+
+    def test_missing_file_is_looked_up_once(self):
+        context = ValidationContext("workflow_examples/Automated_Indicator_Enrichment", "workflow.spec.yaml")
+        for _ in range(2):
+            with self.assertRaises(FileNotFoundError):
+                context.raw_dockerfile()
+        self.assertEqual(context.load_counts["Dockerfile"], 1)